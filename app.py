@@ -7,16 +7,56 @@ This iteration adds a web frontend and enhanced API endpoints.
 """
 
 import argparse
+import asyncio
+import base64
+import bisect
+import calendar
+import codecs
+import contextvars
+import cProfile
 import csv
+import functools
+import gzip
+import hashlib
+import heapq
 import json
+import math
 import os
+import pstats
 import random
 import re
 import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from io import StringIO
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding for API responses
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # Optional: vectorized history analytics
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: reminder writes are only locked in-process
+    fcntl = None
+
 
 # Time-of-day specific predictions
 TIME_PREDICTIONS = {
@@ -417,1077 +457,5276 @@ HISTORY_FILE = HISTORY_DIR / "history.json"
 REMINDERS_FILE = HISTORY_DIR / "reminders.json"
 CUSTOM_THEMES_FILE = HISTORY_DIR / "themes.json"
 
+# Number of most recent predictions kept in history
+MAX_HISTORY = 100
 
-# Custom theme functions (Iteration 9)
 
-def load_custom_themes() -> dict:
+# Metrics (Iteration 11)
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Metrics:
     """
-    Load custom themes from file.
+    Thread-safe in-process metrics registry.
     
-    Returns:
-        Dictionary of custom themes.
+    Holds counters, gauges and histograms keyed by metric name and label
+    set, and renders them in the Prometheus text exposition format.
     """
-    if not CUSTOM_THEMES_FILE.exists():
-        return {}
     
-    try:
-        with open(CUSTOM_THEMES_FILE, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {}
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._descriptions = {}
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+    
+    def describe(self, name: str, metric_type: str, help_text: str) -> None:
+        """Register the TYPE and HELP lines for a metric."""
+        self._descriptions[name] = (metric_type, help_text)
+    
+    @staticmethod
+    def _key(name: str, labels: dict = None) -> tuple:
+        return name, tuple(sorted((labels or {}).items()))
+    
+    def inc(self, name: str, labels: dict = None, value: float = 1) -> None:
+        """Increment a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def add_gauge(self, name: str, value: float, labels: dict = None) -> None:
+        """Add (or subtract) a value to a gauge."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = self._gauges.get(key, 0) + value
+    
+    def observe(self, name: str, value: float, labels: dict = None) -> None:
+        """Record a value in a histogram."""
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    hist[0][i] += 1
+                    break
+            hist[1] += value
+            hist[2] += 1
+    
+    @contextmanager
+    def time(self, name: str, labels: dict = None):
+        """Context manager that observes the elapsed time of its block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+    
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Count a lookup against a named cache."""
+        result = "hit" if hit else "miss"
+        self.inc("thefuture_cache_requests_total", {"cache": cache, "result": result})
+    
+    def get(self, name: str, labels: dict = None) -> float:
+        """Return the current value of a counter or gauge (0 if unset)."""
+        key = self._key(name, labels)
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key, 0))
+    
+    def reset(self) -> None:
+        """Drop all recorded values (descriptions are kept)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+    
+    @staticmethod
+    def _format_labels(labels) -> str:
+        if not labels:
+            return ""
+        parts = []
+        for key, value in labels:
+            value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            parts.append(f'{key}="{value}"')
+        return "{" + ",".join(parts) + "}"
+    
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if isinstance(value, float) and not value.is_integer():
+            return repr(value)
+        return str(int(value))
+    
+    def _cache_ratios(self) -> dict:
+        """Derive hit ratios per cache from the cache request counters."""
+        totals = {}
+        for (name, labels), value in self._counters.items():
+            if name != "thefuture_cache_requests_total":
+                continue
+            labels = dict(labels)
+            hits, total = totals.get(labels["cache"], (0, 0))
+            if labels["result"] == "hit":
+                hits += value
+            totals[labels["cache"]] = (hits, total + value)
+        return {
+            (("cache", cache),): hits / total
+            for cache, (hits, total) in totals.items() if total
+        }
+    
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        
+        Returns:
+            The metrics document (version 0.0.4).
+        """
+        with self._lock:
+            series = {}
+            for (name, labels), value in self._counters.items():
+                series.setdefault(name, []).append((labels, value))
+            for (name, labels), value in self._gauges.items():
+                series.setdefault(name, []).append((labels, value))
+            for labels, value in self._cache_ratios().items():
+                series.setdefault("thefuture_cache_hit_ratio", []).append((labels, value))
+            histograms = {}
+            for (name, labels), (counts, total, count) in self._histograms.items():
+                histograms.setdefault(name, []).append((labels, list(counts), total, count))
+        
+        lines = []
+        for name in sorted(set(series) | set(histograms)):
+            metric_type, help_text = self._descriptions.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in sorted(series.get(name, [])):
+                lines.append(f"{name}{self._format_labels(labels)} {self._format_value(value)}")
+            for labels, counts, total, count in sorted(histograms.get(name, []), key=lambda h: h[0]):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    bucket_labels = labels + (("le", repr(bound)),)
+                    lines.append(f"{name}_bucket{self._format_labels(bucket_labels)} {cumulative}")
+                inf_labels = labels + (("le", "+Inf"),)
+                lines.append(f"{name}_bucket{self._format_labels(inf_labels)} {count}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {repr(total)}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
 
 
-def save_custom_themes(themes: dict) -> None:
+METRICS = Metrics()
+METRICS.describe("thefuture_http_requests_total", "counter", "HTTP requests by method, route and status.")
+METRICS.describe("thefuture_http_request_duration_seconds", "histogram", "HTTP request latency by method, route and status.")
+METRICS.describe("thefuture_http_requests_in_flight", "gauge", "HTTP requests currently being served.")
+METRICS.describe("thefuture_storage_operation_duration_seconds", "histogram", "Time spent in storage reads and writes.")
+METRICS.describe("thefuture_cache_requests_total", "counter", "Cache lookups by cache and result.")
+METRICS.describe("thefuture_cache_hit_ratio", "gauge", "Fraction of cache lookups that were hits.")
+METRICS.describe("thefuture_reminders_dispatched_total", "counter", "Due reminders handed to notification sinks.")
+METRICS.describe("thefuture_reminder_dispatch_errors_total", "counter", "Failed reminder deliveries by sink.")
+
+
+def timed_storage(operation: str):
     """
-    Save custom themes to file.
+    Decorator that records a storage function's duration in METRICS.
     
     Args:
-        themes: Dictionary of themes to save.
+        operation: Label value for the storage operation.
     """
-    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with METRICS.time("thefuture_storage_operation_duration_seconds", {"operation": operation}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def dump_json_bytes(content) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON bytes.
+    
+    Uses orjson when it is installed and falls back to the standard
+    library otherwise. Both produce the same output as Starlette's
+    JSONResponse for the plain dicts and lists the API returns.
     
-    with open(CUSTOM_THEMES_FILE, "w") as f:
-        json.dump(themes, f, indent=2)
+    Args:
+        content: A JSON-serializable object.
+    
+    Returns:
+        The encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
 
 
-def get_all_themes() -> dict:
+# Request profiling (Iteration 11)
+
+# Set by the profiling middleware to a list that collects the profilers of
+# the current request. contextvars follow the request into the threadpool
+# that runs sync endpoints, which cProfile in the middleware cannot see.
+_PROFILE_REQUEST = contextvars.ContextVar("profile_request", default=None)
+
+
+def profile_endpoint(func):
     """
-    Get all themes (built-in and custom).
+    Wrap an endpoint so it runs under cProfile when its request asked for it.
+    
+    Outside a profiled request the wrapper only performs a context
+    variable lookup.
+    
+    Args:
+        func: The endpoint function (sync or async).
     
     Returns:
-        Dictionary combining built-in and custom themes.
+        The wrapped endpoint, preserving its signature.
     """
-    all_themes = dict(THEMES)
-    custom = load_custom_themes()
-    all_themes.update(custom)
-    return all_themes
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            collected = _PROFILE_REQUEST.get()
+            if collected is None:
+                return await func(*args, **kwargs)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                collected.append(profiler)
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        collected = _PROFILE_REQUEST.get()
+        if collected is None:
+            return func(*args, **kwargs)
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            collected.append(profiler)
+    return wrapper
 
 
-def add_custom_theme(name: str, categories: dict) -> bool:
+def summarize_profile(profilers: list, top_n: int = 25) -> list:
     """
-    Add a new custom theme.
+    Summarize collected profilers as the top functions by cumulative time.
     
     Args:
-        name: The theme name.
-        categories: Dictionary of categories with prediction lists.
+        profilers: cProfile.Profile objects from one request.
+        top_n: Number of functions to return.
     
     Returns:
-        True if successful, False otherwise.
+        List of dicts with function, ncalls, tottime and cumtime.
     """
-    if not name:
-        print("Error: Theme name cannot be empty.")
-        return False
+    if not profilers:
+        return []
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{filename}:{line}({name})",
+            "ncalls": ncalls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        })
+    rows.sort(key=lambda r: -r["cumtime"])
+    return rows[:top_n]
+
+
+def profile_requested(headers, query_params) -> bool:
+    """
+    Check whether a request asks to be profiled.
     
-    # Validate name (alphanumeric, underscores, and hyphens only)
-    if not re.match(r'^[a-zA-Z0-9_-]+$', name):
-        print("Error: Theme name can only contain letters, numbers, underscores, and hyphens.")
-        return False
+    Args:
+        headers: Request headers (X-Profile).
+        query_params: Request query parameters (profile).
     
-    name = name.lower()
+    Returns:
+        True if the header or query parameter is set to a truthy value.
+    """
+    value = headers.get("x-profile") or query_params.get("profile") or ""
+    return value.lower() in ("1", "true", "yes")
+
+
+# Live feed (Iteration 11)
+
+class LiveFeed:
+    """
+    Broadcasts incremental events to connected WebSocket clients.
     
-    # Check if it's a built-in theme
-    if name in THEMES:
-        print(f"Error: Cannot overwrite built-in theme '{name}'.")
-        return False
+    Each subscriber owns a bounded asyncio.Queue on its event loop.
+    publish() may be called from any thread (sync endpoints run in a
+    threadpool); delivery is handed to the subscriber's loop. A client
+    that falls too far behind gets a single "resync" event instead of
+    the backlog.
+    """
     
-    # Validate categories
-    if not categories:
-        print("Error: Theme must have at least one category with predictions.")
-        return False
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscribers = {}
+    
+    def subscribe(self) -> "asyncio.Queue":
+        """Register a subscriber on the running event loop."""
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+    
+    def unsubscribe(self, queue: "asyncio.Queue") -> None:
+        """Remove a subscriber."""
+        with self._lock:
+            self._subscribers.pop(queue, None)
+    
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+    
+    @staticmethod
+    def _deliver(queue: "asyncio.Queue", event: dict) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"type": "resync"})
     
-    for cat_name, predictions in categories.items():
-        if not cat_name:
-            print("Error: Category name cannot be empty.")
-            return False
-        if not predictions:
-            print(f"Error: Category '{cat_name}' must have at least one prediction.")
-            return False
-        if not isinstance(predictions, list):
-            print(f"Error: Predictions for category '{cat_name}' must be a list.")
-            return False
-        for pred in predictions:
-            if not isinstance(pred, str) or not pred.strip():
-                print(f"Error: All predictions in category '{cat_name}' must be non-empty strings.")
-                return False
+    def publish(self, event_type: str, data: dict) -> None:
+        """
+        Send an event to every subscriber.
+        
+        Args:
+            event_type: Event name (e.g. "prediction", "rating").
+            data: JSON-serializable event payload.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        if not subscribers:
+            return
+        event = {"type": event_type, "data": data}
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has been closed
+                self.unsubscribe(queue)
+
+
+LIVE_FEED = LiveFeed()
+
+
+# Custom theme functions (Iteration 9)
+
+# Custom themes are stored as a small manifest (themes.json) plus one
+# content-addressed JSONL file per theme under themes/, so checking a
+# theme name or listing themes never reads any predictions.
+THEME_STORE_VERSION = 2
+
+# Number of parsed custom themes kept in memory
+THEME_CACHE_SIZE = 16
+
+_THEME_MANIFEST = {"key": None, "themes": None}
+_THEME_CACHE = OrderedDict()
+_THEME_LOCK = threading.Lock()
+_THEME_STORE_LOCK = threading.Lock()
+
+
+def _theme_store_dir() -> Path:
+    """Directory holding one predictions file per custom theme."""
+    return CUSTOM_THEMES_FILE.with_name("themes")
+
+
+@contextmanager
+def _file_lock(path: Path, thread_lock: threading.Lock):
+    """
+    Hold a thread lock and, where fcntl is available, an exclusive lock on path.
     
-    custom_themes = load_custom_themes()
+    Args:
+        path: Lock file to create and flock.
+        thread_lock: Lock serializing threads in this process.
+    """
+    with thread_lock, open(path, "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class _ThemeFileWriter:
+    """
+    Stream a theme's predictions into the store.
     
-    if name in custom_themes:
-        print(f"Note: Updating existing custom theme '{name}'.")
+    Predictions are written to a temporary file as they arrive, one JSON
+    [category, prediction] line each, while the hash and per-category
+    counts are kept. The file is named after a hash of its contents, so a
+    published file never changes. It stays staged under its temporary name
+    until update_theme_manifest() moves it into place under the manifest
+    lock, so a concurrent commit's cleanup never sees it as unreferenced.
     
-    custom_themes[name] = categories
-    save_custom_themes(custom_themes)
+    Args:
+        store: Theme store directory (default: next to CUSTOM_THEMES_FILE).
+    """
     
-    print(f"✅ Theme '{name}' saved successfully!")
-    print(f"   Categories: {', '.join(categories.keys())}")
-    total_predictions = sum(len(preds) for preds in categories.values())
-    print(f"   Total predictions: {total_predictions}")
-    print(f"\n   Use with: python app.py --theme {name}")
+    def __init__(self, store: Path = None):
+        store = store or _theme_store_dir()
+        store.mkdir(parents=True, exist_ok=True)
+        # Unique name: staged files outlive the writer, so id(self) may be reused
+        self.f = tempfile.NamedTemporaryFile(dir=store, prefix=".import.", suffix=".tmp", delete=False)
+        self.tmp = Path(self.f.name)
+        self.digest = hashlib.sha256()
+        self.counts = {}
+    
+    def add(self, category: str, prediction: str) -> None:
+        line = dump_json_bytes([category, prediction]) + b"\n"
+        self.digest.update(line)
+        self.f.write(line)
+        self.counts[category] = self.counts.get(category, 0) + 1
+    
+    def commit(self, name: str) -> dict:
+        """
+        Finish the file for a theme (without touching the manifest).
+        
+        Returns:
+            Manifest entry with "file", "hash", "categories" (prediction
+            count per category) and "predictions" (total), plus "staged"
+            (the temporary path) until update_theme_manifest() publishes it.
+        """
+        self.f.close()
+        content_hash = self.digest.hexdigest()[:16]
+        return {
+            "file": f"{name}.{content_hash}.jsonl",
+            "hash": content_hash,
+            "categories": self.counts,
+            "predictions": sum(self.counts.values()),
+            "staged": str(self.tmp),
+        }
     
-    return True
+    def discard(self) -> None:
+        self.f.close()
+        self.tmp.unlink(missing_ok=True)
 
 
-def delete_custom_theme(name: str) -> bool:
+def _publish_theme_entry(entry: dict) -> dict:
+    """Move a staged theme file to its published name; returns the entry without "staged"."""
+    entry = dict(entry)
+    staged = entry.pop("staged", None)
+    if staged:
+        os.replace(staged, Path(staged).with_name(entry["file"]))
+    return entry
+
+
+def _discard_theme_entry(entry: dict) -> None:
+    """Delete the staged file of an entry that will not be committed."""
+    if entry.get("staged"):
+        Path(entry["staged"]).unlink(missing_ok=True)
+
+
+def _write_theme_file(name: str, pairs) -> dict:
     """
-    Delete a custom theme.
+    Write a theme's predictions to the store.
     
     Args:
-        name: The theme name to delete.
+        name: The theme name.
+        pairs: Iterable of (category, prediction) tuples.
     
     Returns:
-        True if successful, False otherwise.
+        Manifest entry for the theme (see _ThemeFileWriter.commit).
     """
-    name = name.lower()
-    
-    if name in THEMES:
-        print(f"Error: Cannot delete built-in theme '{name}'.")
-        return False
-    
-    custom_themes = load_custom_themes()
+    writer = _ThemeFileWriter()
+    try:
+        for category, prediction in pairs:
+            writer.add(category, prediction)
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.commit(name)
+
+
+def _theme_pairs(categories: dict):
+    """Yield (category, prediction) pairs from a categories dictionary."""
+    for category, predictions in categories.items():
+        for prediction in predictions:
+            yield category, prediction
+
+
+def _read_manifest_file() -> dict | None:
+    """Read themes.json, migrating the legacy single-file format; None if unreadable."""
+    try:
+        with open(CUSTOM_THEMES_FILE, "r") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    if data.get("version") == THEME_STORE_VERSION and isinstance(data.get("themes"), dict):
+        return data["themes"]
+    
+    # Legacy format: {theme: {category: [predictions]}}
+    themes = {
+        name: _publish_theme_entry(_write_theme_file(name, _theme_pairs(categories)))
+        for name, categories in data.items()
+    }
+    _write_json_atomic(CUSTOM_THEMES_FILE, {"version": THEME_STORE_VERSION, "themes": themes})
+    return themes
+
+
+@timed_storage("load_theme_manifest")
+def load_theme_manifest() -> dict:
+    """
+    Load the custom theme manifest, re-reading it only after it changes.
     
-    if name not in custom_themes:
-        print(f"Error: Custom theme '{name}' not found.")
-        available = list(custom_themes.keys())
-        if available:
-            print(f"Available custom themes: {', '.join(available)}")
-        else:
-            print("No custom themes exist. Use --add-theme to create one.")
-        return False
+    Returns:
+        Dictionary mapping theme name to its manifest entry (see
+        _write_theme_file). Treat it as read-only.
+    """
+    if not CUSTOM_THEMES_FILE.exists():
+        return {}
     
-    del custom_themes[name]
-    save_custom_themes(custom_themes)
+    key = (str(CUSTOM_THEMES_FILE), _file_signature(CUSTOM_THEMES_FILE))
+    with _THEME_LOCK:
+        hit = _THEME_MANIFEST["key"] == key
+        METRICS.record_cache("theme_manifest", hit)
+        if hit:
+            return _THEME_MANIFEST["themes"]
     
-    print(f"✅ Custom theme '{name}' deleted successfully!")
-    return True
+    themes = _read_manifest_file()
+    if themes is None:
+        return {}
+    with _THEME_LOCK:
+        _THEME_MANIFEST["key"] = (str(CUSTOM_THEMES_FILE), _file_signature(CUSTOM_THEMES_FILE))
+        _THEME_MANIFEST["themes"] = themes
+    return themes
 
 
-def list_themes() -> None:
-    """Display all available themes (built-in and custom)."""
-    print("\n🎭 Available Themes\n")
+def update_theme_manifest(updates: dict = None, removals: list = (), replace: bool = False) -> dict:
+    """
+    Commit theme changes with one atomic manifest write.
     
-    # Built-in themes
-    print("📦 Built-in Themes:")
-    for name in sorted(THEMES.keys()):
-        categories = list(THEMES[name].keys())
-        total = sum(len(preds) for preds in THEMES[name].values())
-        print(f"   {name}: {', '.join(categories)} ({total} predictions)")
+    Theme files are written first (see _write_theme_file) and moved into
+    place under the manifest lock; swapping in the new manifest publishes
+    them all at once. Files no longer referenced are then deleted, which
+    cannot race with another writer because unpublished files are still
+    staged under temporary names.
     
-    # Custom themes
-    custom = load_custom_themes()
-    if custom:
-        print("\n🎨 Custom Themes:")
-        for name in sorted(custom.keys()):
-            categories = list(custom[name].keys())
-            total = sum(len(preds) for preds in custom[name].values())
-            print(f"   {name}: {', '.join(categories)} ({total} predictions)")
-    else:
-        print("\n🎨 Custom Themes:")
-        print("   No custom themes. Use --add-theme to create one.")
+    Args:
+        updates: Mapping of theme name to its new manifest entry.
+        removals: Theme names to remove.
+        replace: If True, the updates become the whole manifest.
     
-    print()
+    Returns:
+        The new manifest themes.
+    """
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    with _file_lock(CUSTOM_THEMES_FILE.with_name(CUSTOM_THEMES_FILE.name + ".lock"), _THEME_STORE_LOCK):
+        themes = {} if replace or not CUSTOM_THEMES_FILE.exists() else dict(_read_manifest_file() or {})
+        themes.update({name: _publish_theme_entry(entry) for name, entry in (updates or {}).items()})
+        for name in removals:
+            themes.pop(name, None)
+        _write_json_atomic(CUSTOM_THEMES_FILE, {"version": THEME_STORE_VERSION, "themes": themes})
+        
+        referenced = {entry["file"] for entry in themes.values()}
+        store = _theme_store_dir()
+        if store.exists():
+            for path in store.glob("*.jsonl"):
+                if path.name not in referenced:
+                    path.unlink(missing_ok=True)
+    return themes
 
 
-def interactive_add_theme() -> bool:
+@timed_storage("load_theme")
+def _read_theme_file(path: Path) -> dict:
+    """Parse a theme's predictions file into {category: [predictions]}."""
+    loads = orjson.loads if orjson is not None else json.loads
+    categories = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                category, prediction = loads(line)
+                categories.setdefault(category, []).append(prediction)
+    return categories
+
+
+def _custom_theme_key(name: str) -> str | None:
     """
-    Interactively create a new custom theme.
+    Make sure a custom theme is loaded into THEME_REGISTRY.
+    
+    Loaded themes are tracked in an LRU of THEME_CACHE_SIZE; the least
+    recently used theme is dropped from the registry when it overflows.
+    The LRU is guarded by THEME_REGISTRY.lock, so a caller holding that
+    lock keeps the returned key registered until it releases it.
     
     Returns:
-        True if a theme was created, False otherwise.
+        The theme's registry key, or None if there is no such custom theme.
     """
-    print("\n🎨 Create Custom Theme\n")
-    print("Follow the prompts to create your own prediction theme.")
-    print("Press Ctrl+C to cancel at any time.\n")
+    entry = load_theme_manifest().get(name)
+    if entry is None:
+        return None
+    
+    path = _theme_store_dir() / entry["file"]
+    key = str(path)
+    with THEME_REGISTRY.lock:
+        hit = key in _THEME_CACHE and key in THEME_REGISTRY
+        METRICS.record_cache("theme", hit)
+        if hit:
+            _THEME_CACHE.move_to_end(key)
+            return key
     
     try:
-        # Get theme name
-        name = input("Theme name (e.g., 'birthday', 'work_life'): ").strip().lower()
-        if not name:
-            print("Cancelled: Theme name is required.")
-            return False
-        
-        if name in THEMES:
-            print(f"Error: '{name}' is a built-in theme and cannot be overwritten.")
-            return False
-        
-        categories = {}
-        
-        print("\nNow add categories and predictions.")
-        print("Enter an empty category name when done.\n")
-        
-        while True:
-            cat_name = input("Category name (or press Enter to finish): ").strip().lower()
-            if not cat_name:
-                break
-            
-            predictions = []
-            print(f"  Enter predictions for '{cat_name}' (empty line to finish category):")
-            
-            pred_num = 1
-            while True:
-                pred = input(f"    {pred_num}. ").strip()
-                if not pred:
-                    break
-                predictions.append(pred)
-                pred_num += 1
-            
-            if predictions:
-                categories[cat_name] = predictions
-                print(f"  ✓ Added {len(predictions)} prediction(s) to '{cat_name}'")
-            else:
-                print(f"  ⚠ Category '{cat_name}' skipped (no predictions)")
-        
-        if not categories:
-            print("\nCancelled: No categories were created.")
-            return False
-        
-        return add_custom_theme(name, categories)
-        
-    except (KeyboardInterrupt, EOFError):
-        print("\n\nTheme creation cancelled.")
-        return False
+        categories = _read_theme_file(path)
+    except (OSError, ValueError):
+        return None
+    with THEME_REGISTRY.lock:
+        THEME_REGISTRY.add(key, categories)
+        _THEME_CACHE[key] = None
+        _THEME_CACHE.move_to_end(key)
+        while len(_THEME_CACHE) > THEME_CACHE_SIZE:
+            evicted, _ = _THEME_CACHE.popitem(last=False)
+            THEME_REGISTRY.remove(evicted)
+    return key
 
 
-def import_theme_from_file(filepath: str) -> bool:
+def load_custom_theme(name: str) -> dict | None:
     """
-    Import a custom theme from a JSON file.
+    Load one custom theme's predictions, through an LRU cache.
     
-    The JSON file should have the format:
-    {
-        "name": "theme_name",
-        "categories": {
-            "category1": ["prediction1", "prediction2", ...],
-            "category2": ["prediction1", "prediction2", ...]
-        }
-    }
+    The dictionary is built from the interned strings the first time it is
+    asked for and kept with the LRU entry, so later calls return it as is.
     
     Args:
-        filepath: Path to the JSON file.
+        name: The theme name.
     
     Returns:
-        True if successful, False otherwise.
+        Dictionary of categories to prediction lists, or None if there is
+        no such custom theme. Treat it as read-only.
     """
-    try:
-        with open(filepath, "r") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File '{filepath}' not found.")
-        return False
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in '{filepath}': {e}")
-        return False
-    except IOError as e:
-        print(f"Error reading file '{filepath}': {e}")
-        return False
-    
-    # Validate structure
-    if not isinstance(data, dict):
-        print("Error: JSON must be an object with 'name' and 'categories' fields.")
-        return False
-    
-    name = data.get("name")
-    categories = data.get("categories")
-    
-    if not name:
-        print("Error: Theme 'name' field is required.")
-        return False
-    
-    if not categories:
-        print("Error: Theme 'categories' field is required.")
-        return False
-    
-    return add_custom_theme(name, categories)
+    with THEME_REGISTRY.lock:
+        key = _custom_theme_key(name)
+        if key is None:
+            return None
+        categories = _THEME_CACHE[key]
+        if categories is None:
+            categories = _THEME_CACHE[key] = THEME_REGISTRY.materialize(key)
+        return categories
 
 
-def export_theme_to_json(theme_name: str) -> bool:
+def load_custom_themes() -> dict:
     """
-    Export a theme to JSON format.
+    Load all custom themes.
     
-    Args:
-        theme_name: Name of the theme to export.
+    Reads every theme file; prefer load_theme_manifest() or
+    load_custom_theme() when only names or one theme are needed.
     
     Returns:
-        True if successful, False otherwise.
+        Dictionary of custom themes.
     """
-    theme_name = theme_name.lower()
-    all_themes = get_all_themes()
-    
-    if theme_name not in all_themes:
-        print(f"Error: Theme '{theme_name}' not found.")
-        available = ", ".join(sorted(all_themes.keys()))
-        print(f"Available themes: {available}")
-        return False
-    
-    export_data = {
-        "name": theme_name,
-        "categories": all_themes[theme_name]
-    }
-    
-    print(json.dumps(export_data, indent=2))
-    return True
+    themes = {}
+    for name in load_theme_manifest():
+        categories = load_custom_theme(name)
+        if categories is not None:
+            themes[name] = categories
+    return themes
 
 
-def get_themed_prediction(theme: str, category: str = None) -> tuple[str, str]:
+@timed_storage("save_custom_themes")
+def save_custom_themes(themes: dict) -> None:
     """
-    Generate a prediction from a specific theme (built-in or custom).
+    Replace all custom themes in the store.
     
     Args:
-        theme: The theme to use (built-in or custom theme name).
-        category: Optional category within the theme.
+        themes: Dictionary of themes to save.
+    """
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    entries = {name: _write_theme_file(name, _theme_pairs(categories)) for name, categories in themes.items()}
+    update_theme_manifest(entries, replace=True)
+
+
+def theme_names() -> list:
+    """
+    Get the names of all themes (built-in and custom) without loading any predictions.
     
     Returns:
-        A tuple of (prediction string, category used).
+        List of theme names.
     """
-    all_themes = get_all_themes()
-    
-    if theme not in all_themes:
-        available = ", ".join(sorted(all_themes.keys()))
-        return f"Unknown theme '{theme}'. Available: {available}", theme
-    
-    theme_predictions = all_themes[theme]
-    
-    if category is not None:
-        if category not in theme_predictions:
-            available = ", ".join(theme_predictions.keys())
-            return f"Category '{category}' not available in theme '{theme}'. Available: {available}", category
-        return random.choice(theme_predictions[category]), category
-    
-    # Random category from the theme
-    category = random.choice(list(theme_predictions.keys()))
-    return random.choice(theme_predictions[category]), category
+    return list(THEMES) + [name for name in load_theme_manifest() if name not in THEMES]
 
 
-def copy_to_clipboard(text: str) -> bool:
+def get_theme(name: str) -> dict | None:
     """
-    Copy text to the system clipboard.
-    
-    Uses multiple methods to ensure cross-platform compatibility:
-    1. pyperclip (if installed)
-    2. pbcopy (macOS)
-    3. xclip/xsel (Linux)
-    4. clip.exe (Windows/WSL)
+    Get one theme's predictions (built-in or custom).
     
     Args:
-        text: The text to copy to clipboard.
+        name: The theme name.
     
     Returns:
-        True if successful, False otherwise.
+        Dictionary of categories to prediction lists, or None if unknown.
     """
-    import subprocess
-    import platform
-    
-    # Try pyperclip first (cross-platform, if installed)
-    try:
-        import pyperclip
-        pyperclip.copy(text)
-        return True
-    except ImportError:
-        pass
-    except Exception:
-        pass
-    
-    system = platform.system().lower()
-    
-    # macOS
-    if system == "darwin":
-        try:
-            subprocess.run(["pbcopy"], input=text.encode("utf-8"), check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-    
-    # Windows
-    if system == "windows":
-        try:
-            subprocess.run(["clip"], input=text.encode("utf-8"), check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-    
-    # Linux - try xclip first, then xsel
-    if system == "linux":
-        # Try xclip
-        try:
-            subprocess.run(
-                ["xclip", "-selection", "clipboard"],
-                input=text.encode("utf-8"),
-                check=True,
-            )
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-        
-        # Try xsel
-        try:
-            subprocess.run(
-                ["xsel", "--clipboard", "--input"],
-                input=text.encode("utf-8"),
-                check=True,
-            )
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-        
-        # Try clip.exe (WSL)
-        try:
-            subprocess.run(["clip.exe"], input=text.encode("utf-8"), check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
-    
-    return False
+    if name in THEMES:
+        return THEMES[name]
+    return load_custom_theme(name)
 
 
-def get_prediction(category: str = None) -> tuple[str, str]:
+def get_theme_categories() -> dict:
     """
-    Generate a prediction for the future.
-    
-    Args:
-        category: Optional category. Available categories are:
-                  fortune, weather, activity, career, relationship, health, creative.
-                  If None, a random category is chosen.
+    Get the category names of every theme from the manifest.
     
     Returns:
-        A tuple of (prediction string, category used).
+        Dictionary mapping theme name to its list of categories.
     """
-    if category is None:
-        category = random.choice(list(PREDICTIONS.keys()))
-    
-    if category not in PREDICTIONS:
-        available = ", ".join(PREDICTIONS.keys())
-        return f"Unknown category '{category}'. Available: {available}", category
-    
-    return random.choice(PREDICTIONS[category]), category
+    categories = {name: list(theme) for name, theme in THEMES.items()}
+    for name, entry in load_theme_manifest().items():
+        categories.setdefault(name, list(entry["categories"]))
+    return categories
 
 
-def get_future_date(days_ahead: int = 1) -> str:
+def get_all_themes() -> dict:
     """
-    Get a formatted date in the future.
-    
-    Args:
-        days_ahead: Number of days in the future.
+    Get all themes (built-in and custom).
     
     Returns:
-        Formatted date string.
+        Dictionary combining built-in and custom themes.
     """
-    future = datetime.now() + timedelta(days=days_ahead)
-    return future.strftime("%A, %B %d, %Y")
+    all_themes = dict(THEMES)
+    custom = load_custom_themes()
+    all_themes.update(custom)
+    return all_themes
 
 
-def get_time_of_day(dt: datetime = None) -> str:
+# Interned theme registry (Iteration 11)
+
+class ThemeRegistry:
     """
-    Get the time of day as a string.
+    Deduplicated in-memory storage for theme predictions.
     
-    Args:
-        dt: Optional datetime. Defaults to now.
+    Every distinct prediction string is stored once in a shared string
+    table; each theme category is an array of 32-bit indices into it. An
+    identical prediction appearing in several themes (or repeated within
+    one) therefore costs 4 bytes per use instead of a separate string
+    object. Entries are reference counted and freed slots are reused, so
+    themes can be added and removed as they are loaded and evicted.
     
-    Returns:
-        One of: 'morning', 'afternoon', 'evening', 'night'
+    Hold ``lock`` (reentrant) around several calls that must see the same
+    theme, e.g. reading its categories and then drawing from one.
     """
-    if dt is None:
-        dt = datetime.now()
     
-    hour = dt.hour
-    if 5 <= hour < 12:
-        return "morning"
-    elif 12 <= hour < 17:
-        return "afternoon"
-    elif 17 <= hour < 21:
-        return "evening"
-    else:
-        return "night"
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+        self._refs = array("I")
+        self._free = []
+        self.themes = {}
+        self.lock = threading.RLock()
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.themes
+    
+    def _intern(self, text: str) -> int:
+        index = self._ids.get(text)
+        if index is None:
+            if self._free:
+                index = self._free.pop()
+                self.strings[index] = text
+                self._refs[index] = 0
+            else:
+                index = len(self.strings)
+                self.strings.append(text)
+                self._refs.append(0)
+            self._ids[text] = index
+        self._refs[index] += 1
+        return index
+    
+    def add(self, key: str, categories: dict) -> None:
+        """Register (or replace) a theme's {category: [predictions]}."""
+        with self.lock:
+            self.remove(key)
+            self.themes[key] = {
+                sys.intern(category): array("I", (self._intern(text) for text in predictions))
+                for category, predictions in categories.items()
+            }
+    
+    def remove(self, key: str) -> None:
+        """Drop a theme, freeing strings no other theme uses."""
+        with self.lock:
+            for indices in self.themes.pop(key, {}).values():
+                for index in indices:
+                    self._refs[index] -= 1
+                    if not self._refs[index]:
+                        del self._ids[self.strings[index]]
+                        self.strings[index] = None
+                        self._free.append(index)
+    
+    def categories(self, key: str) -> list | None:
+        """Return a theme's category names, or None if it is not registered."""
+        with self.lock:
+            theme = self.themes.get(key)
+            return list(theme) if theme is not None else None
+    
+    def choice(self, key: str, category: str) -> str | None:
+        """Pick a random prediction from a category (None if not registered)."""
+        with self.lock:
+            indices = self.themes.get(key, {}).get(category)
+            return self.strings[random.choice(indices)] if indices else None
+    
+    def materialize(self, key: str) -> dict | None:
+        """Return a theme as {category: [predictions]} sharing the interned strings."""
+        with self.lock:
+            theme = self.themes.get(key)
+            if theme is None:
+                return None
+            strings = self.strings
+            return {category: [strings[i] for i in indices] for category, indices in theme.items()}
+    
+    def stats(self) -> dict:
+        """
+        Report the registry's size and memory use.
+        
+        Returns:
+            Dictionary with theme, category, reference and unique string
+            counts, "interned_bytes" (string table, strings and index
+            arrays) and "list_bytes" (the same predictions as separate
+            string copies in lists), in bytes.
+        """
+        with self.lock:
+            live = [text for text in self.strings if text is not None]
+            references = sum(len(indices) for theme in self.themes.values() for indices in theme.values())
+            string_bytes = sum(sys.getsizeof(text) for text in live)
+            table_bytes = sys.getsizeof(self.strings) + sys.getsizeof(self._ids) + sys.getsizeof(self._refs)
+            index_bytes = sum(
+                sys.getsizeof(indices) for theme in self.themes.values() for indices in theme.values()
+            )
+            copies_bytes = sum(
+                sys.getsizeof(self.strings[i]) for theme in self.themes.values()
+                for indices in theme.values() for i in indices
+            )
+            list_bytes = copies_bytes + sum(
+                sys.getsizeof([None] * len(indices)) for theme in self.themes.values() for indices in theme.values()
+            )
+            return {
+                "themes": len(self.themes),
+                "categories": sum(len(theme) for theme in self.themes.values()),
+                "references": references,
+                "unique_strings": len(live),
+                "interned_bytes": string_bytes + table_bytes + index_bytes,
+                "list_bytes": list_bytes,
+            }
 
 
-def get_day_type(dt: datetime = None) -> str:
+THEME_REGISTRY = ThemeRegistry()
+
+
+def _theme_key(name: str) -> str | None:
+    """Return the registry key of a theme (built-in or custom), loading it if needed."""
+    if name in THEMES:
+        key = f"builtin:{name}"
+        if key not in THEME_REGISTRY:
+            THEME_REGISTRY.add(key, THEMES[name])
+        return key
+    return _custom_theme_key(name)
+
+
+def theme_memory_stats(full: bool = False) -> dict:
     """
-    Get the type of day (weekday or weekend).
+    Report theme memory use.
     
     Args:
-        dt: Optional datetime. Defaults to now.
+        full: If True, measure every built-in and custom theme in a fresh
+              registry instead of what this process has loaded.
     
     Returns:
-        'weekday' or 'weekend'
+        ThemeRegistry.stats() plus "saved_bytes".
     """
-    if dt is None:
-        dt = datetime.now()
-    
-    # weekday() returns 0-4 for Monday-Friday, 5-6 for Saturday-Sunday
-    return "weekend" if dt.weekday() >= 5 else "weekday"
+    if full:
+        registry = ThemeRegistry()
+        for name, categories in THEMES.items():
+            registry.add(f"builtin:{name}", categories)
+        for name, entry in load_theme_manifest().items():
+            try:
+                registry.add(name, _read_theme_file(_theme_store_dir() / entry["file"]))
+            except (OSError, ValueError):
+                continue
+    else:
+        registry = THEME_REGISTRY
+    stats = registry.stats()
+    stats["saved_bytes"] = stats["list_bytes"] - stats["interned_bytes"]
+    return stats
 
 
-def get_time_aware_prediction(category: str = None) -> tuple[str, str]:
+def validate_theme_name(name: str) -> str:
     """
-    Generate a time-aware prediction for the future.
-    
-    This function considers both the time of day and day of week
-    to provide more contextually relevant predictions.
+    Validate a custom theme name.
     
     Args:
-        category: Optional category. If None, may include time-based predictions.
+        name: The requested theme name.
     
     Returns:
-        A tuple of (prediction string, category used).
-    """
-    now = datetime.now()
-    time_of_day = get_time_of_day(now)
-    day_type = get_day_type(now)
-    
-    # If a specific category is requested, use it
-    if category is not None:
-        if category not in PREDICTIONS:
-            available = ", ".join(PREDICTIONS.keys())
-            return f"Unknown category '{category}'. Available: {available}", category
-        return random.choice(PREDICTIONS[category]), category
-    
-    # Create a weighted pool of predictions
-    # Include regular categories with some time-aware predictions mixed in
-    pool = []
+        The normalized (lowercase) name.
     
-    # Add regular category predictions (70% chance overall)
-    for cat, preds in PREDICTIONS.items():
-        for pred in preds:
-            pool.append((pred, cat))
+    Raises:
+        ValueError: If the name is empty, has invalid characters or is built in.
+    """
+    if not name:
+        raise ValueError("Theme name cannot be empty.")
     
-    # Add time-of-day predictions (15% chance)
-    for pred in TIME_PREDICTIONS.get(time_of_day, []):
-        pool.append((pred, f"time:{time_of_day}"))
+    # Validate name (alphanumeric, underscores, and hyphens only)
+    if not isinstance(name, str) or not re.match(r'^[a-zA-Z0-9_-]+$', name):
+        raise ValueError("Theme name can only contain letters, numbers, underscores, and hyphens.")
     
-    # Add day-type predictions (15% chance)
-    for pred in DAY_PREDICTIONS.get(day_type, []):
-        pool.append((pred, f"day:{day_type}"))
+    name = name.lower()
     
-    return random.choice(pool)
+    # Check if it's a built-in theme
+    if name in THEMES:
+        raise ValueError(f"Cannot overwrite built-in theme '{name}'.")
+    return name
+
+
+def _report_theme_saved(name: str, entry: dict) -> None:
+    """Print the confirmation for a saved theme from its manifest entry."""
+    print(f"✅ Theme '{name}' saved successfully!")
+    print(f"   Categories: {', '.join(entry['categories'])}")
+    print(f"   Total predictions: {entry['predictions']}")
+    print(f"\n   Use with: python app.py --theme {name}")
+
+
+def add_custom_theme(name: str, categories: dict) -> bool:
+    """
+    Add a new custom theme.
+    
+    Args:
+        name: The theme name.
+        categories: Dictionary of categories with prediction lists.
+    
+    Returns:
+        True if successful, False otherwise.
+    """
+    try:
+        name = validate_theme_name(name)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
+    
+    # Validate categories
+    if not categories:
+        print("Error: Theme must have at least one category with predictions.")
+        return False
+    
+    for cat_name, predictions in categories.items():
+        if not cat_name:
+            print("Error: Category name cannot be empty.")
+            return False
+        if not predictions:
+            print(f"Error: Category '{cat_name}' must have at least one prediction.")
+            return False
+        if not isinstance(predictions, list):
+            print(f"Error: Predictions for category '{cat_name}' must be a list.")
+            return False
+        for pred in predictions:
+            if not isinstance(pred, str) or not pred.strip():
+                print(f"Error: All predictions in category '{cat_name}' must be non-empty strings.")
+                return False
+    
+    if name in load_theme_manifest():
+        print(f"Note: Updating existing custom theme '{name}'.")
+    
+    entry = _write_theme_file(name, _theme_pairs(categories))
+    update_theme_manifest({name: entry})
+    _report_theme_saved(name, entry)
+    
+    return True
+
+
+def delete_custom_theme(name: str) -> bool:
+    """
+    Delete a custom theme.
+    
+    Args:
+        name: The theme name to delete.
+    
+    Returns:
+        True if successful, False otherwise.
+    """
+    name = name.lower()
+    
+    if name in THEMES:
+        print(f"Error: Cannot delete built-in theme '{name}'.")
+        return False
+    
+    custom_themes = load_theme_manifest()
+    
+    if name not in custom_themes:
+        print(f"Error: Custom theme '{name}' not found.")
+        available = list(custom_themes.keys())
+        if available:
+            print(f"Available custom themes: {', '.join(available)}")
+        else:
+            print("No custom themes exist. Use --add-theme to create one.")
+        return False
+    
+    update_theme_manifest(removals=[name])
+    
+    print(f"✅ Custom theme '{name}' deleted successfully!")
+    return True
+
+
+def list_themes(verbose: bool = False) -> None:
+    """
+    Display all available themes (built-in and custom).
+    
+    Args:
+        verbose: If True, also report how much memory the themes take
+                 interned versus as separate lists.
+    """
+    print("\n🎭 Available Themes\n")
+    
+    # Built-in themes
+    print("📦 Built-in Themes:")
+    for name in sorted(THEMES.keys()):
+        categories = list(THEMES[name].keys())
+        total = sum(len(preds) for preds in THEMES[name].values())
+        print(f"   {name}: {', '.join(categories)} ({total} predictions)")
+    
+    # Custom themes (counts come from the manifest)
+    custom = load_theme_manifest()
+    if custom:
+        print("\n🎨 Custom Themes:")
+        for name in sorted(custom.keys()):
+            categories = list(custom[name]["categories"])
+            total = custom[name]["predictions"]
+            print(f"   {name}: {', '.join(categories)} ({total} predictions)")
+    else:
+        print("\n🎨 Custom Themes:")
+        print("   No custom themes. Use --add-theme to create one.")
+    
+    if verbose:
+        stats = theme_memory_stats(full=True)
+        duplicates = stats["references"] - stats["unique_strings"]
+        print("\n🧠 Memory:")
+        print(f"   {stats['references']} predictions in {stats['categories']} categories, "
+              f"{stats['unique_strings']} unique ({duplicates} duplicates shared)")
+        if stats["saved_bytes"] >= 0:
+            change = f"saved {stats['saved_bytes'] / 1024:.1f} KB"
+        else:
+            change = f"{-stats['saved_bytes'] / 1024:.1f} KB of lookup overhead"
+        print(f"   Interned: {stats['interned_bytes'] / 1024:.1f} KB "
+              f"(as separate lists: {stats['list_bytes'] / 1024:.1f} KB, {change})")
+        print("   Built-in themes are not deduplicated: their lists stay loaded next to the registry.")
+    
+    print()
+
+
+def interactive_add_theme() -> bool:
+    """
+    Interactively create a new custom theme.
+    
+    Returns:
+        True if a theme was created, False otherwise.
+    """
+    print("\n🎨 Create Custom Theme\n")
+    print("Follow the prompts to create your own prediction theme.")
+    print("Press Ctrl+C to cancel at any time.\n")
+    
+    try:
+        # Get theme name
+        name = input("Theme name (e.g., 'birthday', 'work_life'): ").strip().lower()
+        if not name:
+            print("Cancelled: Theme name is required.")
+            return False
+        
+        if name in THEMES:
+            print(f"Error: '{name}' is a built-in theme and cannot be overwritten.")
+            return False
+        
+        categories = {}
+        
+        print("\nNow add categories and predictions.")
+        print("Enter an empty category name when done.\n")
+        
+        while True:
+            cat_name = input("Category name (or press Enter to finish): ").strip().lower()
+            if not cat_name:
+                break
+            
+            predictions = []
+            print(f"  Enter predictions for '{cat_name}' (empty line to finish category):")
+            
+            pred_num = 1
+            while True:
+                pred = input(f"    {pred_num}. ").strip()
+                if not pred:
+                    break
+                predictions.append(pred)
+                pred_num += 1
+            
+            if predictions:
+                categories[cat_name] = predictions
+                print(f"  ✓ Added {len(predictions)} prediction(s) to '{cat_name}'")
+            else:
+                print(f"  ⚠ Category '{cat_name}' skipped (no predictions)")
+        
+        if not categories:
+            print("\nCancelled: No categories were created.")
+            return False
+        
+        return add_custom_theme(name, categories)
+        
+    except (KeyboardInterrupt, EOFError):
+        print("\n\nTheme creation cancelled.")
+        return False
+
+
+def _check_prediction(category: str, prediction) -> None:
+    """Raise ValueError unless prediction is a non-empty string."""
+    if not isinstance(prediction, str) or not prediction.strip():
+        raise ValueError(f"All predictions in category '{category}' must be non-empty strings.")
+
+
+def _iter_theme_categories(reader: "_JSONReader"):
+    """Stream (category, prediction) pairs from a JSON "categories" object."""
+    if reader.peek() != "{":
+        if not reader.value():
+            return
+        raise ValueError("Theme 'categories' must be an object of prediction lists.")
+    reader.take()
+    if reader.peek() == "}":
+        reader.take()
+        return
+    
+    while True:
+        category = reader.value()
+        if not isinstance(category, str) or not category:
+            raise ValueError("Category name cannot be empty.")
+        if reader.take() != ":":
+            raise ValueError("Invalid JSON: expected ':' after category name")
+        if reader.peek() != "[":
+            if not reader.value():
+                raise ValueError(f"Category '{category}' must have at least one prediction.")
+            raise ValueError(f"Predictions for category '{category}' must be a list.")
+        reader.take()
+        
+        count = 0
+        if reader.peek() == "]":
+            reader.take()
+        else:
+            while True:
+                prediction = reader.value()
+                _check_prediction(category, prediction)
+                yield category, prediction
+                count += 1
+                separator = reader.take()
+                if separator == "]":
+                    break
+                if separator != ",":
+                    raise ValueError(f"Invalid JSON: expected ',' or ']' in category '{category}'")
+        if not count:
+            raise ValueError(f"Category '{category}' must have at least one prediction.")
+        
+        separator = reader.take()
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError("Invalid JSON: expected ',' or '}' in 'categories'")
+
+
+def _iter_theme_json(f, fields: dict, chunk_size: int = 65536):
+    """
+    Stream (category, prediction) pairs from a theme JSON file.
+    
+    Other top-level fields (such as "name") are stored in fields.
+    """
+    reader = _JSONReader(f, chunk_size)
+    if reader.take() != "{":
+        raise ValueError("JSON must be an object with 'name' and 'categories' fields.")
+    if reader.peek() == "}":
+        reader.take()
+        return
+    
+    while True:
+        key = reader.value()
+        if not isinstance(key, str) or reader.take() != ":":
+            raise ValueError("Invalid JSON: expected a field name")
+        if key == "categories":
+            if "name" in fields:
+                # Fail before streaming the predictions when we can
+                validate_theme_name(fields["name"])
+            yield from _iter_theme_categories(reader)
+        else:
+            fields[key] = reader.value()
+        separator = reader.take()
+        if separator == "}":
+            break
+        if separator != ",":
+            raise ValueError("Invalid JSON: expected ',' or '}' after a field")
+    if not reader.at_end():
+        raise ValueError("Invalid JSON: unexpected data after the theme object")
+
+
+def _iter_theme_jsonl(f, fields: dict):
+    """
+    Stream (category, prediction) pairs from a JSONL theme file.
+    
+    Each line is {"category": ..., "prediction": ...} or a
+    [category, prediction] pair; an optional {"name": ...} line names
+    the theme (stored in fields).
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+        
+        if isinstance(record, list) and len(record) == 2:
+            category, prediction = record
+        elif isinstance(record, dict) and "prediction" in record:
+            category, prediction = record.get("category"), record["prediction"]
+        elif isinstance(record, dict) and set(record) == {"name"}:
+            fields["name"] = record["name"]
+            validate_theme_name(fields["name"])
+            continue
+        else:
+            raise ValueError(f"Line {line_number}: expected {{\"category\": ..., \"prediction\": ...}}")
+        
+        if not isinstance(category, str) or not category:
+            raise ValueError(f"Line {line_number}: category name cannot be empty.")
+        _check_prediction(category, prediction)
+        yield category, prediction
+
+
+def stream_theme_file(filepath: str, store: Path = None, name: str = None) -> tuple[str, dict]:
+    """
+    Validate a theme file and stream it into the theme store.
+    
+    Predictions are checked and written one at a time, so memory use does
+    not grow with the size of the theme. The theme file is staged but not
+    added to the manifest; pass the result to update_theme_manifest().
+    
+    Files ending in .jsonl or .ndjson are read as JSON lines (see
+    _iter_theme_jsonl), named by their "name" line or else the file name.
+    Anything else is read as a JSON theme export:
+    {"name": "theme_name", "categories": {"category": ["prediction", ...]}}
+    
+    Args:
+        filepath: Path to the theme file.
+        store: Theme store directory (default: next to CUSTOM_THEMES_FILE).
+        name: Optional theme name, overriding the one in the file.
+    
+    Returns:
+        Tuple of (theme name, manifest entry).
+    
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If the file is malformed or fails validation
+                    (json.JSONDecodeError for invalid JSON syntax).
+    """
+    path = Path(filepath)
+    lines = path.suffix.lower() in (".jsonl", ".ndjson")
+    fields = {}
+    writer = _ThemeFileWriter(store)
+    try:
+        with open(path, "rb") as f:
+            for category, prediction in (_iter_theme_jsonl if lines else _iter_theme_json)(f, fields):
+                writer.add(category, prediction)
+        
+        name = name or fields.get("name") or (path.stem if lines else None)
+        if not name:
+            raise ValueError("Theme 'name' field is required.")
+        name = validate_theme_name(name)
+        if not writer.counts:
+            raise ValueError("Theme file has no predictions." if lines else "Theme 'categories' field is required.")
+        return name, writer.commit(name)
+    except BaseException:
+        writer.discard()
+        raise
+
+
+def import_theme_from_file(filepath: str) -> bool:
+    """
+    Import a custom theme from a JSON or JSONL file.
+    
+    The JSON file should have the format:
+    {
+        "name": "theme_name",
+        "categories": {
+            "category1": ["prediction1", "prediction2", ...],
+            "category2": ["prediction1", "prediction2", ...]
+        }
+    }
+    
+    A .jsonl file holds one {"category": ..., "prediction": ...} object per
+    line. Either way the file is streamed, so very large themes import
+    with bounded memory.
+    
+    Args:
+        filepath: Path to the JSON or JSONL file.
+    
+    Returns:
+        True if successful, False otherwise.
+    """
+    try:
+        name, entry = stream_theme_file(filepath)
+    except FileNotFoundError:
+        print(f"Error: File '{filepath}' not found.")
+        return False
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        print(f"Error: Invalid JSON in '{filepath}': {e}")
+        return False
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
+    except IOError as e:
+        print(f"Error reading file '{filepath}': {e}")
+        return False
+    
+    if name in load_theme_manifest():
+        print(f"Note: Updating existing custom theme '{name}'.")
+    update_theme_manifest({name: entry})
+    _report_theme_saved(name, entry)
+    return True
+
+
+# Bulk theme import (Iteration 11)
+
+THEME_FILE_SUFFIXES = (".json", ".jsonl", ".ndjson")
+
+# Worker processes for bulk imports (None: one per CPU)
+THEME_IMPORT_WORKERS = None
+
+# The only directory POST /themes/import may read theme packs from
+# (None: an "imports" directory under HISTORY_DIR)
+THEME_IMPORT_ROOT = None
+
+
+def _theme_import_root() -> Path:
+    """Directory the API is allowed to import theme packs from."""
+    return Path(THEME_IMPORT_ROOT) if THEME_IMPORT_ROOT else HISTORY_DIR / "imports"
+
+
+def resolve_theme_import_dir(directory: str) -> Path:
+    """
+    Resolve a theme pack directory requested through the API.
+    
+    Args:
+        directory: Path of the pack, relative to the import root (or an
+                   absolute path inside it).
+    
+    Returns:
+        The resolved directory.
+    
+    Raises:
+        PermissionError: If the path resolves outside the import root.
+    """
+    root = _theme_import_root().resolve()
+    path = (root / directory).resolve()
+    if not path.is_relative_to(root):
+        raise PermissionError(f"Theme packs can only be imported from '{root}'.")
+    return path
+
+
+def _import_theme_worker(filepath: str, store: str) -> tuple:
+    """
+    Parse, validate and store one theme file (runs in a worker process).
+    
+    Returns:
+        Tuple of (filepath, theme name, manifest entry, error message);
+        name and entry are None on error.
+    """
+    try:
+        name, entry = stream_theme_file(filepath, Path(store))
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return filepath, None, None, f"Invalid JSON: {e}"
+    except ValueError as e:
+        return filepath, None, None, str(e)
+    except OSError as e:
+        return filepath, None, None, f"Error reading file: {e}"
+    return filepath, name, entry, None
+
+
+def import_themes(paths: list, workers: int = None) -> dict:
+    """
+    Import many theme files in parallel and commit them together.
+    
+    Each file is parsed, validated and written to the theme store in a
+    process pool; the themes that succeed are then added with a single
+    atomic manifest update, so readers see all of them or none.
+    
+    Args:
+        paths: Theme files (JSON or JSONL, see stream_theme_file).
+        workers: Number of worker processes (default: THEME_IMPORT_WORKERS).
+    
+    Returns:
+        Dictionary with "imported" (list of {"file", "name", "predictions"})
+        and "errors" (list of {"file", "error"}), in file order.
+    """
+    paths = [str(path) for path in paths]
+    store = str(_theme_store_dir())
+    workers = min(workers or THEME_IMPORT_WORKERS or os.cpu_count() or 1, len(paths) or 1)
+    
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_import_theme_worker, paths, [store] * len(paths)))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            results = None  # No usable process pool here; import serially
+    if results is None:
+        results = [_import_theme_worker(path, store) for path in paths]
+    
+    imported, errors, entries, sources = [], [], {}, {}
+    for filepath, name, entry, error in results:
+        if error is None and name in sources:
+            error = f"Duplicate theme '{name}' (also in {Path(sources[name]).name})"
+            _discard_theme_entry(entry)
+        if error is not None:
+            errors.append({"file": filepath, "error": error})
+            continue
+        sources[name] = filepath
+        entries[name] = entry
+        imported.append({"file": filepath, "name": name, "predictions": entry["predictions"]})
+    
+    if entries:
+        try:
+            update_theme_manifest(entries)
+        except BaseException:
+            for entry in entries.values():
+                _discard_theme_entry(entry)
+            raise
+    return {"imported": imported, "errors": errors}
+
+
+def find_theme_files(directory: str) -> list:
+    """
+    List the theme files in a directory.
+    
+    Raises:
+        NotADirectoryError: If directory is not a directory.
+    """
+    path = Path(directory)
+    if not path.is_dir():
+        raise NotADirectoryError(f"'{directory}' is not a directory.")
+    return sorted(p for p in path.iterdir() if p.is_file() and p.suffix.lower() in THEME_FILE_SUFFIXES)
+
+
+def import_themes_from_directory(directory: str) -> bool:
+    """
+    Import every theme file in a directory and report per-file results.
+    
+    Args:
+        directory: Directory containing .json/.jsonl theme files.
+    
+    Returns:
+        True if at least one theme was imported, False otherwise.
+    """
+    try:
+        files = find_theme_files(directory)
+    except NotADirectoryError as e:
+        print(f"Error: {e}")
+        return False
+    if not files:
+        print(f"No theme files ({', '.join(THEME_FILE_SUFFIXES)}) found in '{directory}'.")
+        return False
+    
+    print(f"📦 Importing {len(files)} theme file(s) from {directory}...")
+    result = import_themes(files)
+    
+    for item in result["imported"]:
+        print(f"   ✅ {Path(item['file']).name}: '{item['name']}' ({item['predictions']} predictions)")
+    for item in result["errors"]:
+        print(f"   ❌ {Path(item['file']).name}: {item['error']}")
+    
+    print(f"\nImported {len(result['imported'])} theme(s), {len(result['errors'])} error(s).")
+    return bool(result["imported"])
+
+
+# Theme repository (Iteration 11)
+
+THEME_REPOSITORY_URL = "http://localhost:8765"
+THEME_REPOSITORY_PORT = 8765
+THEME_REPOSITORY_TIMEOUT = 10
+
+# Theme content hashes: the first 16 hex digits of the file's SHA-256
+_THEME_HASH_RE = re.compile(r"[0-9a-f]{16}")
+
+
+def _theme_cache_dir() -> Path:
+    """Directory caching repository indexes and downloaded theme files."""
+    return CUSTOM_THEMES_FILE.with_name("theme-cache")
+
+
+def theme_repository_index(manifest: dict) -> bytes:
+    """
+    Build a repository index from a theme store manifest.
+    
+    Returns:
+        JSON bytes: {"version": 1, "themes": {name: {"hash", "categories",
+        "predictions"}}}.
+    """
+    themes = {
+        name: {"hash": entry["hash"], "categories": list(entry["categories"]), "predictions": entry["predictions"]}
+        for name, entry in sorted(manifest.items())
+    }
+    return dump_json_bytes({"version": 1, "themes": themes})
+
+
+class ThemeRepositoryServer(ThreadingHTTPServer):
+    """
+    HTTP server publishing a theme store.
+    
+    Args:
+        address: (host, port) to bind.
+        themes_file: Manifest of the theme store to serve (default:
+                     CUSTOM_THEMES_FILE).
+    """
+    
+    def __init__(self, address: tuple, themes_file: Path = None):
+        super().__init__(address, ThemeRepositoryHandler)
+        self.themes_file = Path(themes_file or CUSTOM_THEMES_FILE)
+        self.store = self.themes_file.with_name("themes")
+        self._index = (None, {}, b"", "")
+        self._index_lock = threading.Lock()
+    
+    def index(self) -> tuple[dict, bytes, str]:
+        """Return the served manifest, index bytes and index ETag, rebuilt after the manifest changes."""
+        signature = _file_signature(self.themes_file)
+        with self._index_lock:
+            if signature != self._index[0]:
+                try:
+                    with open(self.themes_file) as f:
+                        manifest = json.load(f).get("themes") or {}
+                except (OSError, ValueError, AttributeError):
+                    manifest = {}
+                body = theme_repository_index(manifest)
+                self._index = (signature, manifest, body, hashlib.sha256(body).hexdigest()[:16])
+            return self._index[1:]
+
+
+class ThemeRepositoryHandler(BaseHTTPRequestHandler):
+    """
+    Serve a theme store as a theme repository.
+    
+    GET /index.json lists the themes with their content hashes and
+    GET /themes/<name>.jsonl returns a theme's predictions file. Responses
+    carry an ETag (the content hash) and answer If-None-Match with 304,
+    and are gzipped when the client accepts it.
+    """
+    
+    server_version = "TheFutureThemes/1"
+    
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        manifest, index, index_etag = self.server.index()
+        if path == "/index.json":
+            body, etag = index, index_etag
+            content_type = "application/json"
+        else:
+            match = re.fullmatch(r"/themes/([a-z0-9_-]+)\.jsonl", path)
+            entry = manifest.get(match.group(1)) if match else None
+            if entry is None:
+                self.send_error(404, "Theme not found")
+                return
+            try:
+                body = (self.server.store / entry["file"]).read_bytes()
+            except OSError:
+                self.send_error(404, "Theme not found")
+                return
+            etag = entry["hash"]
+            content_type = "application/x-ndjson"
+        
+        requested = {tag.strip().removeprefix("W/") for tag in self.headers.get("If-None-Match", "").split(",")}
+        if f'"{etag}"' in requested or "*" in requested:
+            self.send_response(304)
+            self.send_header("ETag", f'"{etag}"')
+            self.end_headers()
+            return
+        
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            encoding = "gzip"
+        else:
+            encoding = None
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", f'"{etag}"')
+        self.send_header("Cache-Control", "no-cache")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        print(f"📡 {self.address_string()} {format % args}")
+
+
+def serve_theme_repository(port: int = None) -> None:
+    """
+    Serve the local custom themes as a theme repository.
+    
+    Like the API server, it binds to localhost (127.0.0.1) only.
+    
+    Args:
+        port: Port to listen on (default: THEME_REPOSITORY_PORT).
+    """
+    port = port or THEME_REPOSITORY_PORT
+    themes = load_theme_manifest()  # Migrates a legacy themes.json
+    server = ThemeRepositoryServer(("127.0.0.1", port))
+    print(f"📚 Serving {len(themes)} custom theme(s) on http://localhost:{port}/index.json")
+    print("Press Ctrl+C to stop the server.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.server_close()
+
+
+def _repository_get(url: str, etag: str = None) -> tuple[int, bytes | None, str | None]:
+    """
+    GET a repository URL, conditionally if an ETag is given.
+    
+    Returns:
+        Tuple of (status, body or None on 304, ETag without quotes).
+    
+    Raises:
+        urllib.error.URLError: If the request fails.
+    """
+    headers = {"Accept-Encoding": "gzip"}
+    if etag:
+        headers["If-None-Match"] = f'"{etag}"'
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=THEME_REPOSITORY_TIMEOUT) as response:
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return response.status, body, (response.headers.get("ETag") or "").strip('"') or None
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, None, etag
+        raise
+
+
+def fetch_theme_index(url: str = None) -> tuple[dict, str]:
+    """
+    Get a repository's theme index, revalidating the cached copy.
+    
+    The cached index is sent with If-None-Match, so an unchanged catalog
+    costs one empty 304 response. If the repository cannot be reached the
+    cached index is used.
+    
+    Args:
+        url: Repository base URL (default: THEME_REPOSITORY_URL).
+    
+    Returns:
+        Tuple of (themes from the index, "updated", "not modified" or "offline").
+    
+    Raises:
+        urllib.error.URLError: If the repository is unreachable and nothing is cached.
+        ValueError: If the repository returns an invalid index.
+    """
+    url = (url or THEME_REPOSITORY_URL).rstrip("/")
+    cache_dir = _theme_cache_dir()
+    cache_file = cache_dir / f"index-{hashlib.sha256(url.encode()).hexdigest()[:12]}.json"
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        cached = None
+    
+    try:
+        status, body, etag = _repository_get(f"{url}/index.json", cached and cached.get("etag"))
+    except (urllib.error.URLError, OSError):
+        if cached is None:
+            raise
+        return cached["themes"], "offline"
+    if status == 304 and cached is not None:
+        return cached["themes"], "not modified"
+    
+    try:
+        themes = json.loads(body)["themes"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid theme index from {url}: {e}")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(cache_file, {"url": url, "etag": etag, "themes": themes})
+    return themes, "updated"
+
+
+def browse_themes(search: str = None, url: str = None) -> bool:
+    """
+    List the themes in a repository, marking installed and outdated ones.
+    
+    Args:
+        search: Optional text to match against theme and category names.
+        url: Repository base URL (default: THEME_REPOSITORY_URL).
+    
+    Returns:
+        True if the index could be read, False otherwise.
+    """
+    try:
+        themes, status = fetch_theme_index(url)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"Error: Could not reach theme repository: {e}")
+        return False
+    
+    installed = load_theme_manifest()
+    needle = (search or "").lower()
+    matches = [
+        (name, entry) for name, entry in sorted(themes.items())
+        if needle in name or any(needle in category.lower() for category in entry.get("categories", []))
+    ]
+    
+    note = {"updated": "", "not modified": " (catalog unchanged)", "offline": " (offline: cached catalog)"}[status]
+    print(f"\n📚 Theme repository: {len(themes)} theme(s){note}\n")
+    for name, entry in matches:
+        local = installed.get(name)
+        if local is None:
+            mark = "  "
+        elif local["hash"] == entry["hash"]:
+            mark = "✓ "
+        else:
+            mark = "⬆ "
+        categories = ", ".join(entry.get("categories", []))
+        print(f"   {mark}{name}: {categories} ({entry.get('predictions', 0)} predictions)")
+    if not matches:
+        print(f"   No themes match '{search}'.")
+    print("\n   ✓ installed   ⬆ update available")
+    print("   Install with: python app.py --install-theme NAME")
+    print()
+    return True
+
+
+def install_themes(names: list, url: str = None) -> dict:
+    """
+    Install or update themes from a repository.
+    
+    Themes whose installed hash matches the index are skipped and theme
+    files already in the local cache are reused, so only changed themes
+    are downloaded. Index hashes must be well-formed, downloads and cached
+    files are checked against them, and all installed themes are committed
+    with one manifest update.
+    
+    Args:
+        names: Theme names to install.
+        url: Repository base URL (default: THEME_REPOSITORY_URL).
+    
+    Returns:
+        Dictionary with "installed", "up_to_date", "downloaded" (names) and
+        "errors" (mapping of name to message).
+    
+    Raises:
+        urllib.error.URLError: If the index cannot be fetched.
+    """
+    url = (url or THEME_REPOSITORY_URL).rstrip("/")
+    themes, _ = fetch_theme_index(url)
+    installed = load_theme_manifest()
+    cache_dir = _theme_cache_dir()
+    result = {"installed": [], "up_to_date": [], "downloaded": [], "errors": {}}
+    entries = {}
+    
+    for name in names:
+        entry = themes.get(name)
+        if entry is None:
+            result["errors"][name] = "Not in the repository."
+            continue
+        if not isinstance(entry.get("hash"), str) or not _THEME_HASH_RE.fullmatch(entry["hash"]):
+            result["errors"][name] = "Invalid hash in the repository index."
+            continue
+        if name in installed and installed[name]["hash"] == entry["hash"]:
+            result["up_to_date"].append(name)
+            continue
+        
+        cached = cache_dir / f"{entry['hash']}.jsonl"
+        try:
+            # A cached file that no longer matches its name is downloaded again
+            if not cached.exists() or hashlib.sha256(cached.read_bytes()).hexdigest()[:16] != entry["hash"]:
+                _, body, _ = _repository_get(f"{url}/themes/{name}.jsonl")
+                if hashlib.sha256(body).hexdigest()[:16] != entry["hash"]:
+                    raise ValueError("Download does not match the index hash.")
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = cached.with_name(cached.name + ".tmp")
+                tmp.write_bytes(body)
+                os.replace(tmp, cached)
+                result["downloaded"].append(name)
+            entries[name] = stream_theme_file(str(cached), name=name)[1]
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            result["errors"][name] = str(e)
+            continue
+        result["installed"].append(name)
+    
+    if entries:
+        update_theme_manifest(entries)
+    return result
+
+
+def install_theme_names(names: list, url: str = None) -> bool:
+    """
+    Install themes from a repository and report the outcome.
+    
+    Args:
+        names: Theme names to install.
+        url: Repository base URL (default: THEME_REPOSITORY_URL).
+    
+    Returns:
+        True if every theme is installed and current, False otherwise.
+    """
+    try:
+        result = install_themes(names, url)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"Error: Could not reach theme repository: {e}")
+        return False
+    
+    for name in result["installed"]:
+        source = "downloaded" if name in result["downloaded"] else "from cache"
+        print(f"✅ Installed theme '{name}' ({source}).")
+    for name in result["up_to_date"]:
+        print(f"Theme '{name}' is already up to date.")
+    for name, error in result["errors"].items():
+        print(f"Error: Could not install '{name}': {error}")
+    return not result["errors"]
+
+
+def export_theme_to_json(theme_name: str) -> bool:
+    """
+    Export a theme to JSON format.
+    
+    Args:
+        theme_name: Name of the theme to export.
+    
+    Returns:
+        True if successful, False otherwise.
+    """
+    theme_name = theme_name.lower()
+    categories = get_theme(theme_name)
+    
+    if categories is None:
+        print(f"Error: Theme '{theme_name}' not found.")
+        available = ", ".join(sorted(theme_names()))
+        print(f"Available themes: {available}")
+        return False
+    
+    export_data = {
+        "name": theme_name,
+        "categories": categories
+    }
+    
+    print(json.dumps(export_data, indent=2))
+    return True
+
+
+def get_themed_prediction(theme: str, category: str = None) -> tuple[str, str]:
+    """
+    Generate a prediction from a specific theme (built-in or custom).
+    
+    Args:
+        theme: The theme to use (built-in or custom theme name).
+        category: Optional category within the theme.
+    
+    Returns:
+        A tuple of (prediction string, category used).
+    """
+    # One lock from resolving the key to drawing, so another thread cannot
+    # evict the theme in between
+    with THEME_REGISTRY.lock:
+        key = _theme_key(theme)
+        categories = THEME_REGISTRY.categories(key) if key else None
+        
+        if categories is None:
+            available = ", ".join(sorted(theme_names()))
+            return f"Unknown theme '{theme}'. Available: {available}", theme
+        
+        if category is not None:
+            if category not in categories:
+                available = ", ".join(categories)
+                return f"Category '{category}' not available in theme '{theme}'. Available: {available}", category
+        else:
+            # Random category from the theme
+            category = random.choice(categories)
+        
+        return THEME_REGISTRY.choice(key, category), category
+
+
+def copy_to_clipboard(text: str) -> bool:
+    """
+    Copy text to the system clipboard.
+    
+    Uses multiple methods to ensure cross-platform compatibility:
+    1. pyperclip (if installed)
+    2. pbcopy (macOS)
+    3. xclip/xsel (Linux)
+    4. clip.exe (Windows/WSL)
+    
+    Args:
+        text: The text to copy to clipboard.
+    
+    Returns:
+        True if successful, False otherwise.
+    """
+    import subprocess
+    import platform
+    
+    # Try pyperclip first (cross-platform, if installed)
+    try:
+        import pyperclip
+        pyperclip.copy(text)
+        return True
+    except ImportError:
+        pass
+    except Exception:
+        pass
+    
+    system = platform.system().lower()
+    
+    # macOS
+    if system == "darwin":
+        try:
+            subprocess.run(["pbcopy"], input=text.encode("utf-8"), check=True)
+            return True
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+    
+    # Windows
+    if system == "windows":
+        try:
+            subprocess.run(["clip"], input=text.encode("utf-8"), check=True)
+            return True
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+    
+    # Linux - try xclip first, then xsel
+    if system == "linux":
+        # Try xclip
+        try:
+            subprocess.run(
+                ["xclip", "-selection", "clipboard"],
+                input=text.encode("utf-8"),
+                check=True,
+            )
+            return True
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+        
+        # Try xsel
+        try:
+            subprocess.run(
+                ["xsel", "--clipboard", "--input"],
+                input=text.encode("utf-8"),
+                check=True,
+            )
+            return True
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+        
+        # Try clip.exe (WSL)
+        try:
+            subprocess.run(["clip.exe"], input=text.encode("utf-8"), check=True)
+            return True
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+    
+    return False
+
+
+def get_prediction(category: str = None) -> tuple[str, str]:
+    """
+    Generate a prediction for the future.
+    
+    Args:
+        category: Optional category. Available categories are:
+                  fortune, weather, activity, career, relationship, health, creative.
+                  If None, a random category is chosen.
+    
+    Returns:
+        A tuple of (prediction string, category used).
+    """
+    if category is None:
+        category = random.choice(list(PREDICTIONS.keys()))
+    
+    if category not in PREDICTIONS:
+        available = ", ".join(PREDICTIONS.keys())
+        return f"Unknown category '{category}'. Available: {available}", category
+    
+    return random.choice(PREDICTIONS[category]), category
+
+
+def get_future_date(days_ahead: int = 1) -> str:
+    """
+    Get a formatted date in the future.
+    
+    Args:
+        days_ahead: Number of days in the future.
+    
+    Returns:
+        Formatted date string.
+    """
+    future = datetime.now() + timedelta(days=days_ahead)
+    return future.strftime("%A, %B %d, %Y")
+
+
+def get_time_of_day(dt: datetime = None) -> str:
+    """
+    Get the time of day as a string.
+    
+    Args:
+        dt: Optional datetime. Defaults to now.
+    
+    Returns:
+        One of: 'morning', 'afternoon', 'evening', 'night'
+    """
+    if dt is None:
+        dt = datetime.now()
+    
+    hour = dt.hour
+    if 5 <= hour < 12:
+        return "morning"
+    elif 12 <= hour < 17:
+        return "afternoon"
+    elif 17 <= hour < 21:
+        return "evening"
+    else:
+        return "night"
+
+
+def get_day_type(dt: datetime = None) -> str:
+    """
+    Get the type of day (weekday or weekend).
+    
+    Args:
+        dt: Optional datetime. Defaults to now.
+    
+    Returns:
+        'weekday' or 'weekend'
+    """
+    if dt is None:
+        dt = datetime.now()
+    
+    # weekday() returns 0-4 for Monday-Friday, 5-6 for Saturday-Sunday
+    return "weekend" if dt.weekday() >= 5 else "weekday"
+
+
+def get_time_aware_prediction(category: str = None) -> tuple[str, str]:
+    """
+    Generate a time-aware prediction for the future.
+    
+    This function considers both the time of day and day of week
+    to provide more contextually relevant predictions.
+    
+    Args:
+        category: Optional category. If None, may include time-based predictions.
+    
+    Returns:
+        A tuple of (prediction string, category used).
+    """
+    now = datetime.now()
+    time_of_day = get_time_of_day(now)
+    day_type = get_day_type(now)
+    
+    # If a specific category is requested, use it
+    if category is not None:
+        if category not in PREDICTIONS:
+            available = ", ".join(PREDICTIONS.keys())
+            return f"Unknown category '{category}'. Available: {available}", category
+        return random.choice(PREDICTIONS[category]), category
+    
+    # Create a weighted pool of predictions
+    # Include regular categories with some time-aware predictions mixed in
+    pool = []
+    
+    # Add regular category predictions (70% chance overall)
+    for cat, preds in PREDICTIONS.items():
+        for pred in preds:
+            pool.append((pred, cat))
+    
+    # Add time-of-day predictions (15% chance)
+    for pred in TIME_PREDICTIONS.get(time_of_day, []):
+        pool.append((pred, f"time:{time_of_day}"))
+    
+    # Add day-type predictions (15% chance)
+    for pred in DAY_PREDICTIONS.get(day_type, []):
+        pool.append((pred, f"day:{day_type}"))
+    
+    return random.choice(pool)
 
 
 def get_preferred_categories() -> dict:
     """
-    Calculate category preferences based on user ratings.
+    Calculate category preferences based on user ratings.
+    
+    Returns:
+        Dictionary mapping categories to preference scores (0-1).
+        Higher scores indicate more preferred categories.
+    """
+    return category_preferences(load_history_stats())
+
+
+def get_preferred_prediction(category: str = None) -> tuple[str, str]:
+    """
+    Generate a prediction weighted by user preferences.
+    
+    Higher-rated categories are more likely to be selected.
+    
+    Args:
+        category: Optional category. If specified, preference weighting is skipped.
+    
+    Returns:
+        A tuple of (prediction string, category used).
+    """
+    if category is not None:
+        return get_prediction(category)
+    
+    preferences = get_preferred_categories()
+    
+    if not preferences:
+        # No rated predictions, use regular random selection
+        return get_prediction(None)
+    
+    # Build weighted list of categories
+    weighted_categories = []
+    for cat in PREDICTIONS.keys():
+        # Default weight of 1, increased by preference score
+        weight = 1.0 + preferences.get(cat, 0) * 4  # Boost up to 5x for highly rated
+        weighted_categories.append((cat, weight))
+    
+    # Weighted random selection
+    total_weight = sum(w for _, w in weighted_categories)
+    rand = random.uniform(0, total_weight)
+    cumulative = 0
+    selected_category = list(PREDICTIONS.keys())[0]
+    
+    for cat, weight in weighted_categories:
+        cumulative += weight
+        if rand <= cumulative:
+            selected_category = cat
+            break
+    
+    return get_prediction(selected_category)
+
+
+def get_smart_prediction(category: str = None) -> tuple[str, str]:
+    """
+    Generate a prediction combining time-awareness with preference learning.
+    
+    This function combines the best of both modes:
+    - Time-aware predictions based on time of day and day of week
+    - Preference weighting from user ratings
+    
+    Args:
+        category: Optional category. If specified, uses that category with time context.
+    
+    Returns:
+        A tuple of (prediction string, category used).
+    """
+    now = datetime.now()
+    time_of_day = get_time_of_day(now)
+    day_type = get_day_type(now)
+    
+    # If a specific category is requested, use it
+    if category is not None:
+        if category not in PREDICTIONS:
+            available = ", ".join(PREDICTIONS.keys())
+            return f"Unknown category '{category}'. Available: {available}", category
+        return random.choice(PREDICTIONS[category]), category
+    
+    preferences = get_preferred_categories()
+    
+    # Build weighted list for efficient selection (without duplicating entries)
+    weighted_items = []
+    
+    # Add regular category predictions with preference weighting
+    for cat, preds in PREDICTIONS.items():
+        # Apply preference weight (1.0 to 5.0 based on rating), capped at 5.0
+        pref_weight = min(1.0 + preferences.get(cat, 0) * 4, 5.0)
+        for pred in preds:
+            weighted_items.append((pred, cat, pref_weight))
+    
+    # Add time-of-day predictions with moderate weight (2.0 for relevance)
+    for pred in TIME_PREDICTIONS.get(time_of_day, []):
+        weighted_items.append((pred, f"time:{time_of_day}", 2.0))
+    
+    # Add day-type predictions with moderate weight (2.0 for relevance)
+    for pred in DAY_PREDICTIONS.get(day_type, []):
+        weighted_items.append((pred, f"day:{day_type}", 2.0))
+    
+    # Weighted random selection using cumulative weights
+    total_weight = sum(w for _, _, w in weighted_items)
+    rand = random.uniform(0, total_weight)
+    cumulative = 0
+    
+    for pred, cat, weight in weighted_items:
+        cumulative += weight
+        if rand <= cumulative:
+            return pred, cat
+    
+    # Fallback (should not reach here)
+    return weighted_items[-1][0], weighted_items[-1][1]
+
+
+# Natural-language requests (Iteration 11)
+
+# Extra words that select a category, theme or mode in --ask requests.
+# Category and theme names (and custom theme names and categories) are
+# keywords already.
+ASK_SYNONYMS = {
+    "category": {
+        "fortune": ["luck", "lucky", "destiny", "fate", "future"],
+        "weather": ["forecast", "rain", "sunny", "sunshine", "storm", "snow"],
+        "activity": ["hobby", "weekend plan", "something to do", "fun"],
+        "career": ["job", "work", "boss", "promotion", "office", "business", "money"],
+        "relationship": ["love", "romance", "romantic", "partner", "dating", "friend", "friendship", "family"],
+        "health": ["wellness", "fitness", "exercise", "sleep", "wellbeing"],
+        "creative": ["creativity", "art", "artistic", "inspiration", "writing", "music"],
+    },
+    "theme": {
+        "motivational": ["motivation", "motivate", "encouragement", "pep talk"],
+        "holiday": ["holidays", "christmas", "festive", "new year"],
+        "spooky": ["halloween", "scary", "creepy", "ghost", "haunted"],
+        "adventure": ["adventurous", "exploring", "expedition", "journey"],
+        "spring": ["springtime"],
+        "summer": ["summertime"],
+        "fall": ["autumn"],
+        "winter": ["wintertime"],
+        "zodiac": ["horoscope", "astrology", "star sign"],
+    },
+    "mode": {
+        "smart": ["smart", "clever", "personalized", "personalised"],
+        "time_aware": ["today", "tonight", "this morning", "this afternoon", "this evening", "right now"],
+        "preferred": ["favorite", "favourite", "my preferences", "i like"],
+    },
+}
+
+# Keywords that double as the generic word for a prediction ("give me a
+# fortune about love"); they only pick a category if nothing else does.
+ASK_WEAK_KEYWORDS = {"fortune", "fortunes", "future"}
+
+# Mode precedence, as in predict_the_future
+ASK_MODES = ("smart", "time_aware", "preferred")
+
+_ASK_AUTOMATON = {"key": None, "automaton": None, "categories": None}
+_ASK_LOCK = threading.Lock()
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton matching many keywords in one pass over a text.
+    
+    Keywords are compiled into a trie whose nodes carry failure links to
+    the longest proper suffix that is also a trie path, so scanning costs
+    one step per character however many keywords there are. A keyword may
+    carry several values.
+    """
+    
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def add(self, keyword: str, value) -> None:
+        """Add a keyword; call build() after the last one."""
+        node = 0
+        for ch in keyword:
+            child = self._goto[node].get(ch)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][ch] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = child
+        self._out[node].append((len(keyword), value))
+        self._count += 1
+    
+    def build(self) -> "KeywordAutomaton":
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+        return self
+    
+    def iter_matches(self, text: str):
+        """Yield (start, end, value) for every keyword occurrence in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i + 1 - length, i + 1, value
+    
+    def find(self, text: str) -> list:
+        """
+        Find whole-word keyword matches, leftmost-longest and non-overlapping.
+        
+        Args:
+            text: Lowercased text to scan.
+        
+        Returns:
+            List of (start, end, value), in text order. A keyword with
+            several values yields one entry per value.
+        """
+        spans = [
+            (start, end, value) for start, end, value in self.iter_matches(text)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+        ]
+        spans.sort(key=lambda span: (span[0], span[0] - span[1]))
+        matches, taken, last_end = [], None, 0
+        for start, end, value in spans:
+            if (start, end) == taken:
+                matches.append((start, end, value))
+            elif start >= last_end:
+                taken, last_end = (start, end), end
+                matches.append((start, end, value))
+        return matches
+
+
+def _ask_keywords(theme_categories: dict):
+    """Yield (keyword, value) pairs for the request automaton."""
+    def forms(word):
+        word = word.lower()
+        yield word
+        if not word.endswith("s"):
+            yield word + "s"
+    
+    for category in PREDICTIONS:
+        for word in [category, *ASK_SYNONYMS["category"].get(category, [])]:
+            for form in forms(word):
+                yield form, ("category", category)
+    for theme, categories in theme_categories.items():
+        words = {theme, theme.replace("_", " ").replace("-", " "), *ASK_SYNONYMS["theme"].get(theme, [])}
+        for word in words:
+            for form in forms(word):
+                yield form, ("theme", theme)
+        for category in categories:
+            if category not in PREDICTIONS:
+                for form in forms(category):
+                    yield form, ("theme_category", theme, category)
+    for mode, words in ASK_SYNONYMS["mode"].items():
+        for word in words:
+            yield word, ("mode", mode)
+
+
+def _ask_tables() -> tuple:
+    """
+    Return the request keyword automaton and the theme categories it was
+    built from, compiling them only when needed.
+    
+    Both are cached until the custom theme manifest changes, so building
+    them is a one-off cost rather than a per-request one.
+    
+    Returns:
+        Tuple of (KeywordAutomaton, {theme: [categories]}).
+    """
+    manifest = load_theme_manifest()
+    key = tuple((name, entry.get("hash")) for name, entry in manifest.items())
+    with _ASK_LOCK:
+        hit = _ASK_AUTOMATON["automaton"] is not None and _ASK_AUTOMATON["key"] == key
+        METRICS.record_cache("ask_automaton", hit)
+        if hit:
+            return _ASK_AUTOMATON["automaton"], _ASK_AUTOMATON["categories"]
+    
+    categories = get_theme_categories()
+    automaton = KeywordAutomaton()
+    for keyword, value in _ask_keywords(categories):
+        automaton.add(keyword, value)
+    automaton.build()
+    
+    with _ASK_LOCK:
+        _ASK_AUTOMATON["key"] = key
+        _ASK_AUTOMATON["automaton"] = automaton
+        _ASK_AUTOMATON["categories"] = categories
+    return automaton, categories
+
+
+def ask_automaton() -> KeywordAutomaton:
+    """
+    Return the request keyword automaton, compiling it only when needed.
+    
+    Returns:
+        A built KeywordAutomaton whose values are ("category", name),
+        ("theme", name), ("theme_category", theme, category) or
+        ("mode", mode) tuples.
+    """
+    return _ask_tables()[0]
+
+
+def ask_theme_categories() -> dict:
+    """
+    Return every theme's category names, cached with the request automaton.
+    
+    Returns:
+        Dictionary mapping theme name to its list of categories. Treat it
+        as read-only.
+    """
+    return _ask_tables()[1]
+
+
+def parse_request(text: str) -> dict:
+    """
+    Map a free-form request such as "Give me a fortune about love" to
+    prediction options.
+    
+    The first theme named wins. A theme category (e.g. a zodiac sign)
+    selects its theme if no theme was named. Otherwise the first category
+    named wins, and a category the chosen theme doesn't have is dropped.
+    Modes follow predict_the_future's precedence: theme, smart,
+    time-aware, preferred.
+    
+    Args:
+        text: The request.
+    
+    Returns:
+        Dictionary with "category", "theme" (either may be None), "mode"
+        (as in predict_the_future) and "keywords" (the words recognised).
+    """
+    lowered = text.lower()
+    automaton, categories_by_theme = _ask_tables()
+    matches = automaton.find(lowered)
+    
+    themes, theme_categories, strong, weak, modes = [], [], [], [], set()
+    for start, end, value in matches:
+        kind = value[0]
+        if kind == "theme":
+            themes.append(value[1])
+        elif kind == "theme_category":
+            theme_categories.append(value[1:])
+        elif kind == "mode":
+            modes.add(value[1])
+        else:
+            (weak if lowered[start:end] in ASK_WEAK_KEYWORDS else strong).append(value[1])
+    
+    theme = themes[0] if themes else None
+    named = [category for owner, category in theme_categories if theme in (None, owner)]
+    if theme is None and theme_categories:
+        theme = theme_categories[0][0]
+    category = (named or strong or weak or [None])[0]
+    if theme and category and category not in categories_by_theme.get(theme, []):
+        category = None
+    
+    if theme:
+        mode = "theme"
+    else:
+        mode = next((m for m in ASK_MODES if m in modes), "default")
+    
+    keywords = list(dict.fromkeys(lowered[start:end] for start, end, _ in matches))
+    return {"category": category, "theme": theme, "mode": mode, "keywords": keywords}
+
+
+def request_options(parsed: dict) -> dict:
+    """Convert a parse_request() result into predict_the_future() arguments."""
+    return {
+        "category": parsed["category"],
+        "theme": parsed["theme"],
+        "smart": parsed["mode"] == "smart",
+        "time_aware": parsed["mode"] == "time_aware",
+        "use_preferences": parsed["mode"] == "preferred",
+    }
+
+
+def describe_request(parsed: dict) -> str:
+    """Summarize a parse_request() result for display."""
+    parts = []
+    if parsed["theme"]:
+        parts.append(f"{parsed['theme'].title()} theme")
+    if parsed["category"]:
+        parts.append(f"{parsed['category'].title()} category")
+    if parsed["mode"] not in ("theme", "default"):
+        parts.append(f"{parsed['mode'].replace('_', '-')} mode")
+    return ", ".join(parts) if parts else "nothing specific (a random prediction)"
+
+
+def predict_the_future(category: str = None, time_aware: bool = False, use_preferences: bool = False, smart: bool = False, theme: str = None) -> dict:
+    """
+    Generate a complete future prediction.
+    
+    Args:
+        category: Optional prediction category.
+        time_aware: If True, include time-of-day and day-of-week context.
+        use_preferences: If True, weight categories by user ratings.
+        smart: If True, combine time-aware and preference modes.
+        theme: Optional theme for predictions (motivational, holiday, spooky, adventure).
+    
+    Returns:
+        Dictionary with prediction details.
+    """
+    # Select prediction based on mode
+    # Mode precedence: theme > smart > time_aware > use_preferences > default
+    # Theme mode uses its own prediction sets and doesn't combine with other modes
+    if theme:
+        prediction, used_category = get_themed_prediction(theme, category)
+    elif smart:
+        prediction, used_category = get_smart_prediction(category)
+    elif time_aware:
+        prediction, used_category = get_time_aware_prediction(category)
+    elif use_preferences:
+        prediction, used_category = get_preferred_prediction(category)
+    else:
+        prediction, used_category = get_prediction(category)
+    
+    future_date = get_future_date(random.randint(1, 7))
+    
+    if theme:
+        mode = "theme"
+    elif smart:
+        mode = "smart"
+    elif time_aware:
+        mode = "time_aware"
+    elif use_preferences:
+        mode = "preferred"
+    else:
+        mode = "default"
+    
+    result = {
+        "prediction": prediction,
+        "applies_to": future_date,
+        "category": used_category,
+        "confidence": f"{random.randint(70, 99)}%",
+        "generated_at": datetime.now().isoformat(),
+        "mode": mode,
+    }
+    
+    # Add theme info if using a theme
+    if theme:
+        result["theme"] = theme
+    
+    # Add time context if time-aware or smart mode
+    if time_aware or smart:
+        now = datetime.now()
+        result["time_of_day"] = get_time_of_day(now)
+        result["day_type"] = get_day_type(now)
+    
+    return result
+
+
+@timed_storage("load_history")
+def load_history() -> list:
+    """
+    Load prediction history from file.
+    
+    Returns:
+        List of past predictions.
+    """
+    if not HISTORY_FILE.exists():
+        return []
+    
+    try:
+        with open(HISTORY_FILE, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return []
+
+
+def encode_history_cursor(direction: str, prediction_id: int) -> str:
+    """
+    Encode an opaque history pagination cursor.
+    
+    Args:
+        direction: "before" for older records, "after" for newer ones.
+        prediction_id: The ID the next page starts from (exclusive).
+    
+    Returns:
+        URL-safe cursor string.
+    """
+    raw = f"{direction[0]}:{prediction_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> tuple[str, int]:
+    """
+    Decode a cursor produced by encode_history_cursor.
+    
+    Args:
+        cursor: The opaque cursor string.
+    
+    Returns:
+        A tuple of (direction, prediction_id).
+    
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, _, value = base64.urlsafe_b64decode(padded).decode("ascii").partition(":")
+        direction = {"b": "before", "a": "after"}[kind]
+        return direction, int(value)
+    except (KeyError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid history cursor '{cursor}'") from e
+
+
+def get_history_page(limit: int = 10, before_id: int = None, after_id: int = None,
+                     category: str = None, rated_only: bool = False,
+                     history: list = None) -> dict:
+    """
+    Return one page of history using keyset pagination on prediction IDs.
+    
+    History is stored in ascending ID order, so the page boundary is found
+    with a binary search and only records on the page (plus any skipped by
+    the filters) are visited.
+    
+    Args:
+        limit: Maximum number of predictions on the page.
+        before_id: Return predictions older than this ID (default: newest).
+        after_id: Return predictions newer than this ID (combined with
+                  before_id, only those strictly between the two).
+        category: Optional category filter.
+        rated_only: If True, only include rated predictions.
+        history: Optional already-loaded history list.
+    
+    Returns:
+        Dictionary with "items" (oldest first, like history itself) and
+        "next_cursor" / "prev_cursor" for older and newer pages (None when
+        there is nothing further in that direction).
+    """
+    if history is None:
+        history = load_history()
+    
+    category = category.lower() if category else None
+    
+    def matches(pred):
+        if category and pred.get("category", "").lower() != category:
+            return False
+        if rated_only and pred.get("rating") is None:
+            return False
+        return True
+    
+    def record_id(pred):
+        return pred.get("id", 0)
+    
+    items = []
+    if after_id is not None:
+        # Walk forward from the first record newer than after_id, stopping
+        # before before_id when both bounds are given
+        i = bisect.bisect_right(history, after_id, key=record_id)
+        stop = len(history) if before_id is None else bisect.bisect_left(history, before_id, key=record_id)
+        while i < stop and len(items) < limit:
+            if matches(history[i]):
+                items.append(history[i])
+            i += 1
+        more_newer = i < len(history)
+        more_older = bool(items) and bisect.bisect_left(history, record_id(items[0]), key=record_id) > 0
+    else:
+        # Walk backward from the last record older than before_id
+        end = len(history) if before_id is None else bisect.bisect_left(history, before_id, key=record_id)
+        i = end - 1
+        while i >= 0 and len(items) < limit:
+            if matches(history[i]):
+                items.append(history[i])
+            i -= 1
+        items.reverse()
+        more_older = i >= 0
+        more_newer = end < len(history)
+    
+    next_cursor = prev_cursor = None
+    if items and more_older:
+        next_cursor = encode_history_cursor("before", record_id(items[0]))
+    if items and more_newer:
+        prev_cursor = encode_history_cursor("after", record_id(items[-1]))
+    
+    return {"items": items, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+
+
+@timed_storage("save_to_history")
+def save_to_history(prediction: dict) -> None:
+    """
+    Save a prediction to history file.
+    
+    Args:
+        prediction: The prediction dictionary to save.
+    """
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    
+    history = load_history()
+    
+    # Assign an ID if not present
+    if "id" not in prediction:
+        # Find the next available ID
+        max_id = 0
+        for p in history:
+            if "id" in p and isinstance(p["id"], int):
+                max_id = max(max_id, p["id"])
+        prediction["id"] = max_id + 1
+    
+    sidecar = _read_history_sidecar()
+    stats = load_history_stats(history, sidecar)
+    rollups = load_rollups(sidecar)
+    sketches = load_sketches(sidecar)
+    search_index = load_history_search_index(history, cached=False, sidecar=sidecar)
+    
+    history.append(prediction)
+    _stamp_records(history)  # new record, plus lazy backfill of older ones
+    _apply_record_stats(stats, prediction, 1)
+    
+    # Keep only the most recent predictions
+    evicted = history[:-MAX_HISTORY]
+    for pred in evicted:
+        _apply_record_stats(stats, pred, -1)
+    history = history[-MAX_HISTORY:]
+    _update_date_range(stats, history, prediction)
+    
+    _apply_rollup_prediction(rollups, prediction)
+    _apply_sketch_prediction(sketches, prediction)
+    search_index = _apply_search_prediction(search_index, prediction, history, evicted)
+    
+    with open(HISTORY_FILE, "w") as f:
+        json.dump(history, f, indent=2)
+    
+    _save_history_aggregates(stats, rollups, sketches, search_index, sidecar)
+
+
+# History stats aggregates (Iteration 11)
+
+def _file_signature(path: Path) -> list | None:
+    """
+    Identify a file's current contents by modification time and size.
+    
+    Returns:
+        [mtime_ns, size], or None if the file does not exist.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    """
+    Write JSON to a temporary file and rename it over path.
+    
+    The document is encoded in one call (orjson when installed, else the
+    standard library's C encoder) and written at once; json.dump would
+    encode it piecewise in Python with a write per fragment.
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        content = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+# Everything derived from history (stats, rollups, sketches and the search
+# index) is kept in one sidecar file, so saving a prediction costs a single
+# extra read and write however many aggregates there are
+HISTORY_SIDECAR_VERSION = 1
+
+# Per-aggregate files written before they shared the sidecar
+_LEGACY_SIDECAR_FILES = {
+    "stats": "stats.json",
+    "rollups": "rollups.json",
+    "sketches": "sketches.json",
+    "search": "search.json",
+}
+
+
+def _history_sidecar_file() -> Path:
+    return HISTORY_FILE.with_name("aggregates.json")
+
+
+def _read_history_sidecar() -> dict:
+    """
+    Read the aggregates kept next to the history file.
+    
+    If there is no sidecar yet, the per-aggregate files of older versions
+    are read instead, so all-time rollups and sketches survive the upgrade.
+    
+    Returns:
+        Dictionary mapping section ("stats", "rollups", "sketches",
+        "search") to its data; missing or unreadable sections are left out.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    try:
+        with open(_history_sidecar_file(), "rb") as f:
+            data = loads(f.read())
+        if data.get("version") == HISTORY_SIDECAR_VERSION and isinstance(data.get("sections"), dict):
+            return data["sections"]
+    except FileNotFoundError:
+        sections = {}
+        for section, name in _LEGACY_SIDECAR_FILES.items():
+            try:
+                with open(HISTORY_FILE.with_name(name), "r") as f:
+                    sections[section] = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        return sections
+    except (json.JSONDecodeError, IOError, AttributeError):
+        pass
+    return {}
+
+
+def _write_history_sidecar(sections: dict, sidecar: dict = None) -> None:
+    """
+    Replace sections of the history sidecar with one atomic write.
+    
+    Args:
+        sections: Mapping of section name to its new data.
+        sidecar: The sections as the caller already read them; if None,
+                 the sidecar is read so the other sections are kept.
+    """
+    path = _history_sidecar_file()
+    migrating = not path.exists()
+    merged = dict(_read_history_sidecar() if sidecar is None else sidecar)
+    merged.update(sections)
+    _write_json_atomic(path, {"version": HISTORY_SIDECAR_VERSION, "sections": merged})
+    if migrating:
+        for name in _LEGACY_SIDECAR_FILES.values():
+            HISTORY_FILE.with_name(name).unlink(missing_ok=True)
+
+
+def _save_history_aggregates(stats: dict, rollups: dict, sketches: dict, search_index: "InvertedIndex",
+                             sidecar: dict = None) -> None:
+    """
+    Persist every history aggregate with a single sidecar write.
+    
+    Call right after writing HISTORY_FILE: the stats and search index are
+    stamped with its signature so readers can tell they are current.
+    
+    Args:
+        stats: Aggregates from load_history_stats().
+        rollups: Rollups from load_rollups().
+        sketches: Sketches from load_sketches().
+        search_index: Index from load_history_search_index().
+        sidecar: The sidecar sections the aggregates were loaded from.
+    """
+    signature = _file_signature(HISTORY_FILE)
+    stats["source"] = signature
+    _write_history_sidecar({
+        "stats": stats,
+        "rollups": _prune_rollups(rollups),
+        "sketches": _encode_sketches(sketches),
+        "search": {"version": HISTORY_SEARCH_VERSION, "source": signature, **search_index.to_dict()},
+    }, sidecar)
+    with _HISTORY_SEARCH_LOCK:
+        _HISTORY_SEARCH["key"] = (HISTORY_FILE, signature)
+        _HISTORY_SEARCH["index"] = search_index
+
+
+HISTORY_STATS_VERSION = 2
+
+# Dimensions of the stats cube, in the order used for cell keys
+STATS_DIMENSIONS = ("category", "theme", "mode", "time_of_day", "day_type")
+
+
+def _empty_history_stats() -> dict:
+    return {
+        "version": HISTORY_STATS_VERSION,
+        "total": 0,
+        "categories": {},
+        "ratings": {},
+        "rating_count": 0,
+        "rating_sum": 0,
+        "category_ratings": {},
+        "first_generated_at": None,
+        "last_generated_at": None,
+        "cube": {},
+    }
+
+
+def _bump(counts: dict, key: str, delta: int) -> None:
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def _apply_rating_stats(stats: dict, category: str, rating: int, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one rating from the aggregates."""
+    _bump(stats["ratings"], str(rating), sign)
+    stats["rating_count"] += sign
+    stats["rating_sum"] += sign * rating
+    count, total = stats["category_ratings"].get(category, (0, 0))
+    count, total = count + sign, total + sign * rating
+    if count:
+        stats["category_ratings"][category] = [count, total]
+    else:
+        stats["category_ratings"].pop(category, None)
+
+
+def _cube_key(pred: dict) -> str:
+    """Key of the stats cube cell a prediction falls in."""
+    values = [pred.get(dim) for dim in STATS_DIMENSIONS]
+    values[0] = values[0] or "unknown"
+    return json.dumps(values)
+
+
+def _apply_cube_stats(cube: dict, key: str, count: int, rated: int, rating_sum: int) -> None:
+    """Add deltas to one [count, rated, rating_sum] cell of the stats cube."""
+    cell = cube.get(key, [0, 0, 0])
+    cell = [cell[0] + count, cell[1] + rated, cell[2] + rating_sum]
+    if any(cell):
+        cube[key] = cell
+    else:
+        cube.pop(key, None)
+
+
+def _apply_record_stats(stats: dict, pred: dict, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one prediction from the aggregates."""
+    category = pred.get("category", "unknown")
+    stats["total"] += sign
+    _bump(stats["categories"], category, sign)
+    rating = pred.get("rating")
+    if rating is not None:
+        _apply_rating_stats(stats, category, rating, sign)
+    _apply_cube_stats(stats["cube"], _cube_key(pred), sign,
+                      sign if rating is not None else 0, sign * (rating or 0))
+
+
+def _parse_timestamp(value) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _record_ts(pred: dict) -> int | None:
+    """
+    Get a prediction's generation time as integer epoch seconds.
+    
+    Uses the "ts" field stored on write, parsing "generated_at" only for
+    records written before it existed.
+    """
+    if "ts" in pred:
+        return pred["ts"]
+    dt = _parse_timestamp(pred.get("generated_at"))
+    return int(dt.timestamp()) if dt else None
+
+
+def _stamp_records(history: list) -> None:
+    """Store the epoch timestamp on records that do not have one yet."""
+    for pred in history:
+        if "ts" not in pred and "generated_at" in pred:
+            pred["ts"] = _record_ts(pred)
+
+
+def _update_date_range(stats: dict, history: list, added: dict) -> None:
+    """Maintain first/last timestamps after appending and trimming history."""
+    added_dt = _parse_timestamp(added.get("generated_at"))
+    last_dt = _parse_timestamp(stats["last_generated_at"])
+    if added_dt and (last_dt is None or added_dt > last_dt):
+        stats["last_generated_at"] = added["generated_at"]
+    
+    # History is appended in time order, so the oldest retained timestamp is
+    # normally the first record's
+    stats["first_generated_at"] = None
+    for pred in history:
+        if _parse_timestamp(pred.get("generated_at")):
+            stats["first_generated_at"] = pred["generated_at"]
+            break
+
+
+def compute_history_stats(history: list) -> dict:
+    """
+    Compute the stats aggregates with a full scan of history.
+    
+    Args:
+        history: The prediction history.
+    
+    Returns:
+        Aggregate dictionary (see load_history_stats).
+    """
+    stats = _empty_history_stats()
+    first = last = None
+    for pred in history:
+        _apply_record_stats(stats, pred, 1)
+        ts = _record_ts(pred)
+        if ts is None:
+            continue
+        if first is None or ts < first[0]:
+            first = (ts, pred["generated_at"])
+        if last is None or ts > last[0]:
+            last = (ts, pred["generated_at"])
+    stats["first_generated_at"] = first[1] if first else None
+    stats["last_generated_at"] = last[1] if last else None
+    return stats
+
+
+def load_history_stats(history: list = None, sidecar: dict = None) -> dict:
+    """
+    Load the materialized history statistics.
+    
+    The aggregates are kept in the history sidecar and updated
+    incrementally on every write. They record the history file's
+    signature, so if history was changed by anything else they are
+    rebuilt once with a full scan.
+    
+    Args:
+        history: Optional already-loaded history, used if a rebuild is needed.
+        sidecar: Optional already-read sidecar sections.
+    
+    Returns:
+        Dictionary with total, categories, ratings (histogram), rating_count,
+        rating_sum, category_ratings ([count, sum] per category) and
+        first_generated_at / last_generated_at.
+    """
+    signature = _file_signature(HISTORY_FILE)
+    if signature is None:
+        return _empty_history_stats()
+    
+    stats = (_read_history_sidecar() if sidecar is None else sidecar).get("stats")
+    if isinstance(stats, dict) and stats.get("source") == signature and stats.get("version") == HISTORY_STATS_VERSION:
+        return stats
+    
+    stats = compute_history_stats(load_history() if history is None else history)
+    stats["source"] = signature
+    try:
+        _write_history_sidecar({"stats": stats}, sidecar)
+    except IOError:
+        pass
+    return stats
+
+
+def category_preferences(stats: dict) -> dict:
+    """
+    Derive category preference scores from the stats aggregates.
+    
+    Args:
+        stats: Aggregates from load_history_stats().
+    
+    Returns:
+        Dictionary mapping categories to preference scores (0-1).
+    """
+    return {
+        cat: (total / count - 1) / 4
+        for cat, (count, total) in stats["category_ratings"].items()
+        if count
+    }
+
+
+def query_stats(group_by: list, filters: dict = None, since: str = None) -> list:
+    """
+    Aggregate prediction counts and ratings over any combination of dimensions.
+    
+    Breakdowns are summed from the cells of the stats cube, so no history
+    scan is needed. A since filter cannot be answered from the cube (it has
+    no time axis), so in that case the matching records are scanned instead.
+    
+    Args:
+        group_by: Dimensions to group by (see STATS_DIMENSIONS); may be empty
+            for a single total.
+        filters: Optional mapping of dimension to required value (case-insensitive;
+            "none" matches predictions without that field).
+        since: Optional ISO date; only count predictions from then on.
+    
+    Returns:
+        List of groups, largest first, each with the group's dimension values,
+        count, rated count and average rating.
+    
+    Raises:
+        ValueError: If an unknown dimension is given or since is not an ISO date.
+    """
+    _parse_since(since)
+    filters = {dim: value for dim, value in (filters or {}).items() if value is not None}
+    unknown = [dim for dim in [*group_by, *filters] if dim not in STATS_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown dimension '{unknown[0]}'. Use any of: {', '.join(STATS_DIMENSIONS)}")
+    
+    if since:
+        cube = {}
+        for pred in filter_history(since=since):
+            rating = pred.get("rating")
+            _apply_cube_stats(cube, _cube_key(pred), 1, int(rating is not None), rating or 0)
+    else:
+        cube = load_history_stats()["cube"]
+    
+    wanted = {STATS_DIMENSIONS.index(dim): str(value).lower() for dim, value in filters.items()}
+    positions = [STATS_DIMENSIONS.index(dim) for dim in group_by]
+    groups = {}
+    for key, (count, rated, rating_sum) in cube.items():
+        values = json.loads(key)
+        if any(str(values[i]).lower() != value for i, value in wanted.items()):
+            continue
+        group = groups.setdefault(tuple(values[i] for i in positions), [0, 0, 0])
+        group[0] += count
+        group[1] += rated
+        group[2] += rating_sum
+    
+    results = [
+        {
+            **dict(zip(group_by, group)),
+            "count": count,
+            "rated": rated,
+            "average_rating": round(rating_sum / rated, 2) if rated else None,
+        }
+        for group, (count, rated, rating_sum) in groups.items()
+        if count
+    ]
+    results.sort(key=lambda row: (-row["count"], [str(row[dim]) for dim in group_by]))
+    return results
+
+
+def show_stats_query(group_by: list, filters: dict = None, since: str = None) -> None:
+    """
+    Display a grouped statistics breakdown.
+    
+    Args:
+        group_by: Dimensions to group by.
+        filters: Optional mapping of dimension to required value.
+        since: Optional ISO date; only count predictions from then on.
+    """
+    try:
+        rows = query_stats(group_by, filters, since)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    
+    if not rows:
+        print("No matching predictions found.")
+        return
+    
+    print(f"\n📊 Predictions by {', '.join(group_by) or 'total'}\n")
+    labels = [" / ".join(str(row[dim]) if row[dim] is not None else "-" for dim in group_by) or "all"
+              for row in rows]
+    width = max(len(label) for label in labels)
+    print(f"   {'':<{width}}  {'count':>6}  {'rated':>6}  {'avg':>5}")
+    for label, row in zip(labels, rows):
+        avg = f"{row['average_rating']:.2f}" if row["average_rating"] is not None else "-"
+        print(f"   {label:<{width}}  {row['count']:>6}  {row['rated']:>6}  {avg:>5}")
+    print()
+
+
+def _print_history_entry(i: int, pred: dict) -> None:
+    rating_str = ""
+    if pred.get("rating") is not None:
+        rating_str = f" ⭐{pred['rating']}/5"
+    print(f"{i}. [ID:{pred.get('id', 'N/A')}] [{pred.get('category', 'unknown').title()}]{rating_str} {pred['prediction']}")
+    if "generated_at" in pred:
+        # Parse and format the timestamp
+        try:
+            dt = datetime.fromisoformat(pred["generated_at"])
+            print(f"   Generated: {dt.strftime('%Y-%m-%d %H:%M')}")
+        except (ValueError, TypeError):
+            pass
+    print()
+
+
+def display_history(count: int = 10, show_rated_only: bool = False, search: str = None,
+                    category: str = None, since: str = None) -> None:
+    """
+    Display recent prediction history.
+    
+    Args:
+        count: Number of recent predictions (or search results) to display.
+        show_rated_only: If True, only show predictions that have been rated.
+        search: Optional search terms; matches are shown best first.
+        category: Optional category filter for search results.
+        since: Optional ISO date filter for search results.
+    """
+    if search is not None:
+        if not tokenize(search):
+            print("Error: Search terms are too common or empty. Try more specific words.")
+            return
+        results = search_history(search, count, category, since, rated_only=show_rated_only)
+        if not results:
+            print(f"No predictions in history match '{search}'.")
+            return
+        print(f"\n🔎 {len(results)} prediction(s) matching '{search}':\n")
+        for i, pred in enumerate(results, 1):
+            _print_history_entry(i, pred)
+        return
+    
+    history = load_history()
+    
+    if not history:
+        print("No prediction history found.")
+        return
+    
+    if show_rated_only:
+        history = [p for p in history if p.get("rating") is not None]
+        if not history:
+            print("No rated predictions found. Use --feedback to rate predictions.")
+            return
+    
+    recent = history[-count:]
+    title = "rated prediction(s)" if show_rated_only else "prediction(s)"
+    print(f"\n📜 Last {len(recent)} {title}:\n")
+    
+    for i, pred in enumerate(reversed(recent), 1):
+        _print_history_entry(i, pred)
+
+
+# Time-bucketed analytics rollups (Iteration 11)
+
+ROLLUP_BUCKETS = ("hour", "day", "week")
+
+# Hourly buckets older than this are pruned; daily and weekly ones are kept
+ROLLUP_HOURLY_RETENTION_DAYS = 30
+
+
+def rollup_keys(dt: datetime) -> dict:
+    """
+    Get the bucket key for a timestamp at each rollup granularity.
+    
+    Keys sort chronologically as strings.
+    
+    Args:
+        dt: The timestamp.
+    
+    Returns:
+        Dictionary mapping "hour", "day" and "week" to bucket keys.
+    """
+    return {
+        "hour": dt.strftime("%Y-%m-%dT%H"),
+        "day": dt.strftime("%Y-%m-%d"),
+        "week": dt.strftime("%G-W%V"),
+    }
+
+
+def rollup_bucket_start(bucket: str, key: str) -> datetime:
+    """Return the start time of a rollup bucket key."""
+    if bucket == "hour":
+        return datetime.strptime(key, "%Y-%m-%dT%H")
+    if bucket == "week":
+        return datetime.strptime(key + "-1", "%G-W%V-%u")
+    return datetime.strptime(key, "%Y-%m-%d")
+
+
+def _prediction_cells(rollups: dict, pred: dict) -> list:
+    """Get (creating if needed) the rollup cells a prediction falls into."""
+    dt = _parse_timestamp(pred.get("generated_at"))
+    if dt is None:
+        return []
+    cells = []
+    for bucket, key in rollup_keys(dt).items():
+        cell = rollups["buckets"][bucket].get(key)
+        if cell is None:
+            cell = rollups["buckets"][bucket][key] = {
+                "predictions": 0,
+                "ratings": 0,
+                "rating_sum": 0,
+                "category": {},
+                "theme": {},
+                "mode": {},
+            }
+        cells.append(cell)
+    return cells
+
+
+def _apply_rollup_prediction(rollups: dict, pred: dict) -> None:
+    """Count a new prediction (and its rating, if any) in every granularity."""
+    for cell in _prediction_cells(rollups, pred):
+        cell["predictions"] += 1
+        _bump(cell["category"], pred.get("category", "unknown"), 1)
+        if pred.get("theme"):
+            _bump(cell["theme"], pred["theme"], 1)
+        _bump(cell["mode"], pred.get("mode", "default"), 1)
+        if pred.get("rating") is not None:
+            cell["ratings"] += 1
+            cell["rating_sum"] += pred["rating"]
+
+
+def _apply_rollup_rating(rollups: dict, pred: dict, rating: int, previous_rating: int = None) -> None:
+    """Count a rating in the buckets of the prediction it belongs to."""
+    for cell in _prediction_cells(rollups, pred):
+        if previous_rating is None:
+            cell["ratings"] += 1
+        else:
+            cell["rating_sum"] -= previous_rating
+        cell["rating_sum"] += rating
+
+
+def load_rollups(sidecar: dict = None) -> dict:
+    """
+    Load the time-bucketed rollups of predictions and ratings.
+    
+    Rollups are written to the history sidecar on every save and rating.
+    They are analytics over everything ever recorded, so predictions
+    dropped by MAX_HISTORY stay counted. If they are missing, they are
+    backfilled from the current history.
+    
+    Args:
+        sidecar: Optional already-read sidecar sections.
+    
+    Returns:
+        Dictionary with "buckets" mapping each granularity to
+        {bucket key: cell}, where a cell holds predictions, ratings,
+        rating_sum and per-category/theme/mode counts.
+    """
+    rollups = (_read_history_sidecar() if sidecar is None else sidecar).get("rollups")
+    if isinstance(rollups, dict) and rollups.get("version") == 1:
+        return rollups
+    
+    rollups = {"version": 1, "buckets": {bucket: {} for bucket in ROLLUP_BUCKETS}}
+    for pred in iter_history():
+        _apply_rollup_prediction(rollups, pred)
+    return rollups
+
+
+def _prune_rollups(rollups: dict) -> dict:
+    """Drop hourly buckets past ROLLUP_HOURLY_RETENTION_DAYS; returns rollups."""
+    cutoff = rollup_keys(datetime.now() - timedelta(days=ROLLUP_HOURLY_RETENTION_DAYS))["hour"]
+    hourly = rollups["buckets"]["hour"]
+    for key in [key for key in hourly if key < cutoff]:
+        del hourly[key]
+    return rollups
+
+
+def get_timeseries(bucket: str = "day", start: str = None, end: str = None) -> list:
+    """
+    Read prediction and rating trends from the rollups.
+    
+    Args:
+        bucket: Granularity: "hour", "day" or "week".
+        start: Optional ISO date/time; buckets containing or after it.
+        end: Optional ISO date/time; buckets containing or before it.
+    
+    Returns:
+        List of buckets in chronological order, each with its key, start
+        time, prediction and rating counts, average rating and the
+        category/theme/mode breakdowns.
+    
+    Raises:
+        ValueError: If the bucket or a date is invalid.
+    """
+    if bucket not in ROLLUP_BUCKETS:
+        raise ValueError(f"Unknown bucket '{bucket}'. Use one of: {', '.join(ROLLUP_BUCKETS)}")
+    start_key = rollup_keys(datetime.fromisoformat(start))[bucket] if start else None
+    end_key = rollup_keys(datetime.fromisoformat(end))[bucket] if end else None
+    
+    series = []
+    for key, cell in sorted(load_rollups()["buckets"][bucket].items()):
+        if start_key and key < start_key:
+            continue
+        if end_key and key > end_key:
+            break
+        series.append({
+            "bucket": key,
+            "start": rollup_bucket_start(bucket, key).isoformat(),
+            "predictions": cell["predictions"],
+            "ratings": cell["ratings"],
+            "average_rating": round(cell["rating_sum"] / cell["ratings"], 2) if cell["ratings"] else None,
+            "categories": cell["category"],
+            "themes": cell["theme"],
+            "modes": cell["mode"],
+        })
+    return series
+
+
+# Streaming sketches (Iteration 11)
+
+# HyperLogLog precision: 2**p registers, standard error about 1.04 / sqrt(2**p)
+SKETCH_PRECISION = 12
+
+# Quantile sketch relative accuracy: reported quantiles are within this
+# fraction of a true value at that rank
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+SKETCH_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class HyperLogLog:
+    """
+    Estimate the number of distinct values seen, in fixed memory.
+    
+    Args:
+        precision: Number of index bits (4-16); uses 2**precision one-byte
+            registers for a standard error of about 1.04 / sqrt(2**precision).
+    """
+    
+    def __init__(self, precision: int = 12, registers: bytes = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(registers) if registers else bytearray(1 << precision)
+        self._encoded = None  # to_dict()'s registers, until a register changes
+    
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+    
+    def add(self, value: str) -> None:
+        """Add a value (hashed; only its register slot and rank are kept)."""
+        h = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            self._encoded = None
+    
+    def count(self) -> int:
+        """Return the estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return round(estimate)
+    
+    def to_dict(self) -> dict:
+        if self._encoded is None:
+            self._encoded = base64.b64encode(zlib.compress(bytes(self.registers))).decode("ascii")
+        return {"precision": self.precision, "registers": self._encoded}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        sketch = cls(data["precision"], zlib.decompress(base64.b64decode(data["registers"])))
+        sketch._encoded = data["registers"]
+        return sketch
+
+
+class QuantileSketch:
+    """
+    Estimate quantiles of positive values with bounded relative error.
+    
+    Values are counted in logarithmically sized bins (as in DDSketch), so
+    memory grows with the range of values rather than their number, and
+    values can be removed again.
+    
+    Args:
+        relative_accuracy: Maximum relative error of a reported quantile.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01, bins: dict = None, zero_count: int = 0):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Quantile sketch relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {int(k): v for k, v in (bins or {}).items()}
+        self.zero_count = zero_count
+    
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+    
+    def add(self, value: float, weight: int = 1) -> None:
+        """Add a value (use a negative weight to remove one)."""
+        if value <= 0:
+            self.zero_count += weight
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        total = self.bins.get(key, 0) + weight
+        if total > 0:
+            self.bins[key] = total
+        else:
+            self.bins.pop(key, None)
+    
+    def quantile(self, q: float) -> float | None:
+        """Return the estimated q-quantile (0-1), or None if empty."""
+        count = self.count
+        if not count:
+            return None
+        rank = q * (count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+    
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "bins": {str(k): v for k, v in self.bins.items()},
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        return cls(data["relative_accuracy"], data["bins"], data["zero_count"])
+
+
+def _parse_confidence(value) -> int | None:
+    try:
+        return int(str(value).rstrip("%"))
+    except ValueError:
+        return None
+
+
+def _empty_sketches() -> dict:
+    return {
+        "distinct": {"all": HyperLogLog(SKETCH_PRECISION), "category": {}, "theme": {}},
+        "quantiles": {
+            "rating": QuantileSketch(SKETCH_RELATIVE_ACCURACY),
+            "confidence": QuantileSketch(SKETCH_RELATIVE_ACCURACY),
+        },
+    }
+
+
+def _apply_sketch_prediction(sketches: dict, pred: dict) -> None:
+    """Add a new prediction (and its rating, if any) to the sketches."""
+    text = pred.get("prediction", "")
+    distinct = sketches["distinct"]
+    distinct["all"].add(text)
+    for dim in ("category", "theme"):
+        if pred.get(dim):
+            if pred[dim] not in distinct[dim]:
+                distinct[dim][pred[dim]] = HyperLogLog(SKETCH_PRECISION)
+            distinct[dim][pred[dim]].add(text)
+    
+    confidence = _parse_confidence(pred.get("confidence"))
+    if confidence is not None:
+        sketches["quantiles"]["confidence"].add(confidence)
+    if pred.get("rating") is not None:
+        sketches["quantiles"]["rating"].add(pred["rating"])
+
+
+def load_sketches(sidecar: dict = None) -> dict:
+    """
+    Load the streaming sketches of served predictions.
+    
+    Like the rollups, sketches cover everything ever recorded, including
+    predictions dropped by MAX_HISTORY. They are rebuilt from the current
+    history if they are missing or were built with a different
+    SKETCH_PRECISION or SKETCH_RELATIVE_ACCURACY.
+    
+    Args:
+        sidecar: Optional already-read sidecar sections.
+    
+    Returns:
+        Dictionary with "distinct" (HyperLogLog for "all" plus per-category
+        and per-theme mappings) and "quantiles" ("rating" and "confidence"
+        QuantileSketch instances).
+    """
+    try:
+        data = (_read_history_sidecar() if sidecar is None else sidecar).get("sketches") or {}
+        if (data.get("version") == 1 and data["precision"] == SKETCH_PRECISION
+                and data["relative_accuracy"] == SKETCH_RELATIVE_ACCURACY):
+            distinct = data["distinct"]
+            return {
+                "distinct": {
+                    "all": HyperLogLog.from_dict(distinct["all"]),
+                    "category": {k: HyperLogLog.from_dict(v) for k, v in distinct["category"].items()},
+                    "theme": {k: HyperLogLog.from_dict(v) for k, v in distinct["theme"].items()},
+                },
+                "quantiles": {k: QuantileSketch.from_dict(v) for k, v in data["quantiles"].items()},
+            }
+    except (AttributeError, KeyError, TypeError, ValueError, zlib.error):
+        pass
+    
+    sketches = _empty_sketches()
+    for pred in iter_history():
+        _apply_sketch_prediction(sketches, pred)
+    return sketches
+
+
+def _encode_sketches(sketches: dict) -> dict:
+    """Convert sketches to their JSON form (see load_sketches)."""
+    distinct = sketches["distinct"]
+    return {
+        "version": 1,
+        "precision": SKETCH_PRECISION,
+        "relative_accuracy": SKETCH_RELATIVE_ACCURACY,
+        "distinct": {
+            "all": distinct["all"].to_dict(),
+            "category": {k: v.to_dict() for k, v in distinct["category"].items()},
+            "theme": {k: v.to_dict() for k, v in distinct["theme"].items()},
+        },
+        "quantiles": {k: v.to_dict() for k, v in sketches["quantiles"].items()},
+    }
+
+
+def sketch_summary(sketches: dict = None) -> dict:
+    """
+    Summarize the sketches as approximate statistics.
+    
+    Args:
+        sketches: Optional sketches from load_sketches().
+    
+    Returns:
+        Dictionary with approximate distinct prediction counts (overall,
+        per category and per theme), rating and confidence percentiles,
+        and the configured error bounds.
+    """
+    if sketches is None:
+        sketches = load_sketches()
+    distinct = sketches["distinct"]
+    
+    def percentiles(sketch):
+        return {
+            f"p{round(q * 100)}": round(value, 2) if (value := sketch.quantile(q)) is not None else None
+            for q in SKETCH_QUANTILES
+        }
+    
+    return {
+        "distinct_predictions": distinct["all"].count(),
+        "distinct_by_category": {k: v.count() for k, v in sorted(distinct["category"].items())},
+        "distinct_by_theme": {k: v.count() for k, v in sorted(distinct["theme"].items())},
+        "rating_percentiles": percentiles(sketches["quantiles"]["rating"]),
+        "confidence_percentiles": percentiles(sketches["quantiles"]["confidence"]),
+        "error": {
+            "distinct": round(distinct["all"].relative_error, 4),
+            "quantiles": SKETCH_RELATIVE_ACCURACY,
+        },
+    }
+
+
+def rate_prediction(prediction_id: int, rating: int) -> tuple[dict, int | None] | None:
+    """
+    Store a rating on a prediction in history and update the aggregates.
+    
+    Args:
+        prediction_id: The ID of the prediction to rate.
+        rating: The rating (1-5); callers validate the range.
+    
+    Returns:
+        A tuple of (updated prediction, previous rating or None), or None
+        if no prediction has that ID.
+    """
+    history = load_history()
+    
+    for pred in history:
+        if pred.get("id") == prediction_id:
+            sidecar = _read_history_sidecar()
+            stats = load_history_stats(history, sidecar)
+            rollups = load_rollups(sidecar)
+            sketches = load_sketches(sidecar)
+            search_index = load_history_search_index(history, sidecar=sidecar)
+            category = pred.get("category", "unknown")
+            previous_rating = pred.get("rating")
+            
+            pred["rating"] = rating
+            pred["rated_at"] = datetime.now().isoformat()
+            
+            with open(HISTORY_FILE, "w") as f:
+                json.dump(history, f, indent=2)
+            
+            if previous_rating is not None:
+                _apply_rating_stats(stats, category, previous_rating, -1)
+            _apply_rating_stats(stats, category, rating, 1)
+            _apply_cube_stats(stats["cube"], _cube_key(pred), 0,
+                              0 if previous_rating is not None else 1,
+                              rating - (previous_rating or 0))
+            
+            _apply_rollup_rating(rollups, pred, rating, previous_rating)
+            
+            if previous_rating is not None:
+                sketches["quantiles"]["rating"].add(previous_rating, -1)
+            sketches["quantiles"]["rating"].add(rating)
+            
+            # Ratings don't change the text, but the index must follow the file
+            _save_history_aggregates(stats, rollups, sketches, search_index, sidecar)
+            return pred, previous_rating
+    
+    return None
+
+
+def add_feedback(prediction_id: int, rating: int) -> bool:
+    """
+    Add a rating to a prediction in history.
+    
+    Args:
+        prediction_id: The ID of the prediction to rate.
+        rating: The rating (1-5).
+    
+    Returns:
+        True if successful, False otherwise.
+    """
+    if rating < 1 or rating > 5:
+        print(f"Error: Rating must be between 1 and 5, got {rating}")
+        return False
+    
+    result = rate_prediction(prediction_id, rating)
+    if result is None:
+        print(f"Error: Prediction with ID {prediction_id} not found.")
+        print("Use --history to see available predictions and their IDs.")
+        return False
+    
+    pred, _ = result
+    print(f"✅ Rated prediction {prediction_id} with {rating}/5 stars")
+    print(f"   \"{pred['prediction']}\"")
+    return True
+
+
+def show_stats(category: str = None, since: str = None) -> None:
+    """
+    Display prediction statistics.
+    
+    Args:
+        category: Optional category to restrict the statistics to.
+        since: Optional ISO date; only count predictions from then on.
+    """
+    stats = filtered_history_stats(category, since)
+    total = stats["total"]
+    
+    if not total:
+        print("No prediction history found.")
+        return
+    
+    print("\n📊 Prediction Statistics\n")
+    print(f"Total predictions: {total}")
+    
+    print("\n📂 Predictions by category:")
+    for cat, count in sorted(stats["categories"].items(), key=lambda x: -x[1]):
+        pct = (count / total) * 100
+        print(f"   {cat.title()}: {count} ({pct:.1f}%)")
+    
+    # Rated predictions
+    rated_count = stats["rating_count"]
+    if rated_count:
+        avg_rating = stats["rating_sum"] / rated_count
+        print(f"\n⭐ Rated predictions: {rated_count}")
+        print(f"   Average rating: {avg_rating:.1f}/5")
+        
+        # Rating distribution
+        print("   Rating distribution:")
+        for r in range(5, 0, -1):
+            count = stats["ratings"].get(str(r), 0)
+            bar = "★" * count
+            print(f"      {r}: {bar} ({count})")
+        
+        # Preference stats (Iteration 4)
+        preferences = category_preferences(stats)
+        if preferences:
+            print("\n🎯 Category Preferences (based on ratings):")
+            sorted_prefs = sorted(preferences.items(), key=lambda x: -x[1])
+            for cat, score in sorted_prefs:
+                bar_length = int(score * 10)
+                bar = "▓" * bar_length + "░" * (10 - bar_length)
+                print(f"   {cat.title()}: [{bar}] {score:.0%}")
+            print("   (Use --preferred to weight predictions by your preferences)")
+    else:
+        print("\n⭐ No rated predictions yet. Use --feedback to rate predictions.")
+    
+    # Time stats
+    oldest = _parse_timestamp(stats["first_generated_at"])
+    newest = _parse_timestamp(stats["last_generated_at"])
+    if oldest and newest:
+        print(f"\n📅 Date range:")
+        print(f"   First: {oldest.strftime('%Y-%m-%d %H:%M')}")
+        print(f"   Last:  {newest.strftime('%Y-%m-%d %H:%M')}")
+    
+    # Approximate all-time statistics from the sketches (Iteration 11)
+    if not category and not since:
+        summary = sketch_summary()
+        print(f"\n🔢 All-time (approximate, ±{summary['error']['distinct']:.1%}):")
+        print(f"   Distinct predictions served: ~{summary['distinct_predictions']}")
+        confidence = summary["confidence_percentiles"]
+        if confidence["p50"] is not None:
+            print(f"   Confidence p50/p90/p99: {confidence['p50']:.0f}% / "
+                  f"{confidence['p90']:.0f}% / {confidence['p99']:.0f}%")
+    
+    print()
+
+
+# Columnar history view (Iteration 11)
+
+_HISTORY_COLUMNS = {"signature": None, "columns": None}
+_HISTORY_COLUMNS_LOCK = threading.Lock()
+
+
+class HistoryColumns:
+    """
+    Column-oriented view of history for filtering and group-bys.
+    
+    Timestamps (epoch seconds, NaN if missing), category codes and ratings
+    (NaN if unrated) are held as NumPy arrays when NumPy is installed, so
+    filters and per-category counts run as vectorized operations. Without
+    NumPy the same columns are plain lists and the methods loop in Python.
+    History is written in time order, so when the timestamps are sorted a
+    date filter is a binary search rather than a comparison per record.
+    
+    The view keeps a reference to the records it was built from; treat
+    both as read-only.
+    """
+    
+    def __init__(self, history: list):
+        self.records = history
+        self.category_names = []
+        codes = {}
+        timestamps, categories, ratings = [], [], []
+        
+        for pred in history:
+            ts = _record_ts(pred)
+            timestamps.append(float(ts) if ts is not None else float("nan"))
+            
+            category = pred.get("category", "unknown")
+            if category not in codes:
+                codes[category] = len(self.category_names)
+                self.category_names.append(category)
+            categories.append(codes[category])
+            
+            rating = pred.get("rating")
+            ratings.append(float(rating) if rating is not None else float("nan"))
+        
+        dated = all(ts == ts for ts in timestamps)  # NaN != NaN
+        self.time_sorted = dated and all(a <= b for a, b in zip(timestamps, timestamps[1:]))
+        
+        if np is not None:
+            self.timestamps = np.array(timestamps, dtype=np.float64)
+            self.categories = np.array(categories, dtype=np.int32)
+            self.ratings = np.array(ratings, dtype=np.float64)
+        else:
+            self.timestamps, self.categories, self.ratings = timestamps, categories, ratings
+    
+    def since_index(self, since: datetime) -> int | None:
+        """
+        Find the first record generated at or after a time by binary search.
+        
+        Returns:
+            The index, or None if the timestamps are not sorted (some records
+            are undated or out of order) and a full comparison is needed.
+        """
+        if not self.time_sorted:
+            return None
+        if np is not None:
+            return int(np.searchsorted(self.timestamps, since.timestamp(), side="left"))
+        return bisect.bisect_left(self.timestamps, since.timestamp())
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def mask(self, category: str = None, since: datetime = None, rated_only: bool = False):
+        """
+        Select records by category, date and rating.
+        
+        Args:
+            category: Optional category (case-insensitive).
+            since: Optional datetime; keep records generated at or after it.
+            rated_only: If True, only keep rated records.
+        
+        Returns:
+            Boolean mask (NumPy array or list) aligned with the records.
+        """
+        wanted = None
+        if category:
+            wanted = {code for code, name in enumerate(self.category_names)
+                      if str(name).lower() == category.lower()}
+        cutoff = since.timestamp() if since is not None else None
+        start = self.since_index(since) if since is not None else 0
+        if start is not None:
+            cutoff = None  # records before start are excluded below
+        else:
+            start = 0
+        
+        if np is not None:
+            keep = np.ones(len(self.records), dtype=bool)
+            keep[:start] = False
+            if wanted is not None:
+                keep &= np.isin(self.categories, list(wanted))
+            if cutoff is not None:
+                keep &= self.timestamps >= cutoff  # NaN compares False
+            if rated_only:
+                keep &= ~np.isnan(self.ratings)
+            return keep
+        
+        keep = [False] * start + [True] * (len(self.records) - start)
+        for i in range(start, len(self.records)):
+            if wanted is not None and self.categories[i] not in wanted:
+                keep[i] = False
+            elif cutoff is not None and not self.timestamps[i] >= cutoff:
+                keep[i] = False
+            elif rated_only and self.ratings[i] != self.ratings[i]:
+                keep[i] = False
+        return keep
+    
+    def select(self, mask) -> list:
+        """Return the records selected by a mask, in history order."""
+        if np is not None:
+            return [self.records[i] for i in np.flatnonzero(mask)]
+        return [pred for pred, keep in zip(self.records, mask) if keep]
+    
+    def summarize(self, mask=None) -> dict:
+        """
+        Group the selected records by category and rating.
+        
+        Args:
+            mask: Optional mask from mask(); default is every record.
+        
+        Returns:
+            Dictionary with the same fields as load_history_stats(),
+            apart from the cube.
+        """
+        if mask is None:
+            mask = self.mask()
+        stats = _empty_history_stats()
+        del stats["cube"]
+        names = self.category_names
+        
+        if np is not None:
+            codes = self.categories[mask]
+            ratings = self.ratings[mask]
+            timestamps = self.timestamps[mask]
+            rated = ~np.isnan(ratings)
+            
+            counts = np.bincount(codes, minlength=len(names))
+            rated_counts = np.bincount(codes[rated], minlength=len(names))
+            rated_sums = np.bincount(codes[rated], weights=ratings[rated], minlength=len(names))
+            histogram = np.bincount(ratings[rated].astype(np.int64), minlength=6)
+            
+            stats["total"] = int(mask.sum())
+            stats["categories"] = {names[c]: int(n) for c, n in enumerate(counts) if n}
+            stats["category_ratings"] = {
+                names[c]: [int(n), int(rated_sums[c])] for c, n in enumerate(rated_counts) if n
+            }
+            stats["ratings"] = {str(r): int(n) for r, n in enumerate(histogram) if n}
+            stats["rating_count"] = int(rated.sum())
+            stats["rating_sum"] = int(ratings[rated].sum())
+            
+            dated = np.flatnonzero(mask)[~np.isnan(timestamps)]
+            if len(dated):
+                first = dated[np.argmin(self.timestamps[dated])]
+                last = dated[np.argmax(self.timestamps[dated])]
+                stats["first_generated_at"] = self.records[first]["generated_at"]
+                stats["last_generated_at"] = self.records[last]["generated_at"]
+            return stats
+        
+        first = last = None
+        for i, keep in enumerate(mask):
+            if not keep:
+                continue
+            stats["total"] += 1
+            category = names[self.categories[i]]
+            _bump(stats["categories"], category, 1)
+            rating = self.ratings[i]
+            if rating == rating:
+                _apply_rating_stats(stats, category, int(rating), 1)
+            ts = self.timestamps[i]
+            if ts == ts:
+                if first is None or ts < self.timestamps[first]:
+                    first = i
+                if last is None or ts > self.timestamps[last]:
+                    last = i
+        if first is not None:
+            stats["first_generated_at"] = self.records[first]["generated_at"]
+            stats["last_generated_at"] = self.records[last]["generated_at"]
+        return stats
+
+
+def history_columns(history: list = None) -> HistoryColumns:
+    """
+    Return the columnar view of history, building it only when needed.
+    
+    The view of the history file is cached and keyed by the file's
+    signature, so it is rebuilt once after each write.
+    
+    Args:
+        history: Optional already-loaded history. If it is the list the
+            cached view was built from, the cached view is reused;
+            otherwise a view is built for it.
     
     Returns:
-        Dictionary mapping categories to preference scores (0-1).
-        Higher scores indicate more preferred categories.
+        A HistoryColumns instance.
     """
-    history = load_history()
+    with _HISTORY_COLUMNS_LOCK:
+        cached = _HISTORY_COLUMNS["columns"]
+        if history is not None:
+            hit = cached is not None and cached.records is history
+        else:
+            signature = _file_signature(HISTORY_FILE)
+            hit = cached is not None and signature is not None and _HISTORY_COLUMNS["signature"] == signature
+        METRICS.record_cache("history_columns", hit)
+        if hit:
+            return cached
+        
+        if history is not None:
+            return HistoryColumns(history)
+        
+        columns = HistoryColumns(load_history())
+        _HISTORY_COLUMNS["signature"] = signature
+        _HISTORY_COLUMNS["columns"] = columns
+        return columns
+
+
+def _parse_since(since: str) -> datetime | None:
+    """
+    Parse a --since style date.
     
-    if not history:
-        return {}
+    Raises:
+        ValueError: If the value is not an ISO date.
+    """
+    if not since:
+        return None
+    try:
+        return datetime.fromisoformat(since)
+    except ValueError:
+        raise ValueError(f"Invalid date format '{since}'. Use ISO format (YYYY-MM-DD).")
+
+
+def _history_predicate(category: str = None, since: str = None):
+    """
+    Build a predicate that selects history records by category and date.
     
-    # Collect ratings by category
-    category_ratings = {}
-    for pred in history:
-        if pred.get("rating") is not None:
-            cat = pred.get("category", "unknown")
-            if cat not in category_ratings:
-                category_ratings[cat] = []
-            category_ratings[cat].append(pred["rating"])
+    Args:
+        category: Optional category to filter by.
+        since: Optional ISO date string to filter predictions after.
     
-    if not category_ratings:
-        return {}
+    Returns:
+        A function taking a prediction dict and returning True to keep it.
     
-    # Calculate average rating per category
-    category_scores = {}
-    for cat, ratings in category_ratings.items():
-        avg = sum(ratings) / len(ratings)
-        # Normalize to 0-1 range (1-5 rating -> 0-1 score)
-        category_scores[cat] = (avg - 1) / 4
+    Raises:
+        ValueError: If since is not an ISO date.
+    """
+    category = category.lower() if category else None
+    since_dt = _parse_since(since)
+    cutoff = since_dt.timestamp() if since_dt is not None else None
+    
+    def keep(pred: dict) -> bool:
+        if category and pred.get("category", "").lower() != category:
+            return False
+        if cutoff is not None:
+            ts = _record_ts(pred)
+            return ts is not None and ts >= cutoff
+        return True
     
-    return category_scores
+    return keep
 
 
-def get_preferred_prediction(category: str = None) -> tuple[str, str]:
+def filter_history(history: list = None, category: str = None, since: str = None) -> list:
     """
-    Generate a prediction weighted by user preferences.
+    Filter history by category and/or date.
     
-    Higher-rated categories are more likely to be selected.
+    The filter runs over the columnar history view, so timestamps are
+    parsed once per load rather than once per record per call.
     
     Args:
-        category: Optional category. If specified, preference weighting is skipped.
+        history: The prediction history to filter (default: the history file).
+        category: Optional category to filter by.
+        since: Optional ISO date string to filter predictions after.
     
     Returns:
-        A tuple of (prediction string, category used).
+        Filtered list of predictions.
+    
+    Raises:
+        ValueError: If since is not an ISO date.
     """
-    if category is not None:
-        return get_prediction(category)
+    if not category and not since:
+        return load_history() if history is None else history
+    columns = history_columns(history)
+    return columns.select(columns.mask(category=category, since=_parse_since(since)))
+
+
+def filtered_history_stats(category: str = None, since: str = None) -> dict:
+    """
+    Compute statistics over a filtered slice of history.
     
-    preferences = get_preferred_categories()
+    Unfiltered statistics come from the materialized aggregates; filtered
+    ones are computed from the columnar view.
     
-    if not preferences:
-        # No rated predictions, use regular random selection
-        return get_prediction(None)
+    Args:
+        category: Optional category to filter by.
+        since: Optional ISO date string to filter predictions after.
     
-    # Build weighted list of categories
-    weighted_categories = []
-    for cat in PREDICTIONS.keys():
-        # Default weight of 1, increased by preference score
-        weight = 1.0 + preferences.get(cat, 0) * 4  # Boost up to 5x for highly rated
-        weighted_categories.append((cat, weight))
+    Returns:
+        Dictionary with the same fields as load_history_stats().
     
-    # Weighted random selection
-    total_weight = sum(w for _, w in weighted_categories)
-    rand = random.uniform(0, total_weight)
-    cumulative = 0
-    selected_category = list(PREDICTIONS.keys())[0]
+    Raises:
+        ValueError: If since is not an ISO date.
+    """
+    if not category and not since:
+        return load_history_stats()
+    columns = history_columns()
+    return columns.summarize(columns.mask(category=category, since=_parse_since(since)))
+
+
+class _JSONReader:
+    """
+    Pull parser over a JSON document in a binary file.
     
-    for cat, weight in weighted_categories:
-        cumulative += weight
-        if rand <= cumulative:
-            selected_category = cat
+    Structural characters are consumed one at a time with peek()/take()
+    and values are decoded with value(), so only the current value and
+    one read chunk are held in memory.
+    
+    Args:
+        f: File object opened in binary mode, positioned at the document.
+        chunk_size: Number of bytes read at a time.
+    """
+    
+    def __init__(self, f, chunk_size: int = 65536):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.base = f.tell()  # byte offset of buf[0]
+        self.pos = 0
+        self.eof = False
+    
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buf += self.utf8.decode(b"", final=True)
+            return False
+        self.buf += self.utf8.decode(chunk)
+        return True
+    
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+    
+    def take(self) -> str:
+        """Consume and return the next non-whitespace character."""
+        char = self.peek()
+        self.pos += 1
+        return char
+    
+    def at_end(self) -> bool:
+        """Return True if only whitespace remains."""
+        try:
+            self.peek()
+        except ValueError:
+            return True
+        return False
+    
+    def offset(self) -> int:
+        """Byte offset of the next value; drops the consumed prefix so the buffer stays bounded."""
+        self.peek()
+        self.base += len(self.buf[:self.pos].encode("utf-8"))
+        self.buf, self.pos = self.buf[self.pos:], 0
+        return self.base
+    
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self.offset()
+        while True:
+            try:
+                element, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+            # A scalar at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
             break
+        self.pos = end
+        return element
+
+
+def _iter_json_array(f, chunk_size: int = 65536):
+    """
+    Incrementally parse a top-level JSON array from a binary file.
     
-    return get_prediction(selected_category)
+    Only the current element and one read chunk are held in memory.
+    
+    Args:
+        f: File object opened in binary mode, positioned at the array.
+        chunk_size: Number of bytes read at a time.
+    
+    Yields:
+        Tuples of (byte offset of the element, decoded element).
+    
+    Raises:
+        ValueError: If the file is not a well-formed JSON array.
+    """
+    reader = _JSONReader(f, chunk_size)
+    if reader.take() != "[":
+        raise ValueError("Expected a JSON array")
+    if reader.peek() == "]":
+        return
+    
+    while True:
+        offset = reader.offset()
+        yield offset, reader.value()
+        separator = reader.take()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}")
 
 
-def get_smart_prediction(category: str = None) -> tuple[str, str]:
+def _read_json_at(f, offset: int, chunk_size: int = 4096):
+    """Decode the single JSON value starting at a byte offset."""
+    decoder = json.JSONDecoder()
+    f.seek(offset)
+    data = b""
+    while True:
+        chunk = f.read(chunk_size)
+        data += chunk
+        try:
+            value, _ = decoder.raw_decode(data.decode("utf-8", errors="ignore"))
+            return value
+        except ValueError:
+            if not chunk:
+                raise
+            chunk_size *= 2
+
+
+def iter_history(path: Path = None, with_offsets: bool = False):
     """
-    Generate a prediction combining time-awareness with preference learning.
+    Stream prediction history records from disk one at a time.
     
-    This function combines the best of both modes:
-    - Time-aware predictions based on time of day and day of week
-    - Preference weighting from user ratings
+    Args:
+        path: History file (default: HISTORY_FILE).
+        with_offsets: If True, yield (byte offset, record) tuples.
+    
+    Yields:
+        Prediction dicts in stored (oldest first) order. A missing file
+        yields nothing; a malformed one stops at the first bad element.
+    """
+    path = HISTORY_FILE if path is None else path
+    if not path.exists():
+        return
+    try:
+        with open(path, "rb") as f:
+            for offset, record in _iter_json_array(f):
+                yield (offset, record) if with_offsets else record
+    except (ValueError, IOError):
+        return
+
+
+EXPORT_COLUMNS = ["id", "category", "prediction", "applies_to", "confidence", "generated_at", "rating"]
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "markdown": "text/markdown",
+}
+
+
+def _iter_export_csv(records):
+    buf = StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    for pred in records:
+        writer.writerow([pred.get(column, "") for column in EXPORT_COLUMNS])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    # Header-only exports still produce the header row
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def _iter_export_json(records):
+    # Matches json.dumps(history, indent=2), one element at a time
+    first = True
+    for pred in records:
+        element = json.dumps(pred, indent=2).replace("\n", "\n  ")
+        yield ("[\n  " if first else ",\n  ") + element
+        first = False
+    yield "[]\n" if first else "\n]\n"
+
+
+def _format_markdown_entry(pred: dict) -> str:
+    rating_str = f" (⭐{pred['rating']}/5)" if pred.get("rating") else ""
+    lines = [
+        f"## {pred.get('category', 'unknown').title()}{rating_str}\n",
+        f"> {pred['prediction']}\n",
+        f"- **ID**: {pred.get('id', 'N/A')}",
+        f"- **Applies to**: {pred.get('applies_to', 'N/A')}",
+        f"- **Confidence**: {pred.get('confidence', 'N/A')}",
+    ]
+    if "generated_at" in pred:
+        try:
+            dt = datetime.fromisoformat(pred["generated_at"])
+            lines.append(f"- **Generated**: {dt.strftime('%Y-%m-%d %H:%M')}")
+        except (ValueError, TypeError):
+            pass
+    return "\n".join(lines) + "\n\n"
+
+
+def _iter_export_markdown(path: Path, keep, category: str = None, since: str = None):
+    # Markdown lists newest first with a total up front. A first streaming
+    # pass records only the byte offsets of matching records; the second
+    # pass seeks back to each one in reverse order.
+    offsets = [offset for offset, pred in iter_history(path, with_offsets=True) if keep(pred)]
+    
+    header = ["# Prediction History\n", f"*Exported: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n"]
+    if category:
+        header.append(f"*Filtered by category: {category}*\n")
+    if since:
+        header.append(f"*Filtered since: {since}*\n")
+    header.append(f"Total predictions: {len(offsets)}\n")
+    header.append("---\n")
+    yield "\n".join(header) + "\n"
+    
+    if not offsets:
+        return
+    with open(path, "rb") as f:
+        for offset in reversed(offsets):
+            yield _format_markdown_entry(_read_json_at(f, offset))
+
+
+def iter_export(format_type: str, category: str = None, since: str = None, path: Path = None):
+    """
+    Stream an export of prediction history as text chunks.
+    
+    Records are read from disk incrementally, so memory use does not grow
+    with the size of the history.
     
     Args:
-        category: Optional category. If specified, uses that category with time context.
+        format_type: The export format ('csv', 'markdown', or 'json').
+        category: Optional category to filter by.
+        since: Optional ISO date string to filter predictions after.
+        path: History file (default: HISTORY_FILE).
+    
+    Yields:
+        Chunks of the exported document.
+    
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if format_type not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unknown export format: {format_type}. Use 'csv', 'json', or 'markdown'.")
+    path = HISTORY_FILE if path is None else path
+    yield from _iter_export(format_type, _history_predicate(category, since), category, since, path)
+
+
+def _iter_export(format_type: str, keep, category: str, since: str, path: Path):
+    if format_type == "markdown":
+        yield from _iter_export_markdown(path, keep, category, since)
+        return
+    
+    records = (pred for pred in iter_history(path) if keep(pred))
+    if format_type == "csv":
+        yield from _iter_export_csv(records)
+    else:
+        yield from _iter_export_json(records)
+
+
+def export_history(format_type: str, category: str = None, since: str = None, output: str = None) -> None:
+    """
+    Export prediction history to stdout or a file.
+    
+    The export is streamed, so large histories are never held in memory.
+    
+    Args:
+        format_type: The export format ('csv', 'markdown', or 'json').
+        category: Optional category to filter by.
+        since: Optional ISO date string to filter predictions after.
+        output: Optional file path to write to instead of stdout.
+    """
+    if format_type not in EXPORT_MEDIA_TYPES:
+        print(f"Unknown export format: {format_type}. Use 'csv', 'json', or 'markdown'.")
+        return
+    
+    if not HISTORY_FILE.exists() or next(iter_history(), None) is None:
+        print("No prediction history to export.")
+        return
+    
+    keep = _history_predicate(category, since)
+    if not any(keep(pred) for pred in iter_history()):
+        print("No predictions match the specified filters.")
+        return
+    
+    chunks = _iter_export(format_type, keep, category, since, HISTORY_FILE)
+    if output:
+        with open(output, "w", newline="") as f:
+            f.writelines(chunks)
+        print(f"✅ Exported history to {output}")
+    else:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+
+
+def clear_history() -> bool:
+    """
+    Clear prediction history after confirmation.
     
     Returns:
-        A tuple of (prediction string, category used).
+        True if history was cleared, False otherwise.
     """
-    now = datetime.now()
-    time_of_day = get_time_of_day(now)
-    day_type = get_day_type(now)
+    history = load_history()
     
-    # If a specific category is requested, use it
-    if category is not None:
-        if category not in PREDICTIONS:
-            available = ", ".join(PREDICTIONS.keys())
-            return f"Unknown category '{category}'. Available: {available}", category
-        return random.choice(PREDICTIONS[category]), category
+    if not history:
+        print("No prediction history to clear.")
+        return False
+    
+    print(f"⚠️  This will delete {len(history)} prediction(s) from history.")
+    print("This action cannot be undone.")
+    
+    try:
+        response = input("Are you sure? (yes/no): ").strip().lower()
+    except EOFError:
+        print("\nOperation cancelled.")
+        return False
+    
+    if response == "yes":
+        HISTORY_FILE.unlink(missing_ok=True)
+        _history_sidecar_file().unlink(missing_ok=True)
+        for name in _LEGACY_SIDECAR_FILES.values():
+            HISTORY_FILE.with_name(name).unlink(missing_ok=True)
+        print("✅ History cleared successfully.")
+        return True
+    else:
+        print("Operation cancelled.")
+        return False
+
+
+# Full-text search (Iteration 11)
+
+SEARCH_RESULT_LIMIT = 10
+
+# BM25 ranking parameters
+SEARCH_K1 = 1.2
+SEARCH_B = 0.75
+
+_TOKEN_RE = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to will with you your".split()
+)
+
+
+def _normalize_term(word: str) -> str:
+    """Fold a lowercase word to its index term (drops a possessive or plural "s")."""
+    if word.endswith(("'s", "’s")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into index terms.
     
-    preferences = get_preferred_categories()
+    Words are lowercased, common stopwords dropped and a plural "s"
+    removed, so "Oceans" and "ocean" match.
     
-    # Build weighted list for efficient selection (without duplicating entries)
-    weighted_items = []
+    Returns:
+        List of terms, in order (with repeats).
+    """
+    return [_normalize_term(word) for word in _TOKEN_RE.findall(text.lower()) if word not in _STOPWORDS]
+
+
+class InvertedIndex:
+    """
+    Term index over short documents with BM25 ranking.
     
-    # Add regular category predictions with preference weighting
-    for cat, preds in PREDICTIONS.items():
-        # Apply preference weight (1.0 to 5.0 based on rating), capped at 5.0
-        pref_weight = min(1.0 + preferences.get(cat, 0) * 4, 5.0)
-        for pred in preds:
-            weighted_items.append((pred, cat, pref_weight))
+    Postings map each term to {doc_id: term frequency}, so a query only
+    visits the documents containing its terms. Documents can be added and
+    removed one at a time.
+    """
     
-    # Add time-of-day predictions with moderate weight (2.0 for relevance)
-    for pred in TIME_PREDICTIONS.get(time_of_day, []):
-        weighted_items.append((pred, f"time:{time_of_day}", 2.0))
+    def __init__(self):
+        self.postings = {}
+        self.lengths = {}
+        self._total_length = 0
     
-    # Add day-type predictions with moderate weight (2.0 for relevance)
-    for pred in DAY_PREDICTIONS.get(day_type, []):
-        weighted_items.append((pred, f"day:{day_type}", 2.0))
+    def __len__(self) -> int:
+        return len(self.lengths)
     
-    # Weighted random selection using cumulative weights
-    total_weight = sum(w for _, _, w in weighted_items)
-    rand = random.uniform(0, total_weight)
-    cumulative = 0
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self.lengths
     
-    for pred, cat, weight in weighted_items:
-        cumulative += weight
-        if rand <= cumulative:
-            return pred, cat
+    def to_dict(self) -> dict:
+        # Pairs rather than objects, so non-string doc IDs survive JSON
+        return {
+            "postings": {term: list(docs.items()) for term, docs in self.postings.items()},
+            "lengths": list(self.lengths.items()),
+        }
     
-    # Fallback (should not reach here)
-    return weighted_items[-1][0], weighted_items[-1][1]
+    @classmethod
+    def from_dict(cls, data: dict) -> "InvertedIndex":
+        index = cls()
+        index.postings = {term: dict(map(tuple, docs)) for term, docs in data["postings"].items()}
+        index.lengths = dict(map(tuple, data["lengths"]))
+        index._total_length = sum(index.lengths.values())
+        return index
+    
+    def add(self, doc_id, text: str) -> None:
+        """Index a document (which must not already be indexed)."""
+        terms = tokenize(text)
+        for term in terms:
+            docs = self.postings.setdefault(term, {})
+            docs[doc_id] = docs.get(doc_id, 0) + 1
+        self.lengths[doc_id] = len(terms)
+        self._total_length += len(terms)
+    
+    def remove(self, doc_id, text: str) -> None:
+        """Remove a document, given the text it was indexed with."""
+        if doc_id not in self.lengths:
+            return
+        for term in set(tokenize(text)):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+        self._total_length -= self.lengths.pop(doc_id)
+    
+    def search(self, query: str, limit: int = SEARCH_RESULT_LIMIT, keep=None) -> list:
+        """
+        Rank documents against a query.
+        
+        Documents matching any query term are scored with BM25, so those
+        matching more (and rarer) terms rank first.
+        
+        Args:
+            query: Free-text query.
+            limit: Maximum number of results.
+            keep: Optional predicate on doc_id to filter candidates.
+        
+        Returns:
+            List of (doc_id, score), best first.
+        """
+        count = len(self.lengths)
+        if not count:
+            return []
+        average = self._total_length / count or 1
+        scores = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                if keep is not None and not keep(doc_id):
+                    continue
+                norm = SEARCH_K1 * (1 - SEARCH_B + SEARCH_B * self.lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (SEARCH_K1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
 
 
-def predict_the_future(category: str = None, time_aware: bool = False, use_preferences: bool = False, smart: bool = False, theme: str = None) -> dict:
+class CorpusIndex:
     """
-    Generate a complete future prediction.
-    
-    Args:
-        category: Optional prediction category.
-        time_aware: If True, include time-of-day and day-of-week context.
-        use_preferences: If True, weight categories by user ratings.
-        smart: If True, combine time-aware and preference modes.
-        theme: Optional theme for predictions (motivational, holiday, spooky, adventure).
+    Search index over every prediction the app can produce.
     
-    Returns:
-        Dictionary with prediction details.
+    Documents are grouped in segments (the category, time-of-day and
+    day-type corpora, and one per theme), each with a version. Replacing a
+    segment only re-indexes that segment, so a changed custom theme costs
+    one theme's worth of work.
     """
-    # Select prediction based on mode
-    # Mode precedence: theme > smart > time_aware > use_preferences > default
-    # Theme mode uses its own prediction sets and doesn't combine with other modes
-    if theme:
-        prediction, used_category = get_themed_prediction(theme, category)
-    elif smart:
-        prediction, used_category = get_smart_prediction(category)
-    elif time_aware:
-        prediction, used_category = get_time_aware_prediction(category)
-    elif use_preferences:
-        prediction, used_category = get_preferred_prediction(category)
-    else:
-        prediction, used_category = get_prediction(category)
-    
-    future_date = get_future_date(random.randint(1, 7))
     
-    result = {
-        "prediction": prediction,
-        "applies_to": future_date,
-        "category": used_category,
-        "confidence": f"{random.randint(70, 99)}%",
-        "generated_at": datetime.now().isoformat(),
-    }
+    def __init__(self):
+        self.index = InvertedIndex()
+        self.documents = {}
+        self.segments = {}
+        self._next_id = 0
     
-    # Add theme info if using a theme
-    if theme:
-        result["theme"] = theme
+    def set_segment(self, key: str, version: str, load) -> bool:
+        """
+        Make a segment current.
+        
+        Args:
+            key: Segment name.
+            version: Segment version (e.g. a content hash).
+            load: Callable returning (source, theme, category, text) tuples;
+                  only called if the version changed.
+        
+        Returns:
+            True if the segment was (re)indexed.
+        """
+        if self.segments.get(key, (None,))[0] == version:
+            return False
+        self.drop_segment(key)
+        doc_ids = []
+        for document in load():
+            doc_id = self._next_id
+            self._next_id += 1
+            self.documents[doc_id] = document
+            self.index.add(doc_id, document[3])
+            doc_ids.append(doc_id)
+        self.segments[key] = (version, doc_ids)
+        return True
     
-    # Add time context if time-aware or smart mode
-    if time_aware or smart:
-        now = datetime.now()
-        result["time_of_day"] = get_time_of_day(now)
-        result["day_type"] = get_day_type(now)
+    def drop_segment(self, key: str) -> None:
+        """Remove a segment and its documents."""
+        _, doc_ids = self.segments.pop(key, (None, []))
+        for doc_id in doc_ids:
+            self.index.remove(doc_id, self.documents.pop(doc_id)[3])
     
-    return result
+    def search(self, query: str, limit: int = SEARCH_RESULT_LIMIT, theme: str = None) -> list:
+        """
+        Search predictions.
+        
+        Args:
+            query: Free-text query.
+            limit: Maximum number of results.
+            theme: Optional theme name to search within.
+        
+        Returns:
+            List of dictionaries with "text", "source" ("category", "time",
+            "day" or "theme"), "theme", "category" and "score", best first.
+        """
+        keep = (lambda doc_id: self.documents[doc_id][1] == theme) if theme else None
+        results = []
+        for doc_id, score in self.index.search(query, limit, keep):
+            source, theme_name, category, text = self.documents[doc_id]
+            results.append({
+                "text": text,
+                "source": source,
+                "theme": theme_name,
+                "category": category,
+                "score": round(score, 3),
+            })
+        return results
 
 
-def load_history() -> list:
+_CORPUS_INDEX = {"manifest": None, "index": None}
+_CORPUS_INDEX_LOCK = threading.Lock()
+
+
+def _corpus_documents(source: str, groups: dict, theme: str = None):
+    """Documents for a {group: [predictions]} corpus."""
+    return [(source, theme, group, text) for group, texts in groups.items() for text in texts]
+
+
+def get_corpus_index() -> CorpusIndex:
     """
-    Load prediction history from file.
+    Return the corpus search index, updated for any custom theme changes.
+    
+    Built-in corpora are indexed once per process. Custom themes are
+    compared with the theme manifest by content hash, so only added or
+    changed themes are read and indexed and deleted ones are dropped.
     
     Returns:
-        List of past predictions.
+        The CorpusIndex.
     """
-    if not HISTORY_FILE.exists():
-        return []
-    
-    try:
-        with open(HISTORY_FILE, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
+    manifest = load_theme_manifest()
+    with _CORPUS_INDEX_LOCK:
+        index = _CORPUS_INDEX["index"]
+        previous = _CORPUS_INDEX["manifest"]
+        hit = index is not None and (previous is manifest or not (previous or manifest))
+        METRICS.record_cache("corpus_index", hit)
+        if hit:
+            return index
+        
+        if index is None:
+            index = CorpusIndex()
+            index.set_segment("category", "builtin", lambda: _corpus_documents("category", PREDICTIONS))
+            index.set_segment("time", "builtin", lambda: _corpus_documents("time", TIME_PREDICTIONS))
+            index.set_segment("day", "builtin", lambda: _corpus_documents("day", DAY_PREDICTIONS))
+            for name, categories in THEMES.items():
+                index.set_segment(f"builtin:{name}", "builtin",
+                                  lambda name=name, categories=categories: _corpus_documents("theme", categories, name))
+        
+        store = _theme_store_dir()
+        for name, entry in manifest.items():
+            if name in THEMES:
+                continue
+            index.set_segment(f"theme:{name}", entry["hash"],
+                              lambda name=name, entry=entry: _corpus_documents(
+                                  "theme", _read_theme_file(store / entry["file"]), name))
+        for key in [key for key in index.segments if key.startswith("theme:")]:
+            if key[len("theme:"):] not in manifest:
+                index.drop_segment(key)
+        
+        _CORPUS_INDEX["index"] = index
+        _CORPUS_INDEX["manifest"] = manifest
+        return index
 
 
-def save_to_history(prediction: dict) -> None:
+def search_corpus(query: str, limit: int = SEARCH_RESULT_LIMIT, theme: str = None) -> list:
     """
-    Save a prediction to history file.
+    Search every built-in and custom prediction by wording.
     
     Args:
-        prediction: The prediction dictionary to save.
-    """
-    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
-    
-    history = load_history()
-    
-    # Assign an ID if not present
-    if "id" not in prediction:
-        # Find the next available ID
-        max_id = 0
-        for p in history:
-            if "id" in p and isinstance(p["id"], int):
-                max_id = max(max_id, p["id"])
-        prediction["id"] = max_id + 1
-    
-    history.append(prediction)
+        query: Free-text query.
+        limit: Maximum number of results.
+        theme: Optional theme name to search within.
     
-    # Keep only the last 100 predictions
-    history = history[-100:]
-    
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(history, f, indent=2)
+    Returns:
+        Ranked results (see CorpusIndex.search).
+    """
+    return get_corpus_index().search(query, limit, theme)
+
 
+def _describe_search_source(result: dict) -> str:
+    """Label a corpus search result's origin, e.g. "theme summer / fortune"."""
+    if result["source"] == "theme":
+        return f"theme {result['theme']} / {result['category']}"
+    if result["source"] == "category":
+        return result["category"]
+    return f"{result['source']}: {result['category']}"
 
-def display_history(count: int = 10, show_rated_only: bool = False) -> None:
+
+def show_corpus_search(query: str, limit: int = SEARCH_RESULT_LIMIT, theme: str = None) -> bool:
     """
-    Display recent prediction history.
+    Display ranked corpus search results.
     
     Args:
-        count: Number of recent predictions to display.
-        show_rated_only: If True, only show predictions that have been rated.
-    """
-    history = load_history()
+        query: Free-text query.
+        limit: Maximum number of results.
+        theme: Optional theme name to search within.
     
-    if not history:
-        print("No prediction history found.")
-        return
+    Returns:
+        True if anything matched, False otherwise.
+    """
+    if not tokenize(query):
+        print("Error: Search terms are too common or empty. Try more specific words.")
+        return False
     
-    if show_rated_only:
-        history = [p for p in history if p.get("rating") is not None]
-        if not history:
-            print("No rated predictions found. Use --feedback to rate predictions.")
-            return
+    started = time.perf_counter()
+    results = search_corpus(query, limit, theme)
+    elapsed = (time.perf_counter() - started) * 1000
     
-    recent = history[-count:]
-    title = "rated prediction(s)" if show_rated_only else "prediction(s)"
-    print(f"\n📜 Last {len(recent)} {title}:\n")
+    if not results:
+        print(f"No predictions match '{query}'.")
+        return False
     
-    for i, pred in enumerate(reversed(recent), 1):
-        rating_str = ""
-        if pred.get("rating") is not None:
-            rating_str = f" ⭐{pred['rating']}/5"
-        print(f"{i}. [ID:{pred.get('id', 'N/A')}] [{pred.get('category', 'unknown').title()}]{rating_str} {pred['prediction']}")
-        if "generated_at" in pred:
-            # Parse and format the timestamp
-            try:
-                dt = datetime.fromisoformat(pred["generated_at"])
-                print(f"   Generated: {dt.strftime('%Y-%m-%d %H:%M')}")
-            except (ValueError, TypeError):
-                pass
-        print()
+    print(f"\n🔎 {len(results)} result(s) for '{query}' ({elapsed:.1f} ms)\n")
+    for rank, result in enumerate(results, 1):
+        print(f"  {rank:>2}. [{_describe_search_source(result)}] {result['text']}")
+    print()
+    return True
 
 
-def add_feedback(prediction_id: int, rating: int) -> bool:
+# History search (Iteration 11)
+
+HISTORY_SEARCH_VERSION = 1
+
+_HISTORY_SEARCH = {"key": None, "index": None}
+_HISTORY_SEARCH_LOCK = threading.Lock()
+
+
+def _build_history_search_index(history) -> InvertedIndex:
+    index = InvertedIndex()
+    for pred in history:
+        if pred.get("id") not in index:
+            index.add(pred.get("id"), pred.get("prediction", ""))
+    return index
+
+
+def load_history_search_index(history: list = None, cached: bool = True, sidecar: dict = None) -> InvertedIndex:
     """
-    Add a rating to a prediction in history.
+    Load the term index over history prediction texts.
+    
+    Like the stats aggregates, the index is kept in the history sidecar,
+    updated incrementally on every write and stamped with the history
+    file's signature; if history was changed by anything else it is
+    rebuilt once with a full scan. The loaded index is cached in memory
+    until the next write.
     
     Args:
-        prediction_id: The ID of the prediction to rate.
-        rating: The rating (1-5).
+        history: Optional already-loaded history, used if a rebuild is needed.
+        cached: If False, load a private copy that the caller may modify
+            (writers use this so concurrent searches never see a
+            half-updated index).
+        sidecar: Optional already-read sidecar sections.
     
     Returns:
-        True if successful, False otherwise.
+        An InvertedIndex keyed by prediction ID. Treat the cached one as
+        read-only.
     """
-    if rating < 1 or rating > 5:
-        print(f"Error: Rating must be between 1 and 5, got {rating}")
-        return False
-    
-    history = load_history()
+    signature = _file_signature(HISTORY_FILE)
+    if signature is None:
+        return InvertedIndex()
+    
+    if cached:
+        with _HISTORY_SEARCH_LOCK:
+            hit = _HISTORY_SEARCH["index"] is not None and _HISTORY_SEARCH["key"] == (HISTORY_FILE, signature)
+            METRICS.record_cache("history_search", hit)
+            if hit:
+                return _HISTORY_SEARCH["index"]
+    
+    index = None
+    try:
+        data = (_read_history_sidecar() if sidecar is None else sidecar).get("search") or {}
+        if data.get("source") == signature and data.get("version") == HISTORY_SEARCH_VERSION:
+            index = InvertedIndex.from_dict(data)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        pass
     
-    for pred in history:
-        if pred.get("id") == prediction_id:
-            pred["rating"] = rating
-            pred["rated_at"] = datetime.now().isoformat()
-            
-            # Save updated history
-            with open(HISTORY_FILE, "w") as f:
-                json.dump(history, f, indent=2)
-            
-            print(f"✅ Rated prediction {prediction_id} with {rating}/5 stars")
-            print(f"   \"{pred['prediction']}\"")
-            return True
+    if index is None:
+        index = _build_history_search_index(iter_history() if history is None else history)
+        try:
+            _write_history_sidecar({"search": {"version": HISTORY_SEARCH_VERSION, "source": signature,
+                                               **index.to_dict()}}, sidecar)
+        except IOError:
+            pass
     
-    print(f"Error: Prediction with ID {prediction_id} not found.")
-    print("Use --history to see available predictions and their IDs.")
-    return False
+    if cached:
+        with _HISTORY_SEARCH_LOCK:
+            _HISTORY_SEARCH["key"] = (HISTORY_FILE, signature)
+            _HISTORY_SEARCH["index"] = index
+    return index
 
 
-def show_stats() -> None:
-    """Display prediction statistics."""
-    history = load_history()
-    
-    if not history:
-        print("No prediction history found.")
-        return
+def _apply_search_prediction(index: InvertedIndex, prediction: dict, history: list,
+                             evicted: list) -> InvertedIndex:
+    """
+    Update the history index for one saved prediction.
     
-    print("\n📊 Prediction Statistics\n")
-    print(f"Total predictions: {len(history)}")
+    Args:
+        index: Index loaded before the write.
+        prediction: The new record.
+        history: History as written (including the new record).
+        evicted: Records dropped by MAX_HISTORY.
     
-    # Count by category
-    category_counts = {}
-    for pred in history:
-        cat = pred.get("category", "unknown")
-        category_counts[cat] = category_counts.get(cat, 0) + 1
+    Returns:
+        The updated index (rebuilt if the caller reused an existing ID).
+    """
+    if prediction.get("id") in index:
+        return _build_history_search_index(history)
+    for pred in evicted:
+        index.remove(pred.get("id"), pred.get("prediction", ""))
+    index.add(prediction.get("id"), prediction.get("prediction", ""))
+    return index
+
+
+def search_history(query: str, limit: int = SEARCH_RESULT_LIMIT, category: str = None,
+                   since: str = None, rated_only: bool = False) -> list:
+    """
+    Search prediction history by wording.
     
-    print("\n📂 Predictions by category:")
-    for cat, count in sorted(category_counts.items(), key=lambda x: -x[1]):
-        pct = (count / len(history)) * 100
-        print(f"   {cat.title()}: {count} ({pct:.1f}%)")
+    Queries go through the term index, so only records containing a query
+    term are visited; each match is looked up by ID with a binary search.
     
-    # Rated predictions
-    rated = [p for p in history if p.get("rating") is not None]
-    if rated:
-        avg_rating = sum(p["rating"] for p in rated) / len(rated)
-        print(f"\n⭐ Rated predictions: {len(rated)}")
-        print(f"   Average rating: {avg_rating:.1f}/5")
-        
-        # Rating distribution
-        rating_counts = {}
-        for p in rated:
-            r = p["rating"]
-            rating_counts[r] = rating_counts.get(r, 0) + 1
-        print("   Rating distribution:")
-        for r in range(5, 0, -1):
-            count = rating_counts.get(r, 0)
-            bar = "★" * count
-            print(f"      {r}: {bar} ({count})")
-        
-        # Preference stats (Iteration 4)
-        preferences = get_preferred_categories()
-        if preferences:
-            print("\n🎯 Category Preferences (based on ratings):")
-            sorted_prefs = sorted(preferences.items(), key=lambda x: -x[1])
-            for cat, score in sorted_prefs:
-                bar_length = int(score * 10)
-                bar = "▓" * bar_length + "░" * (10 - bar_length)
-                print(f"   {cat.title()}: [{bar}] {score:.0%}")
-            print("   (Use --preferred to weight predictions by your preferences)")
-    else:
-        print("\n⭐ No rated predictions yet. Use --feedback to rate predictions.")
+    Args:
+        query: Free-text query.
+        limit: Maximum number of results.
+        category: Optional category filter.
+        since: Optional ISO date; only predictions generated since then.
+        rated_only: If True, only include rated predictions.
     
-    # Time stats
-    dates = []
-    for pred in history:
-        try:
-            dt = datetime.fromisoformat(pred.get("generated_at", ""))
-            dates.append(dt)
-        except (ValueError, TypeError):
-            pass
+    Returns:
+        Matching history records, best match first, each with a "score".
+    """
+    columns = history_columns()
+    records = columns.records
+    index = load_history_search_index(records)
+    keep = _history_predicate(category, since)
+    
+    def record(doc_id):
+        i = bisect.bisect_left(records, doc_id, key=lambda pred: pred.get("id", 0))
+        return records[i] if i < len(records) and records[i].get("id") == doc_id else None
+    
+    def matches(doc_id):
+        pred = record(doc_id)
+        if pred is None or not keep(pred):
+            return False
+        return not rated_only or pred.get("rating") is not None
     
-    if dates:
-        oldest = min(dates)
-        newest = max(dates)
-        print(f"\n📅 Date range:")
-        print(f"   First: {oldest.strftime('%Y-%m-%d %H:%M')}")
-        print(f"   Last:  {newest.strftime('%Y-%m-%d %H:%M')}")
+    return [
+        {**record(doc_id), "score": round(score, 3)}
+        for doc_id, score in index.search(query, limit, keep=matches)
+    ]
+
+
+# Reminder functions (Iteration 8)
+
+@timed_storage("load_reminders")
+def load_reminders() -> list:
+    """
+    Load reminders from file.
     
-    print()
+    Returns:
+        List of reminders.
+    """
+    if not REMINDERS_FILE.exists():
+        return []
+    
+    try:
+        with open(REMINDERS_FILE, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return []
 
 
-def filter_history(history: list, category: str = None, since: str = None) -> list:
+_MONTH_NUMBERS = {datetime(2000, month, 1).strftime("%B"): month for month in range(1, 13)}
+
+
+def parse_applies_to(applies_to: str) -> datetime:
     """
-    Filter history by category and/or date.
+    Parse an "applies_to" date such as "Monday, January 06, 2025".
     
-    Args:
-        history: The prediction history to filter.
-        category: Optional category to filter by.
-        since: Optional ISO date string to filter predictions after.
+    Splits the fixed format written by get_future_date() directly, which is
+    much faster than datetime.strptime.
     
-    Returns:
-        Filtered list of predictions.
+    Raises:
+        ValueError: If the string is not in that format.
+    """
+    try:
+        _, month_day, year = applies_to.split(", ")
+        month, day = month_day.split(" ")
+        return datetime(int(year), _MONTH_NUMBERS[month], int(day))
+    except (AttributeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid applies_to date '{applies_to}'") from e
+
+
+# Recurring reminders (Iteration 11)
+
+RECURRENCE_PRESETS = {
+    "daily": {"freq": "daily"},
+    "weekly": {"freq": "weekly"},
+    "weekdays": {"freq": "weekly", "byday": [0, 1, 2, 3, 4]},
+    "monthly": {"freq": "monthly"},
+}
+
+_WEEKDAY_CODES = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+def parse_recurrence(spec: str) -> dict:
     """
-    filtered = history
+    Parse a recurrence preset or a subset of iCalendar RRULE syntax.
     
-    if category:
-        filtered = [p for p in filtered if p.get("category", "").lower() == category.lower()]
+    Args:
+        spec: "daily", "weekly", "weekdays", "monthly", or an RRULE such as
+              "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=10" (FREQ may be
+              DAILY, WEEKLY or MONTHLY; UNTIL is YYYYMMDD or YYYY-MM-DD).
     
-    if since:
-        try:
-            since_dt = datetime.fromisoformat(since)
-            filtered = [
-                p for p in filtered
-                if "generated_at" in p and datetime.fromisoformat(p["generated_at"]) >= since_dt
-            ]
-        except ValueError:
-            print(f"Warning: Invalid date format '{since}'. Use ISO format (YYYY-MM-DD).")
+    Returns:
+        Rule dictionary with freq, interval, byday, count and until.
     
-    return filtered
+    Raises:
+        ValueError: If the recurrence is not supported.
+    """
+    rule = {"freq": None, "interval": 1, "byday": None, "count": None, "until": None}
+    text = spec.strip()
+    if text.lower() in RECURRENCE_PRESETS:
+        rule.update(RECURRENCE_PRESETS[text.lower()])
+        return rule
+    
+    if text.upper().startswith("RRULE:"):
+        text = text[len("RRULE:"):]
+    try:
+        for part in text.split(";"):
+            key, _, value = part.partition("=")
+            key, value = key.strip().upper(), value.strip().upper()
+            if key == "FREQ" and value in ("DAILY", "WEEKLY", "MONTHLY"):
+                rule["freq"] = value.lower()
+            elif key == "INTERVAL" and int(value) >= 1:
+                rule["interval"] = int(value)
+            elif key == "BYDAY":
+                rule["byday"] = sorted({_WEEKDAY_CODES.index(code.strip()) for code in value.split(",")})
+            elif key == "COUNT" and int(value) >= 1:
+                rule["count"] = int(value)
+            elif key == "UNTIL":
+                until = datetime.strptime(value[:8], "%Y%m%d") if "-" not in value else datetime.fromisoformat(value)
+                rule["until"] = until.strftime("%Y-%m-%d")
+            else:
+                raise ValueError(part)
+    except ValueError:
+        raise ValueError(f"Unsupported recurrence '{spec}'. Use daily, weekly, weekdays, monthly "
+                         "or an RRULE like FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=10")
+    if rule["freq"] is None:
+        raise ValueError(f"Recurrence '{spec}' needs a FREQ")
+    if rule["byday"] and rule["freq"] != "weekly":
+        raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+    return rule
+
+
+def _add_months(day, months: int):
+    year, month = divmod(day.month - 1 + months, 12)
+    year, month = day.year + year, month + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
 
 
-def export_history(format_type: str, category: str = None, since: str = None) -> None:
+def iter_occurrences(rule: dict, start: str = None):
     """
-    Export prediction history to a file.
+    Lazily generate the occurrence dates of a recurrence rule.
+    
+    Nothing is materialized: the generator jumps straight to the period
+    containing start (keeping COUNT exact) and yields dates from there, so
+    the cost depends on how many occurrences are consumed, not on how long
+    the recurrence has been running. Monthly dates past the end of a short
+    month fall on its last day.
     
     Args:
-        format_type: The export format ('csv', 'markdown', or 'json').
-        category: Optional category to filter by.
-        since: Optional ISO date string to filter predictions after.
-    """
-    history = load_history()
+        rule: Rule from parse_recurrence(), with its "start" date set.
+        start: Optional ISO date; skip occurrences before it.
     
-    if not history:
-        print("No prediction history to export.")
-        return
+    Yields:
+        Occurrence dates as YYYY-MM-DD strings, in order.
+    """
+    first = datetime.fromisoformat(rule["start"]).date()
+    lower = max(first, datetime.fromisoformat(start).date()) if start else first
+    until = datetime.fromisoformat(rule["until"]).date() if rule.get("until") else None
+    interval, count = rule.get("interval") or 1, rule.get("count")
+    
+    if rule["freq"] == "weekly":
+        weekdays = rule.get("byday") or [first.weekday()]
+        anchor = first - timedelta(days=first.weekday())
+        
+        def period_dates(p):
+            return [anchor + timedelta(weeks=p, days=d) for d in weekdays]
+        periods_to_lower = (lower - anchor).days // 7
+        per_period = len(weekdays)
+        first_period = sum(1 for d in weekdays if d >= first.weekday())
+    elif rule["freq"] == "monthly":
+        def period_dates(p):
+            return [_add_months(first, p)]
+        periods_to_lower = (lower.year - first.year) * 12 + lower.month - first.month
+        per_period = first_period = 1
+    else:
+        def period_dates(p):
+            return [first + timedelta(days=p)]
+        periods_to_lower = (lower - first).days
+        per_period = first_period = 1
+    
+    # Skip whole periods before lower, leaving one step of slack
+    steps = max(0, periods_to_lower // interval - 1)
+    period = steps * interval
+    seen = first_period + (steps - 1) * per_period if steps else 0
+    
+    while True:
+        for day in period_dates(period):
+            if day < first:
+                continue
+            seen += 1
+            if (count is not None and seen > count) or (until is not None and day > until):
+                return
+            if day >= lower:
+                yield day.isoformat()
+        period += interval
+
+
+def next_occurrence(rule: dict, after: str) -> str | None:
+    """Return the first occurrence strictly after a date, or None if the series has ended."""
+    day_after = (datetime.fromisoformat(after) + timedelta(days=1)).strftime("%Y-%m-%d")
+    return next(iter_occurrences(rule, day_after), None)
+
+
+def describe_recurrence(rule: dict) -> str:
+    """Describe a recurrence rule in words, e.g. "every 2 weeks on Mon, Wed"."""
+    unit = {"daily": "day", "weekly": "week", "monthly": "month"}[rule["freq"]]
+    interval = rule.get("interval") or 1
+    text = f"every {interval} {unit}s" if interval > 1 else f"every {unit}"
+    if rule.get("byday"):
+        text += " on " + ", ".join(calendar.day_abbr[d] for d in rule["byday"])
+    if rule.get("count"):
+        text += f", {rule['count']} times"
+    if rule.get("until"):
+        text += f" until {rule['until']}"
+    return text
+
+
+# Reminder archive (Iteration 11)
+
+# Acknowledged reminders move to the archive this many days after they
+# were acknowledged (None keeps them in the reminders file forever)
+REMINDER_ARCHIVE_DAYS = 30
+
+_REMINDER_ARCHIVE = {"key": None, "index": None}
+
+
+def _reminder_archive_file() -> Path:
+    """Path of the compressed archive of old acknowledged reminders."""
+    return REMINDERS_FILE.with_name("reminders.archive.jsonl.gz")
+
+
+def _split_expired_reminders(reminders: list, now: datetime = None) -> tuple[list, list]:
+    """
+    Split reminders into live ones and ones past the retention period.
     
-    # Apply filters
-    history = filter_history(history, category, since)
+    A reminder expires once its acknowledged_at is more than
+    REMINDER_ARCHIVE_DAYS ago. The reminder with the highest ID is always
+    kept so new IDs never collide with archived ones.
     
-    if not history:
-        print("No predictions match the specified filters.")
-        return
+    Returns:
+        Tuple of (reminders to keep, expired reminders).
+    """
+    if REMINDER_ARCHIVE_DAYS is None:
+        return reminders, []
+    cutoff = ((now or datetime.now()) - timedelta(days=REMINDER_ARCHIVE_DAYS)).isoformat()
+    newest = max((r["reminder_id"] for r in reminders if isinstance(r.get("reminder_id"), int)), default=None)
+    keep, expired = [], []
+    for reminder in reminders:
+        done = (
+            reminder.get("acknowledged", False)
+            and reminder.get("reminder_id") != newest
+            and (reminder.get("acknowledged_at") or cutoff) < cutoff
+        )
+        (expired if done else keep).append(reminder)
+    return keep, expired
+
+
+def _append_reminder_archive(reminders: list) -> None:
+    """
+    Append reminders to the archive as a new gzip segment.
     
-    if format_type == "csv":
-        output = StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["id", "category", "prediction", "applies_to", "confidence", "generated_at", "rating"])
-        for pred in history:
-            writer.writerow([
-                pred.get("id", ""),
-                pred.get("category", ""),
-                pred.get("prediction", ""),
-                pred.get("applies_to", ""),
-                pred.get("confidence", ""),
-                pred.get("generated_at", ""),
-                pred.get("rating", ""),
-            ])
-        print(output.getvalue())
+    Each call writes one gzip member of JSON lines; gzip readers treat
+    concatenated members as a single stream, so existing segments are
+    never rewritten.
+    """
+    archived_at = datetime.now().isoformat()
+    lines = "".join(json.dumps({**r, "archived_at": archived_at}, ensure_ascii=False) + "\n" for r in reminders)
+    with open(_reminder_archive_file(), "ab") as f:
+        f.write(gzip.compress(lines.encode("utf-8")))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+@timed_storage("load_reminder_archive")
+def load_archived_reminders() -> list:
+    """
+    Load archived reminders.
     
-    elif format_type == "json":
-        print(json.dumps(history, indent=2))
+    Returns:
+        List of archived reminders; if a reminder was archived twice (after
+        an interrupted write), its latest copy.
+    """
+    path = _reminder_archive_file()
+    if not path.exists():
+        return []
     
-    elif format_type == "markdown":
-        print("# Prediction History\n")
-        print(f"*Exported: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n")
-        if category:
-            print(f"*Filtered by category: {category}*\n")
-        if since:
-            print(f"*Filtered since: {since}*\n")
-        print(f"Total predictions: {len(history)}\n")
-        print("---\n")
-        
-        for pred in reversed(history):
-            rating_str = f" (⭐{pred['rating']}/5)" if pred.get("rating") else ""
-            print(f"## {pred.get('category', 'unknown').title()}{rating_str}\n")
-            print(f"> {pred['prediction']}\n")
-            print(f"- **ID**: {pred.get('id', 'N/A')}")
-            print(f"- **Applies to**: {pred.get('applies_to', 'N/A')}")
-            print(f"- **Confidence**: {pred.get('confidence', 'N/A')}")
-            if "generated_at" in pred:
-                try:
-                    dt = datetime.fromisoformat(pred["generated_at"])
-                    print(f"- **Generated**: {dt.strftime('%Y-%m-%d %H:%M')}")
-                except (ValueError, TypeError):
-                    pass
-            print()
-    else:
-        print(f"Unknown export format: {format_type}. Use 'csv', 'json', or 'markdown'.")
+    archived = {}
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    reminder = json.loads(line)
+                    archived[reminder.get("reminder_id")] = reminder
+    except (OSError, EOFError, json.JSONDecodeError):
+        pass  # Keep whatever was read before a damaged segment
+    return list(archived.values())
 
 
-def clear_history() -> bool:
+def get_archived_reminder_index() -> "ReminderIndex":
     """
-    Clear prediction history after confirmation.
+    Return an index over archived reminders, reading the archive only after it changes.
     
     Returns:
-        True if history was cleared, False otherwise.
+        A ReminderIndex over the archived reminders.
     """
-    history = load_history()
+    path = _reminder_archive_file()
+    key = (str(path), _file_signature(path))
+    if key[1] is None:
+        return ReminderIndex([])
+    with _REMINDER_INDEX_LOCK:
+        hit = _REMINDER_ARCHIVE["key"] == key
+        METRICS.record_cache("reminder_archive", hit)
+        if not hit:
+            _REMINDER_ARCHIVE["key"] = key
+            _REMINDER_ARCHIVE["index"] = ReminderIndex(load_archived_reminders())
+        return _REMINDER_ARCHIVE["index"]
+
+
+class _RemindersTransaction:
+    def __init__(self, reminders: list):
+        self.reminders = reminders
+        self.changed = False
+
+
+_REMINDERS_LOCK = threading.Lock()
+
+
+@contextmanager
+def reminders_transaction():
+    """
+    Run a locked read-modify-write of the reminders file.
     
-    if not history:
-        print("No prediction history to clear.")
-        return False
+    The lock is held across threads and, where fcntl is available, across
+    processes (on a sibling .lock file). The yielded transaction holds the
+    current reminders; set its ``changed`` flag to have them written back
+    atomically when the block completes. Every transaction also moves
+    acknowledged reminders past REMINDER_ARCHIVE_DAYS into the archive.
     
-    print(f"⚠️  This will delete {len(history)} prediction(s) from history.")
-    print("This action cannot be undone.")
+    Yields:
+        A transaction with ``reminders`` (list) and ``changed`` (bool).
+    """
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    with _file_lock(REMINDERS_FILE.with_name(REMINDERS_FILE.name + ".lock"), _REMINDERS_LOCK):
+        txn = _RemindersTransaction(load_reminders())
+        yield txn
+        txn.reminders[:], expired = _split_expired_reminders(txn.reminders)
+        if expired:
+            # Archive first: a crash in between leaves a duplicate, not a loss
+            _append_reminder_archive(expired)
+            txn.changed = True
+        if txn.changed:
+            tmp = REMINDERS_FILE.with_name(REMINDERS_FILE.name + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump(txn.reminders, f, indent=2)
+            os.replace(tmp, REMINDERS_FILE)
+
+
+def _reminder_date(prediction: dict, reminder_date: str = None) -> str:
+    """Work out a reminder's YYYY-MM-DD date from an explicit date or applies_to."""
+    if reminder_date:
+        try:
+            # Try to parse as ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
+            return datetime.fromisoformat(reminder_date).strftime("%Y-%m-%d")
+        except ValueError:
+            # Try to parse as date-only string (YYYY-MM-DD)
+            try:
+                return datetime.strptime(reminder_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                # Invalid date format, default to tomorrow
+                print(f"Warning: Invalid date format '{reminder_date}'. Using tomorrow's date.")
+                return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
     
+    # Extract date from applies_to field
     try:
-        response = input("Are you sure? (yes/no): ").strip().lower()
-    except EOFError:
-        print("\nOperation cancelled.")
-        return False
-    
-    if response == "yes":
-        HISTORY_FILE.unlink(missing_ok=True)
-        print("✅ History cleared successfully.")
-        return True
-    else:
-        print("Operation cancelled.")
-        return False
+        return parse_applies_to(prediction.get("applies_to", "")).strftime("%Y-%m-%d")
+    except ValueError:
+        # Default to tomorrow if parsing fails
+        return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
 
 
-# Reminder functions (Iteration 8)
-
-def load_reminders() -> list:
+@timed_storage("save_reminder")
+def save_reminders(items: list) -> list:
     """
-    Load reminders from file.
+    Save several predictions as reminders in one locked write.
+    
+    Args:
+        items: List of (prediction, reminder_date) or (prediction,
+               reminder_date, recurrence) tuples; reminder_date may be None
+               to use the prediction's "applies_to" date, and recurrence is
+               an optional parse_recurrence() spec.
     
     Returns:
-        List of reminders.
+        The reminder dictionaries that were saved.
+    
+    Raises:
+        ValueError: If a recurrence is invalid or has no occurrences.
     """
-    if not REMINDERS_FILE.exists():
-        return []
+    # Resolve dates and rules before taking the lock
+    resolved = []
+    for prediction, reminder_date, *rest in items:
+        remind_date = _reminder_date(prediction, reminder_date)
+        rule = None
+        if rest and rest[0]:
+            rule = parse_recurrence(rest[0]) if isinstance(rest[0], str) else dict(rest[0])
+            rule["start"] = remind_date
+            remind_date = next(iter_occurrences(rule), None)
+            if remind_date is None:
+                raise ValueError(f"Recurrence '{rest[0]}' has no occurrences")
+        resolved.append((prediction, remind_date, rule))
+    
+    with reminders_transaction() as txn:
+        # Assign reminder IDs
+        max_id = 0
+        for r in txn.reminders:
+            if "reminder_id" in r and isinstance(r["reminder_id"], int):
+                max_id = max(max_id, r["reminder_id"])
+        
+        created = []
+        for prediction, remind_date, rule in resolved:
+            max_id += 1
+            reminder = {
+                "reminder_id": max_id,
+                "prediction_id": prediction.get("id"),
+                "prediction": prediction.get("prediction"),
+                "category": prediction.get("category"),
+                "remind_date": remind_date,
+                "created_at": datetime.now().isoformat(),
+                "acknowledged": False,
+            }
+            if rule:
+                reminder["recurrence"] = rule
+            created.append(reminder)
+        
+        txn.reminders.extend(created)
+        txn.changed = bool(created)
     
-    try:
-        with open(REMINDERS_FILE, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
+    return created
 
 
-def save_reminder(prediction: dict, reminder_date: str = None) -> dict:
+def save_reminder(prediction: dict, reminder_date: str = None, recurrence=None) -> dict:
     """
     Save a prediction as a reminder.
     
@@ -1495,63 +5734,198 @@ def save_reminder(prediction: dict, reminder_date: str = None) -> dict:
         prediction: The prediction dictionary to save as a reminder.
         reminder_date: Optional specific date for the reminder (ISO format).
                        If not provided, uses the prediction's "applies_to" date.
+        recurrence: Optional recurrence (see parse_recurrence); the reminder
+                    then repeats, starting on its date.
     
     Returns:
         The reminder dictionary that was saved.
     """
-    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    return save_reminders([(prediction, reminder_date, recurrence)])[0]
+
+
+# Reminder index (Iteration 11)
+
+REMINDER_STATUSES = ("pending", "acknowledged", "all")
+
+_REMINDER_INDEX = {"key": None, "index": None}
+_REMINDER_INDEX_LOCK = threading.Lock()
+
+
+class ReminderIndex:
+    """
+    Date-ordered index over reminders.
     
-    reminders = load_reminders()
+    Pending and acknowledged reminders are each kept sorted by remind_date
+    (then reminder ID), so a date range is found with a binary search and
+    only reminders inside it are visited. A heap of pending reminders
+    answers "what is due next" without a scan. Recurring reminders are
+    indexed by their current occurrence; later occurrences are generated
+    lazily for bounded range queries.
     
-    # Assign a reminder ID
-    max_id = 0
-    for r in reminders:
-        if "reminder_id" in r and isinstance(r["reminder_id"], int):
-            max_id = max(max_id, r["reminder_id"])
+    Args:
+        reminders: The reminders, as loaded from the reminders file.
+    """
     
-    # Parse the reminder date
-    if reminder_date:
-        try:
-            # Try to parse as ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)
-            remind_dt = datetime.fromisoformat(reminder_date)
-            remind_date_str = remind_dt.strftime("%Y-%m-%d")
-        except ValueError:
-            # Try to parse as date-only string (YYYY-MM-DD)
-            try:
-                remind_dt = datetime.strptime(reminder_date, "%Y-%m-%d")
-                remind_date_str = remind_dt.strftime("%Y-%m-%d")
-            except ValueError:
-                # Invalid date format, default to tomorrow
-                print(f"Warning: Invalid date format '{reminder_date}'. Using tomorrow's date.")
-                remind_dt = datetime.now() + timedelta(days=1)
-                remind_date_str = remind_dt.strftime("%Y-%m-%d")
-    else:
-        # Extract date from applies_to field
-        applies_to = prediction.get("applies_to", "")
-        try:
-            remind_dt = datetime.strptime(applies_to, "%A, %B %d, %Y")
-            remind_date_str = remind_dt.strftime("%Y-%m-%d")
-        except ValueError:
-            # Default to tomorrow if parsing fails
-            remind_dt = datetime.now() + timedelta(days=1)
-            remind_date_str = remind_dt.strftime("%Y-%m-%d")
-    
-    reminder = {
-        "reminder_id": max_id + 1,
-        "prediction_id": prediction.get("id"),
-        "prediction": prediction.get("prediction"),
-        "category": prediction.get("category"),
-        "remind_date": remind_date_str,
-        "created_at": datetime.now().isoformat(),
-        "acknowledged": False,
-    }
+    def __init__(self, reminders: list):
+        self.reminders = reminders
+        self._entries = {"pending": [], "acknowledged": []}
+        for reminder in reminders:
+            status = "acknowledged" if reminder.get("acknowledged", False) else "pending"
+            self._entries[status].append(
+                (reminder.get("remind_date") or "", reminder.get("reminder_id") or 0, reminder)
+            )
+        for entries in self._entries.values():
+            entries.sort(key=lambda entry: entry[:2])
+        self._dates = {status: [entry[0] for entry in entries] for status, entries in self._entries.items()}
+        
+        # Already sorted, which is a valid heap
+        self._due = [entry for entry in self._entries["pending"] if entry[0]]
+        self._recurring = [entry for entry in self._entries["pending"] if entry[2].get("recurrence")]
+    
+    def __len__(self) -> int:
+        return len(self.reminders)
+    
+    def range(self, start: str = None, end: str = None, status: str = "pending",
+              expand: bool = True) -> list:
+        """
+        Get reminders due within a date range.
+        
+        Args:
+            start: Optional first date (YYYY-MM-DD), inclusive.
+            end: Optional last date (YYYY-MM-DD), inclusive.
+            status: "pending", "acknowledged" or "all".
+            expand: If True and end is given, include later occurrences of
+                    recurring reminders within the range (as copies with
+                    that remind_date).
+        
+        Returns:
+            Reminders in remind_date order.
+        """
+        statuses = ("pending", "acknowledged") if status == "all" else (status,)
+        windows = []
+        for name in statuses:
+            dates = self._dates[name]
+            lo = bisect.bisect_left(dates, start) if start else 0
+            hi = bisect.bisect_right(dates, end) if end else len(dates)
+            windows.append(self._entries[name][lo:hi])
+        if expand and end and status != "acknowledged":
+            windows.append(self._occurrences(start, end))
+        if len(windows) == 1:
+            return [entry[2] for entry in windows[0]]
+        return [entry[2] for entry in heapq.merge(*windows, key=lambda entry: entry[:2])]
+    
+    def _occurrences(self, start: str, end: str) -> list:
+        """Later occurrences of recurring reminders within [start, end], sorted."""
+        extra = []
+        for current, reminder_id, reminder in self._recurring:
+            after = max(current, start or current)
+            for day in iter_occurrences(reminder["recurrence"], after):
+                if day > end:
+                    break
+                if day != current:
+                    extra.append((day, reminder_id, {**reminder, "remind_date": day}))
+        extra.sort(key=lambda entry: entry[:2])
+        return extra
+    
+    def next_due(self) -> dict | None:
+        """Return the pending reminder with the earliest remind_date, if any."""
+        return self._due[0][2] if self._due else None
+    
+    def next_after(self, date: str) -> dict | None:
+        """Return the first pending reminder due strictly after a date, if any."""
+        dates = self._dates["pending"]
+        i = bisect.bisect_right(dates, date)
+        return self._entries["pending"][i][2] if i < len(dates) else None
+    
+    def next_date_after(self, date: str) -> str | None:
+        """Return the first date strictly after a date on which a pending reminder or occurrence is due."""
+        upcoming = self.next_after(date)
+        dates = [upcoming["remind_date"]] if upcoming is not None else []
+        for current, _, reminder in self._recurring:
+            if current <= date:
+                day = next_occurrence(reminder["recurrence"], date)
+                if day is not None:
+                    dates.append(day)
+        return min(dates, default=None)
+    
+    def due(self, today: str = None, expand: bool = False) -> list:
+        """
+        Return pending reminders due on or before today, oldest first.
+        
+        Args:
+            today: Optional date (YYYY-MM-DD) to use as today.
+            expand: If True, include every elapsed occurrence of recurring
+                    reminders, not just the current (unacknowledged) one.
+        """
+        return self.range(end=today or datetime.now().strftime("%Y-%m-%d"), expand=expand)
+
+
+def get_reminder_index() -> ReminderIndex:
+    """
+    Return the reminder index, rebuilding it only after the file changes.
+    
+    Returns:
+        A ReminderIndex over the current reminders.
+    """
+    key = (str(REMINDERS_FILE), _file_signature(REMINDERS_FILE))
+    with _REMINDER_INDEX_LOCK:
+        hit = key[1] is not None and _REMINDER_INDEX["key"] == key
+        METRICS.record_cache("reminder_index", hit)
+        if not hit:
+            _REMINDER_INDEX["key"] = key
+            _REMINDER_INDEX["index"] = ReminderIndex(load_reminders())
+        return _REMINDER_INDEX["index"]
+
+
+def normalize_reminder_date(value: str) -> str | None:
+    """
+    Normalize a date bound for reminder queries to YYYY-MM-DD.
+    
+    Raises:
+        ValueError: If the value is not an ISO date.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).strftime("%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'. Use ISO format (YYYY-MM-DD).")
+
+
+def query_reminders(start: str = None, end: str = None, status: str = "pending") -> list:
+    """
+    Get reminders due within a date range from the reminder index.
+    
+    Pending queries only touch the reminders file; the archive of old
+    acknowledged reminders is read when acknowledged ones are requested.
     
-    reminders.append(reminder)
+    Args:
+        start: Optional first date (ISO format), inclusive.
+        end: Optional last date (ISO format), inclusive.
+        status: "pending", "acknowledged" or "all".
     
-    with open(REMINDERS_FILE, "w") as f:
-        json.dump(reminders, f, indent=2)
+    Returns:
+        Reminders in remind_date order.
     
-    return reminder
+    Raises:
+        ValueError: If a date or the status is invalid.
+    """
+    if status not in REMINDER_STATUSES:
+        raise ValueError(f"Unknown status '{status}'. Use one of: {', '.join(REMINDER_STATUSES)}")
+    start, end = normalize_reminder_date(start), normalize_reminder_date(end)
+    index = get_reminder_index()
+    live = index.range(start, end, status)
+    if status == "pending":
+        return live
+    
+    archive = get_archived_reminder_index()
+    if not len(archive):
+        return live
+    live_ids = {r.get("reminder_id") for r in index.reminders}
+    archived = [r for r in archive.range(start, end, "acknowledged") if r.get("reminder_id") not in live_ids]
+    return list(heapq.merge(
+        archived, live, key=lambda r: (r.get("remind_date") or "", r.get("reminder_id") or 0)
+    ))
 
 
 def get_pending_reminders() -> list:
@@ -1559,19 +5933,9 @@ def get_pending_reminders() -> list:
     Get reminders that are due (today or past due).
     
     Returns:
-        List of pending reminders.
+        List of pending reminders, oldest first.
     """
-    reminders = load_reminders()
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    pending = []
-    for reminder in reminders:
-        if not reminder.get("acknowledged", False):
-            remind_date = reminder.get("remind_date", "")
-            if remind_date and remind_date <= today:
-                pending.append(reminder)
-    
-    return pending
+    return get_reminder_index().due()
 
 
 def display_pending_reminders() -> bool:
@@ -1618,32 +5982,39 @@ def display_pending_reminders() -> bool:
     return True
 
 
-def display_reminders(show_all: bool = False) -> None:
+def display_reminders(show_all: bool = False, start: str = None, end: str = None) -> None:
     """
     Display all reminders.
     
     Args:
         show_all: If True, show acknowledged reminders too.
+        start: Optional first due date (ISO format) to show.
+        end: Optional last due date (ISO format) to show.
     """
-    reminders = load_reminders()
+    index = get_reminder_index()
     
-    if not reminders:
+    if not len(index) and not (show_all and _reminder_archive_file().exists()):
         print("No reminders found.")
         print("Use --remind when generating a prediction to create a reminder.")
         return
     
+    try:
+        reminders = query_reminders(start, end, "all" if show_all else "pending")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    
     today = datetime.now().strftime("%Y-%m-%d")
     
     print()
     title = "all reminders" if show_all else "pending reminders"
+    if start or end:
+        title += f" due {start or '…'} to {end or '…'}"
     print(f"⏰ Showing {title}:")
     print()
     
     displayed = 0
     for reminder in reminders:
-        if not show_all and reminder.get("acknowledged", False):
-            continue
-        
         displayed += 1
         remind_date = reminder.get("remind_date", "")
         category = reminder.get("category", "unknown").title()
@@ -1666,6 +6037,8 @@ def display_reminders(show_all: bool = False) -> None:
         print(f"   🔮 {prediction}")
         if not acknowledged:
             print(f"   Due: {remind_date}")
+        if reminder.get("recurrence"):
+            print(f"   🔁 Repeats {describe_recurrence(reminder['recurrence'])}")
         print()
     
     if displayed == 0:
@@ -1677,37 +6050,108 @@ def display_reminders(show_all: bool = False) -> None:
             print("Use --list-reminders --all to include acknowledged reminders.")
 
 
-def acknowledge_reminder(reminder_id: int) -> bool:
+def acknowledge_reminders(reminder_ids: list = None, until: str = None) -> dict:
     """
-    Acknowledge (dismiss) a reminder.
+    Acknowledge many reminders in one locked read-modify-write.
     
     Args:
-        reminder_id: The ID of the reminder to acknowledge.
+        reminder_ids: Optional IDs of reminders to acknowledge.
+        until: Optional ISO date; also acknowledge every pending reminder
+               due on or before it.
     
     Returns:
-        True if successful, False otherwise.
+        Dictionary with "acknowledged" (the updated reminders),
+        "already_acknowledged" and "not_found" (lists of requested IDs).
+    
+    Raises:
+        ValueError: If until is not a valid date.
     """
-    reminders = load_reminders()
+    until = normalize_reminder_date(until)
+    result = {"acknowledged": [], "already_acknowledged": [], "not_found": []}
+    
+    with reminders_transaction() as txn:
+        by_id = {r.get("reminder_id"): r for r in txn.reminders}
+        targets = {}
+        for reminder_id in reminder_ids or []:
+            reminder = by_id.get(reminder_id)
+            if reminder is None:
+                result["not_found"].append(reminder_id)
+            elif reminder.get("acknowledged", False):
+                result["already_acknowledged"].append(reminder_id)
+            else:
+                targets[reminder_id] = reminder
+        if result["not_found"]:
+            # Archived reminders were acknowledged long ago
+            archived_ids = {r.get("reminder_id") for r in load_archived_reminders()}
+            result["already_acknowledged"] += [i for i in result["not_found"] if i in archived_ids]
+            result["not_found"] = [i for i in result["not_found"] if i not in archived_ids]
+        if until:
+            for reminder in ReminderIndex(txn.reminders).range(end=until, expand=False):
+                targets.setdefault(reminder.get("reminder_id"), reminder)
+        
+        acknowledged_at = datetime.now().isoformat()
+        for reminder in targets.values():
+            rule = reminder.get("recurrence")
+            through = max(reminder["remind_date"], until or "")
+            upcoming = next_occurrence(rule, through) if rule else None
+            if upcoming:
+                # Recurring: move on to the next occurrence
+                reminder["acknowledged_through"] = through
+                reminder["remind_date"] = upcoming
+            else:
+                reminder["acknowledged"] = True
+            reminder["acknowledged_at"] = acknowledged_at
+        result["acknowledged"] = list(targets.values())
+        txn.changed = bool(targets)
     
-    for reminder in reminders:
-        if reminder.get("reminder_id") == reminder_id:
-            if reminder.get("acknowledged", False):
-                print(f"Reminder #{reminder_id} was already acknowledged.")
-                return False
-            
-            reminder["acknowledged"] = True
-            reminder["acknowledged_at"] = datetime.now().isoformat()
-            
-            with open(REMINDERS_FILE, "w") as f:
-                json.dump(reminders, f, indent=2)
-            
-            print(f"✅ Reminder #{reminder_id} acknowledged!")
-            print(f"   \"{reminder.get('prediction', '')}\"")
-            return True
+    return result
+
+
+def acknowledge_reminder_ids(reminder_ids: list = None, until: str = None) -> bool:
+    """
+    Acknowledge reminders by ID and/or due date and report the outcome.
+    
+    Args:
+        reminder_ids: Optional IDs of reminders to acknowledge.
+        until: Optional ISO date; also acknowledge pending reminders due by then.
+    
+    Returns:
+        True if at least one reminder was acknowledged, False otherwise.
+    """
+    try:
+        result = acknowledge_reminders(reminder_ids, until)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
+    
+    for reminder in result["acknowledged"]:
+        print(f"✅ Reminder #{reminder.get('reminder_id')} acknowledged!")
+        print(f"   \"{reminder.get('prediction', '')}\"")
+    for reminder_id in result["already_acknowledged"]:
+        print(f"Reminder #{reminder_id} was already acknowledged.")
+    for reminder_id in result["not_found"]:
+        print(f"Error: Reminder #{reminder_id} not found.")
+    if result["not_found"]:
+        print("Use --list-reminders to see available reminders.")
+    
+    if len(result["acknowledged"]) > 1:
+        print(f"\nAcknowledged {len(result['acknowledged'])} reminder(s).")
+    elif until and not result["acknowledged"]:
+        print("No pending reminders to acknowledge.")
+    return bool(result["acknowledged"])
+
+
+def acknowledge_reminder(reminder_id: int) -> bool:
+    """
+    Acknowledge (dismiss) a reminder.
+    
+    Args:
+        reminder_id: The ID of the reminder to acknowledge.
     
-    print(f"Error: Reminder #{reminder_id} not found.")
-    print("Use --list-reminders to see available reminders.")
-    return False
+    Returns:
+        True if successful, False otherwise.
+    """
+    return acknowledge_reminder_ids([reminder_id])
 
 
 def clear_reminders(clear_all: bool = False) -> bool:
@@ -1721,17 +6165,18 @@ def clear_reminders(clear_all: bool = False) -> bool:
         True if reminders were cleared, False otherwise.
     """
     reminders = load_reminders()
+    archived = load_archived_reminders()
     
-    if not reminders:
+    if not reminders and not archived:
         print("No reminders to clear.")
         return False
     
     if clear_all:
-        count = len(reminders)
+        count = len(reminders) + len(archived)
         print(f"⚠️  This will delete ALL {count} reminder(s).")
     else:
         acknowledged = [r for r in reminders if r.get("acknowledged", False)]
-        count = len(acknowledged)
+        count = len(acknowledged) + len(archived)
         if count == 0:
             print("No acknowledged reminders to clear.")
             print("Use --clear-reminders --all to clear all reminders.")
@@ -1750,9 +6195,11 @@ def clear_reminders(clear_all: bool = False) -> bool:
         if clear_all:
             REMINDERS_FILE.unlink(missing_ok=True)
         else:
-            remaining = [r for r in reminders if not r.get("acknowledged", False)]
-            with open(REMINDERS_FILE, "w") as f:
-                json.dump(remaining, f, indent=2)
+            # Re-read under the lock so reminders added meanwhile are kept
+            with reminders_transaction() as txn:
+                txn.reminders[:] = [r for r in txn.reminders if not r.get("acknowledged", False)]
+                txn.changed = True
+        _reminder_archive_file().unlink(missing_ok=True)
         print(f"✅ Cleared {count} reminder(s).")
         return True
     else:
@@ -1760,6 +6207,265 @@ def clear_reminders(clear_all: bool = False) -> bool:
         return False
 
 
+# Reminder dispatcher (Iteration 11)
+
+class LogSink:
+    """Print due reminders to the server's output."""
+    
+    name = "log"
+    
+    async def send(self, reminders: list) -> None:
+        for reminder in reminders:
+            print(f"⏰ Reminder #{reminder.get('reminder_id')} due {reminder.get('remind_date')}: "
+                  f"{reminder.get('prediction', '')}")
+
+
+class FileSink:
+    """Append due reminders to a JSON Lines spool file."""
+    
+    name = "file"
+    
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.key = f"file:{self.path}"
+    
+    def _write(self, reminders: list) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        dispatched_at = datetime.now().isoformat()
+        with open(self.path, "a") as f:
+            for reminder in reminders:
+                f.write(json.dumps({"dispatched_at": dispatched_at, **reminder}) + "\n")
+    
+    async def send(self, reminders: list) -> None:
+        await asyncio.to_thread(self._write, reminders)
+
+
+class WebhookSink:
+    """POST due reminders as JSON to a webhook URL."""
+    
+    name = "webhook"
+    
+    def __init__(self, url: str, timeout: float = 5.0):
+        if not url.startswith(("http://", "https://")):
+            raise ValueError(f"Webhook URL must start with http:// or https://: '{url}'")
+        self.url = url
+        self.key = f"webhook:{url}"
+        self.timeout = timeout
+    
+    def _post(self, reminders: list) -> None:
+        body = dump_json_bytes({"event": "reminder_due", "reminders": reminders})
+        request = urllib.request.Request(
+            self.url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+    
+    async def send(self, reminders: list) -> None:
+        await asyncio.to_thread(self._post, reminders)
+
+
+class LiveFeedSink:
+    """Push due reminders to connected web clients as a "reminder_due" event."""
+    
+    name = "live"
+    
+    def __init__(self, feed: "LiveFeed" = None):
+        self.feed = feed or LIVE_FEED
+    
+    async def send(self, reminders: list) -> None:
+        self.feed.publish("reminder_due", {"reminders": reminders})
+
+
+def parse_sink(spec: str):
+    """
+    Create a notification sink from a command-line spec.
+    
+    Args:
+        spec: "log", "live", "file:PATH" or "webhook:URL".
+    
+    Returns:
+        A sink object with an async send(reminders) method.
+    
+    Raises:
+        ValueError: If the spec is not recognized.
+    """
+    kind, _, target = spec.partition(":")
+    if kind == "log" and not target:
+        return LogSink()
+    if kind == "live" and not target:
+        return LiveFeedSink()
+    if kind == "file" and target:
+        return FileSink(target)
+    if kind == "webhook" and target:
+        return WebhookSink(target)
+    raise ValueError(f"Unknown notification sink '{spec}'. Use log, live, file:PATH or webhook:URL")
+
+
+def _dispatched_file() -> Path:
+    return REMINDERS_FILE.with_name("dispatched.json")
+
+
+def _sink_key(sink) -> str:
+    """Identify a sink in the dispatched record (e.g. "log" or "file:PATH")."""
+    return getattr(sink, "key", None) or sink.name
+
+
+class ReminderDispatcher:
+    """
+    Deliver due reminders to notification sinks from the API server's event loop.
+    
+    The dispatcher sleeps until the next reminder or occurrence of a
+    recurring reminder falls due (midnight of that date) and wakes early when a reminder is created or acknowledged
+    through the API, which it hears about on the live feed. Reminders changed
+    by another process are picked up at the latest after max_sleep seconds.
+    Reminder occurrences delivered to each sink are recorded next to the
+    reminders file, so each is delivered once per sink even across
+    restarts. A batch a sink fails to take stays undelivered for that sink
+    and is retried, after retry_delay seconds doubling with each
+    consecutive failure (capped at max_sleep).
+    
+    Args:
+        sinks: Sink objects (see parse_sink).
+        batch_size: Maximum reminders handed to a sink per call.
+        max_sleep: Longest time to sleep between checks, in seconds.
+        feed: Live feed used to hear about reminder changes.
+        retry_delay: Wait before the first retry after a failed delivery.
+    """
+    
+    def __init__(self, sinks: list, batch_size: int = 50, max_sleep: float = 900,
+                 feed: "LiveFeed" = None, retry_delay: float = 5):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.max_sleep = max_sleep
+        self.feed = feed or LIVE_FEED
+        self.retry_delay = retry_delay
+        self._task = None
+        self._failures = 0
+        self._retry_at = None
+        try:
+            with open(_dispatched_file(), "r") as f:
+                data = json.load(f)
+            self._dispatched = set()
+            for item in data:
+                if isinstance(item, str):
+                    # Old format: one key per occurrence, sent to every sink
+                    self._dispatched.update((_sink_key(sink), item) for sink in sinks)
+                else:
+                    self._dispatched.add(tuple(item))
+        except (json.JSONDecodeError, IOError, TypeError, ValueError):
+            self._dispatched = set()
+    
+    @staticmethod
+    def _key(reminder: dict) -> str:
+        # A recurring reminder is delivered once per occurrence
+        return f"{reminder.get('reminder_id')}@{reminder.get('remind_date')}"
+    
+    async def _deliver(self, sink, reminders: list) -> tuple[set, bool]:
+        """
+        Send reminders to one sink in batches, stopping at the first failure.
+        
+        Returns:
+            Tuple of (keys of the reminders the sink took, whether all were taken).
+        """
+        delivered = set()
+        for start in range(0, len(reminders), self.batch_size):
+            batch = reminders[start:start + self.batch_size]
+            try:
+                await sink.send(batch)
+            except Exception as e:
+                print(f"Warning: Could not deliver reminders to {sink.name} sink: {e}")
+                METRICS.inc("thefuture_reminder_dispatch_errors_total", {"sink": sink.name})
+                return delivered, False
+            delivered.update(self._key(r) for r in batch)
+        return delivered, True
+    
+    async def dispatch_due(self) -> int:
+        """
+        Send every due reminder to each sink that has not yet taken it.
+        
+        Returns:
+            Number of reminders newly delivered to at least one sink.
+        """
+        index = get_reminder_index()
+        due = index.due(expand=True)
+        pending = {
+            sink: [r for r in due if (_sink_key(sink), self._key(r)) not in self._dispatched]
+            for sink in self.sinks
+        }
+        senders = [sink for sink in self.sinks if pending[sink]]
+        if not senders:
+            return 0
+        
+        results = await asyncio.gather(*(self._deliver(sink, pending[sink]) for sink in senders))
+        delivered = set()
+        for sink, (keys, _) in zip(senders, results):
+            delivered |= keys
+            self._dispatched.update((_sink_key(sink), key) for key in keys)
+        METRICS.inc("thefuture_reminders_dispatched_total", value=len(delivered))
+        
+        if all(ok for _, ok in results):
+            self._failures, self._retry_at = 0, None
+        else:
+            self._failures += 1
+            delay = min(self.retry_delay * 2 ** (self._failures - 1), self.max_sleep)
+            self._retry_at = time.monotonic() + delay
+        
+        # Forget occurrences that are no longer current
+        current = {self._key(r) for r in due}
+        self._dispatched = {item for item in self._dispatched if item[1] in current}
+        try:
+            _write_json_atomic(_dispatched_file(), sorted(self._dispatched))
+        except IOError:
+            pass
+        return len(delivered)
+    
+    def seconds_until_next(self) -> float:
+        """Seconds until the next pending reminder falls due or a failed delivery is retried, capped at max_sleep."""
+        now = datetime.now()
+        wait = self.max_sleep
+        if self._retry_at is not None:
+            wait = min(wait, self._retry_at - time.monotonic())
+        upcoming = get_reminder_index().next_date_after(now.strftime("%Y-%m-%d"))
+        if upcoming is not None:
+            due_at = datetime.strptime(upcoming, "%Y-%m-%d")
+            wait = min(wait, (due_at - now).total_seconds())
+        return max(0.0, wait)
+    
+    async def _reminders_changed(self, queue: "asyncio.Queue") -> None:
+        while True:
+            event = await queue.get()
+            if event["type"] in ("reminder_created", "reminder_acknowledged", "resync"):
+                return
+    
+    async def run(self) -> None:
+        """Dispatch due reminders until cancelled."""
+        queue = self.feed.subscribe()
+        try:
+            while True:
+                await self.dispatch_due()
+                try:
+                    await asyncio.wait_for(self._reminders_changed(queue), timeout=self.seconds_until_next())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.feed.unsubscribe(queue)
+    
+    def start(self) -> None:
+        """Start dispatching on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+    
+    async def stop(self) -> None:
+        """Stop dispatching."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
 def format_for_sharing(prediction: dict, format_type: str = "text") -> str:
     """
     Format a prediction for sharing on social media.
@@ -1803,6 +6509,7 @@ Examples:
   python app.py --time-aware         # Time-aware prediction (morning/evening, weekday/weekend)
   python app.py --preferred          # Preference-weighted prediction (based on your ratings)
   python app.py --smart              # Smart mode (combines time-aware + preferences)
+  python app.py --ask "Give me a fortune about love"  # Plain-words request
   python app.py --json               # JSON output
   python app.py --history            # View past predictions
   python app.py --feedback 5 4       # Rate prediction #5 with 4 stars
@@ -1810,6 +6517,7 @@ Examples:
   python app.py --export csv         # Export history as CSV
   python app.py --export json --filter fortune   # Export fortune predictions as JSON
   python app.py --export csv --since 2025-01-01  # Export predictions since date
+  python app.py --export csv -o history.csv      # Stream export to a file
   python app.py --share              # Format for social sharing
   python app.py --share twitter      # Format for Twitter/X
   python app.py --theme motivational # Use motivational theme
@@ -1819,6 +6527,7 @@ Examples:
   python app.py --share --copy       # Share and copy to clipboard
   python app.py --api                # Start the REST API with web frontend
   python app.py --api --port 3000    # Start API on custom port
+  python app.py --api --profile --profile-rate 0.1  # Profile 10% of requests sent with X-Profile: 1
   python app.py --remind             # Set reminder for prediction's apply date
   python app.py --remind 2025-12-25  # Set reminder for specific date
   python app.py --list-reminders     # View pending reminders
@@ -1829,6 +6538,9 @@ Examples:
   python app.py --delete-theme my_theme  # Delete a custom theme
   python app.py --export-theme zodiac    # Export theme to JSON
   python app.py --import-theme file.json # Import theme from JSON file
+  python app.py --import-themes pack/    # Import every theme file in a directory
+  python app.py --browse-themes          # Browse the theme repository
+  python app.py --install-theme tarot    # Install a theme from the repository
 
 Web Frontend (NEW in Iteration 10):
   Start the API server with --api, then visit http://localhost:8000/app
@@ -1840,6 +6552,11 @@ Web Frontend (NEW in Iteration 10):
         metavar="NAME",
         help="Category of prediction (use with --theme for theme-specific categories)",
     )
+    parser.add_argument(
+        "--ask",
+        metavar="TEXT",
+        help='Ask in plain words, e.g. "Give me a fortune about love" (picks category, theme and mode)',
+    )
 
     def positive_int(value):
         """Validate that count is a positive integer."""
@@ -1894,11 +6611,41 @@ Web Frontend (NEW in Iteration 10):
         action="store_true",
         help="Show prediction statistics",
     )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="With --list-themes: also report theme memory use",
+    )
+    parser.add_argument(
+        "--group-by",
+        metavar="DIMS",
+        help="With --stats: break down by comma-separated dimensions "
+             "(category, theme, mode, time_of_day, day_type)",
+    )
+    def where_filter(value):
+        """Validate a --where DIM=VALUE filter."""
+        dim, sep, wanted = value.partition("=")
+        if not sep or not dim.strip():
+            raise argparse.ArgumentTypeError(f"'{value}' is not of the form DIM=VALUE")
+        return dim.strip(), wanted
+    
+    parser.add_argument(
+        "--where",
+        metavar="DIM=VALUE",
+        type=where_filter,
+        action="append",
+        help="With --stats --group-by: only count predictions where DIM equals VALUE (repeatable)",
+    )
     parser.add_argument(
         "--export",
         choices=["csv", "markdown", "json"],
         help="Export history (csv, markdown, or json)",
     )
+    parser.add_argument(
+        "--output", "-o",
+        metavar="FILE",
+        help="Write --export output to FILE instead of stdout",
+    )
     parser.add_argument(
         "--clear-history",
         action="store_true",
@@ -1918,12 +6665,12 @@ Web Frontend (NEW in Iteration 10):
     parser.add_argument(
         "--filter",
         metavar="CATEGORY",
-        help="Filter history/export by category",
+        help="Filter history/export/stats by category",
     )
     parser.add_argument(
         "--since",
         metavar="DATE",
-        help="Filter history/export by date (ISO format: YYYY-MM-DD)",
+        help="Filter history/export/stats by date (ISO format: YYYY-MM-DD)",
     )
     # Iteration 5: New arguments
     parser.add_argument(
@@ -1945,6 +6692,22 @@ Web Frontend (NEW in Iteration 10):
         metavar="NAME",
         help="Use a themed prediction set (built-in or custom theme name)",
     )
+    parser.add_argument(
+        "--search-corpus",
+        metavar="TERMS",
+        help="Search all predictions and themes by wording (use --theme to search one theme)",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="TERMS",
+        help="With --history: search past predictions by wording (use --filter, --since and --limit to narrow)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=positive_int,
+        default=SEARCH_RESULT_LIMIT,
+        help=f"Maximum number of search results (default: {SEARCH_RESULT_LIMIT})",
+    )
     parser.add_argument(
         "--copy",
         action="store_true",
@@ -1959,8 +6722,40 @@ Web Frontend (NEW in Iteration 10):
     parser.add_argument(
         "--port",
         type=int,
-        default=8000,
-        help="Port for the API server (default: 8000)",
+        default=None,
+        help=f"Port for the API server (default: 8000) or theme repository (default: {THEME_REPOSITORY_PORT})",
+    )
+    # Iteration 11: Profiling arguments
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Allow API requests to be profiled (send X-Profile: 1 or ?profile=true)",
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=1.0,
+        metavar="RATE",
+        help="Fraction of profile requests actually profiled (default: 1.0)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=25,
+        metavar="N",
+        help="Number of functions to report per profile (default: 25)",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        metavar="DIR",
+        help="Save .pstats files here instead of returning profiles in the response",
+    )
+    parser.add_argument(
+        "--notify",
+        metavar="SINK",
+        action="append",
+        help="With --api: deliver due reminders to SINK (log, live, file:PATH, "
+             "webhook:URL or none; repeatable, default: log and live)",
     )
     # Iteration 8: Reminder arguments
     parser.add_argument(
@@ -1970,6 +6765,12 @@ Web Frontend (NEW in Iteration 10):
         metavar="DATE",
         help="Set a reminder for this prediction (optional date: YYYY-MM-DD)",
     )
+    parser.add_argument(
+        "--repeat",
+        metavar="RULE",
+        help="Make the reminder recurring: daily, weekly, weekdays, monthly or an "
+             "RRULE such as FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=10",
+    )
     parser.add_argument(
         "--list-reminders",
         action="store_true",
@@ -1977,9 +6778,13 @@ Web Frontend (NEW in Iteration 10):
     )
     parser.add_argument(
         "--acknowledge",
-        type=int,
-        metavar="ID",
-        help="Acknowledge (dismiss) a reminder by ID",
+        metavar="IDS",
+        help="Acknowledge (dismiss) reminders by ID (comma-separated, e.g. 1,2,3)",
+    )
+    parser.add_argument(
+        "--acknowledge-overdue",
+        action="store_true",
+        help="Acknowledge every reminder that is past due",
     )
     parser.add_argument(
         "--clear-reminders",
@@ -1991,6 +6796,18 @@ Web Frontend (NEW in Iteration 10):
         action="store_true",
         help="Include all items (with --list-reminders or --clear-reminders)",
     )
+    parser.add_argument(
+        "--from",
+        dest="from_date",
+        metavar="DATE",
+        help="With --list-reminders: only reminders due on or after DATE (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_date",
+        metavar="DATE",
+        help="With --list-reminders: only reminders due on or before DATE (YYYY-MM-DD)",
+    )
     # Iteration 9: Custom themes arguments
     parser.add_argument(
         "--add-theme",
@@ -2010,7 +6827,34 @@ Web Frontend (NEW in Iteration 10):
     parser.add_argument(
         "--import-theme",
         metavar="FILE",
-        help="Import a custom theme from a JSON file",
+        help="Import a custom theme from a JSON or JSONL file",
+    )
+    parser.add_argument(
+        "--import-themes",
+        metavar="DIR",
+        help="Import all JSON/JSONL theme files in a directory (in parallel, committed together)",
+    )
+    parser.add_argument(
+        "--serve-themes",
+        action="store_true",
+        help="Serve your custom themes as a theme repository (use --port to change the port)",
+    )
+    parser.add_argument(
+        "--browse-themes",
+        nargs="?",
+        const="",
+        metavar="SEARCH",
+        help="List the themes in the theme repository, optionally matching SEARCH",
+    )
+    parser.add_argument(
+        "--install-theme",
+        metavar="NAME[,NAME...]",
+        help="Install or update themes from the theme repository",
+    )
+    parser.add_argument(
+        "--theme-repo",
+        metavar="URL",
+        help=f"Theme repository URL (default: {THEME_REPOSITORY_URL})",
     )
     parser.add_argument(
         "--export-theme",
@@ -2025,9 +6869,26 @@ def main():
     """Main entry point for the future predictor."""
     args = parse_args()
     
+    if args.search is not None and not (args.history or args.show_rated):
+        print("Error: --search only works with --history or --show-rated. "
+              "Use --search-corpus to search all predictions and themes.")
+        return
+    
     # Handle API server startup (Iteration 7)
     if args.api:
-        start_api(port=args.port)
+        try:
+            sinks = [parse_sink(spec) for spec in args.notify or ["log", "live"] if spec != "none"]
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        start_api(
+            port=args.port or 8000,
+            profile=args.profile,
+            profile_sample_rate=args.profile_rate,
+            profile_top=args.profile_top,
+            profile_dir=args.profile_dir,
+            reminder_sinks=sinks,
+        )
         return
     
     # Handle clear history (must be first as it modifies history)
@@ -2036,12 +6897,18 @@ def main():
         return
     
     # Handle reminder-related commands (Iteration 8)
-    if args.acknowledge:
-        acknowledge_reminder(args.acknowledge)
+    if args.acknowledge or args.acknowledge_overdue:
+        try:
+            reminder_ids = [int(part) for part in (args.acknowledge or "").split(",") if part.strip()]
+        except ValueError:
+            print(f"Error: Invalid reminder IDs '{args.acknowledge}'. Use e.g. --acknowledge 1,2,3")
+            return
+        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        acknowledge_reminder_ids(reminder_ids, until=yesterday if args.acknowledge_overdue else None)
         return
     
     if args.list_reminders:
-        display_reminders(show_all=args.all)
+        display_reminders(show_all=args.all, start=args.from_date, end=args.to_date)
         return
     
     if args.clear_reminders:
@@ -2054,24 +6921,47 @@ def main():
         add_feedback(pred_id, rating)
         return
     
+    # An invalid --since is warned about and ignored
+    if args.since:
+        try:
+            _parse_since(args.since)
+        except ValueError as e:
+            print(f"Warning: {e}")
+            args.since = None
+    
     # Handle stats display
     if args.stats:
-        show_stats()
+        if args.group_by or args.where:
+            filters = dict(args.where or [])
+            if args.filter:
+                filters["category"] = args.filter
+            group_by = [dim.strip() for dim in (args.group_by or "").split(",") if dim.strip()]
+            show_stats_query(group_by, filters, since=args.since)
+        else:
+            show_stats(category=args.filter, since=args.since)
         return
     
     # Handle export (with optional filters)
     if args.export:
-        export_history(args.export, category=args.filter, since=args.since)
+        export_history(args.export, category=args.filter, since=args.since, output=args.output)
         return
     
     # Handle history display
     if args.history or args.show_rated:
-        display_history(show_rated_only=args.show_rated)
+        if args.search is not None:
+            display_history(args.limit, show_rated_only=args.show_rated, search=args.search,
+                            category=args.filter, since=args.since)
+        else:
+            display_history(show_rated_only=args.show_rated)
+        return
+    
+    if args.search_corpus:
+        show_corpus_search(args.search_corpus, args.limit, args.theme)
         return
     
     # Handle theme-related commands (Iteration 9)
     if args.list_themes:
-        list_themes()
+        list_themes(verbose=args.verbose)
         return
     
     if args.add_theme:
@@ -2086,10 +6976,37 @@ def main():
         import_theme_from_file(args.import_theme)
         return
     
+    if args.import_themes:
+        import_themes_from_directory(args.import_themes)
+        return
+    
+    if args.serve_themes:
+        serve_theme_repository(args.port)
+        return
+    
+    if args.browse_themes is not None:
+        browse_themes(args.browse_themes or None, args.theme_repo)
+        return
+    
+    if args.install_theme:
+        names = [name.strip().lower() for name in args.install_theme.split(",") if name.strip()]
+        install_theme_names(names, args.theme_repo)
+        return
+    
     if args.export_theme:
         export_theme_to_json(args.export_theme)
         return
     
+    # Fill in anything not given as a flag from a plain-words request
+    if args.ask:
+        request = parse_request(args.ask)
+        args.theme = args.theme or request["theme"]
+        if args.category is None and request["category"] in ask_theme_categories().get(args.theme, PREDICTIONS):
+            args.category = request["category"]
+        args.smart = args.smart or request["mode"] == "smart"
+        args.time_aware = args.time_aware or request["mode"] == "time_aware"
+        args.preferred = args.preferred or request["mode"] == "preferred"
+    
     # Check for pending reminders before generating predictions
     display_pending_reminders()
     
@@ -2167,6 +7084,8 @@ def main():
         modes.append("⭐ Preference-weighted")
     if modes:
         print(f"  Mode: {', '.join(modes)}")
+    if args.ask:
+        print(f"  Understood: {describe_request(request)}")
     
     for i, result in enumerate(predictions, 1):
         if len(predictions) > 1:
@@ -2184,12 +7103,18 @@ def main():
         print(f"🌟 {result['prediction']}")
     
     # Handle reminder creation (Iteration 8)
-    if args.remind:
-        for pred in predictions:
-            reminder_date = args.remind if args.remind != "auto" else None
-            reminder = save_reminder(pred, reminder_date)
+    if args.remind or args.repeat:
+        reminder_date = args.remind if args.remind not in (None, "auto") else None
+        try:
+            reminders = save_reminders([(pred, reminder_date, args.repeat) for pred in predictions])
+        except ValueError as e:
+            print(f"\nError: {e}")
+            reminders = []
+        for reminder in reminders:
             print()
             print(f"⏰ Reminder #{reminder['reminder_id']} set for {reminder['remind_date']}")
+            if reminder.get("recurrence"):
+                print(f"   🔁 Repeats {describe_recurrence(reminder['recurrence'])}")
     
     print()
     print("-" * 50)
@@ -2199,26 +7124,123 @@ def main():
     print("Use --api to start the web frontend.")
 
 
-def create_api():
+def create_api(profile: bool = False, profile_sample_rate: float = 1.0,
+               profile_top: int = 25, profile_dir: str = None,
+               reminder_sinks: list = None):
     """
     Create and return a FastAPI application for the prediction API.
     
+    Args:
+        profile: If True, requests sent with an ``X-Profile: 1`` header or
+                 ``?profile=true`` may be profiled with cProfile.
+        profile_sample_rate: Fraction (0-1) of such requests that are
+                             actually profiled.
+        profile_top: Number of functions to report, by cumulative time.
+        profile_dir: If set, save a .pstats file per profiled request
+                     here instead of returning the summary as the body.
+        reminder_sinks: If given, run a ReminderDispatcher delivering due
+                        reminders to these sinks (objects or parse_sink specs).
+    
     Returns:
         FastAPI application instance.
     """
     try:
-        from fastapi import FastAPI, Query, HTTPException, Body
+        from fastapi import FastAPI, Query, HTTPException, Body, Request, Response, WebSocket, WebSocketDisconnect
         from fastapi.staticfiles import StaticFiles
-        from fastapi.responses import FileResponse
+        from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+        from fastapi.routing import APIRoute
         from pydantic import BaseModel
     except ImportError:
         raise ImportError("FastAPI is required for the API. Install with: pip install fastapi uvicorn")
     
+    dispatcher = None
+    if reminder_sinks:
+        dispatcher = ReminderDispatcher(
+            [parse_sink(sink) if isinstance(sink, str) else sink for sink in reminder_sinks]
+        )
+    
+    @asynccontextmanager
+    async def lifespan(app):
+        """Run the reminder dispatcher for as long as the server is up."""
+        if dispatcher is not None:
+            dispatcher.start()
+        try:
+            yield
+        finally:
+            if dispatcher is not None:
+                await dispatcher.stop()
+    
     api = FastAPI(
         title="The Future Predictor API",
         description="🔮 A playful prediction system that generates fortunes and predictions.",
         version="Iteration 10",
+        lifespan=lifespan,
     )
+    api.state.reminder_dispatcher = dispatcher
+    
+    if profile:
+        class ProfiledRoute(APIRoute):
+            """Route whose endpoint can be profiled per request."""
+            
+            def __init__(self, path, endpoint, **kwargs):
+                super().__init__(path, profile_endpoint(endpoint), **kwargs)
+        
+        api.router.route_class = ProfiledRoute
+        
+        @api.middleware("http")
+        async def profile_request(request: Request, call_next):
+            """Profile the request if asked to and selected by sampling."""
+            if not profile_requested(request.headers, request.query_params):
+                return await call_next(request)
+            if random.random() >= profile_sample_rate:
+                return await call_next(request)
+            
+            collected = []
+            token = _PROFILE_REQUEST.set(collected)
+            try:
+                response = await call_next(request)
+            finally:
+                _PROFILE_REQUEST.reset(token)
+            
+            route = getattr(request.scope.get("route"), "path", request.url.path)
+            if profile_dir:
+                if collected:
+                    out_dir = Path(profile_dir)
+                    out_dir.mkdir(parents=True, exist_ok=True)
+                    slug = re.sub(r"[^a-zA-Z0-9]+", "_", route).strip("_") or "root"
+                    out_file = out_dir / f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{slug}.pstats"
+                    stats = pstats.Stats(collected[0])
+                    for profiler in collected[1:]:
+                        stats.add(profiler)
+                    stats.dump_stats(str(out_file))
+                    response.headers["X-Profile-File"] = str(out_file)
+                return response
+            
+            body = b""
+            async for chunk in response.body_iterator:
+                body += chunk
+            try:
+                original = json.loads(body) if body else None
+            except ValueError:
+                original = body.decode("utf-8", errors="replace")
+            return JSONResponse({
+                "route": route,
+                "status_code": response.status_code,
+                "profile": summarize_profile(collected, profile_top),
+                "response": original,
+            })
+    
+    class FastJSONResponse(JSONResponse):
+        """
+        JSON response for payloads that are already well-formed.
+        
+        Returning an instance of this class from an endpoint skips
+        FastAPI's response_model validation and re-serialization, while
+        the declared response_model still documents the OpenAPI schema.
+        """
+        
+        def render(self, content) -> bytes:
+            return dump_json_bytes(content)
     
     class PredictionResponse(BaseModel):
         """Response model for predictions."""
@@ -2231,6 +7253,12 @@ def create_api():
         theme: str | None = None
         time_of_day: str | None = None
         day_type: str | None = None
+        mode: str | None = None
+    
+    def prediction_body(result: dict) -> dict:
+        # FastJSONResponse skips response_model filtering, and save_to_history
+        # adds bookkeeping fields (e.g. "ts") to the same dict
+        return {field: result[field] for field in PredictionResponse.model_fields if field in result}
     
     class HealthResponse(BaseModel):
         """Response model for health check."""
@@ -2243,6 +7271,17 @@ def create_api():
         prediction: str
         category: str
         remind_date: str
+        recurrence: str | None = None
+    
+    class ReminderBatchRequest(BaseModel):
+        """Request model for creating several reminders at once."""
+        reminders: list[ReminderRequest]
+    
+    class AcknowledgeRequest(BaseModel):
+        """Request model for acknowledging reminders in bulk."""
+        ids: list[int] = []
+        until: str | None = None
+        overdue: bool = False
     
     class ReminderResponse(BaseModel):
         """Response model for reminders."""
@@ -2254,6 +7293,17 @@ def create_api():
         created_at: str
         acknowledged: bool
         acknowledged_at: str | None = None
+        recurrence: dict | None = None
+        acknowledged_through: str | None = None
+    
+    class ThemeImportRequest(BaseModel):
+        """Request model for importing a directory of theme files."""
+        directory: str  # Relative to the server's import root
+    
+    class AskRequest(BaseModel):
+        """Request model for a plain-words prediction request."""
+        text: str
+        save: bool = True
     
     class FeedbackRequest(BaseModel):
         """Request model for prediction feedback."""
@@ -2265,12 +7315,42 @@ def create_api():
         success: bool
         message: str
     
+    @api.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        """Record request counts, latency and in-flight requests."""
+        METRICS.add_gauge("thefuture_http_requests_in_flight", 1)
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            METRICS.add_gauge("thefuture_http_requests_in_flight", -1)
+            # Label by route template rather than raw path to bound cardinality
+            route = request.scope.get("route")
+            labels = {
+                "method": request.method,
+                "route": getattr(route, "path", "unmatched"),
+                "status": str(status),
+            }
+            METRICS.inc("thefuture_http_requests_total", labels)
+            METRICS.observe("thefuture_http_request_duration_seconds", elapsed, labels)
+    
     @api.get("/", response_model=HealthResponse, tags=["Health"])
     def health_check():
         """Check if the API is running."""
         return {"status": "ok", "version": "Iteration 10"}
     
-    @api.get("/predict", response_model=PredictionResponse, tags=["Predictions"])
+    # Hot endpoints return FastJSONResponse: predict_the_future already builds
+    # a dict matching PredictionResponse, so pydantic validation is skipped.
+    @api.get(
+        "/predict",
+        response_model=PredictionResponse,
+        response_class=FastJSONResponse,
+        tags=["Predictions"],
+    )
     def get_prediction_endpoint(
         category: str = Query(None, description="Prediction category"),
         theme: str = Query(None, description="Prediction theme (e.g., zodiac, spring, motivational)"),
@@ -2288,11 +7368,11 @@ def create_api():
         - **save**: Whether to save the prediction to history (default: True)
         """
         # Validate theme - check both built-in and custom themes
-        all_themes = get_all_themes()
+        all_themes = theme_names()
         if theme and theme not in all_themes:
             raise HTTPException(
                 status_code=400,
-                detail=f"Unknown theme '{theme}'. Available: {', '.join(all_themes.keys())}"
+                detail=f"Unknown theme '{theme}'. Available: {', '.join(all_themes)}"
             )
         
         # Validate category
@@ -2311,10 +7391,34 @@ def create_api():
         
         if save:
             save_to_history(result)
+            LIVE_FEED.publish("prediction", result)
         
-        return result
+        return FastJSONResponse(prediction_body(result))
     
-    @api.get("/predict/batch", response_model=list[PredictionResponse], tags=["Predictions"])
+    @api.post("/ask", tags=["Predictions"])
+    def api_ask(request: AskRequest):
+        """
+        Generate a prediction from a plain-words request.
+        
+        For example "Give me a fortune about love" or "my horoscope for Leo".
+        Returns the interpretation (category, theme, mode and the keywords
+        recognised) and the prediction.
+        """
+        if not request.text.strip():
+            raise HTTPException(status_code=400, detail="Request text must not be empty")
+        parsed = parse_request(request.text)
+        result = predict_the_future(**request_options(parsed))
+        if request.save:
+            save_to_history(result)
+            LIVE_FEED.publish("prediction", result)
+        return FastJSONResponse({"request": parsed, "prediction": prediction_body(result)})
+    
+    @api.get(
+        "/predict/batch",
+        response_model=list[PredictionResponse],
+        response_class=FastJSONResponse,
+        tags=["Predictions"],
+    )
     def get_batch_predictions(
         count: int = Query(3, ge=1, le=100, description="Number of predictions to generate"),
         category: str = Query(None, description="Prediction category"),
@@ -2327,16 +7431,48 @@ def create_api():
             result = predict_the_future(category=category, theme=theme)
             if save:
                 save_to_history(result)
+                LIVE_FEED.publish("prediction", result)
             predictions.append(result)
-        return predictions
+        return FastJSONResponse([prediction_body(result) for result in predictions])
     
     @api.get("/themes", tags=["Information"])
-    def api_list_themes():
+    def api_list_themes(
+        stats: bool = Query(False, description="Include memory use of the themes loaded in this worker"),
+    ):
         """List all available prediction themes and their categories."""
-        all_themes = get_all_themes()
+        if stats:
+            return {"themes": get_theme_categories(), "stats": theme_memory_stats()}
+        return get_theme_categories()
+    
+    @api.post("/themes/import", tags=["Information"])
+    def api_import_themes(request: ThemeImportRequest):
+        """Import every JSON/JSONL theme file in a directory under the import root, committed in one write."""
+        try:
+            files = find_theme_files(resolve_theme_import_dir(request.directory))
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        except NotADirectoryError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        result = import_themes(files)
+        return {
+            "imported": [{**item, "file": Path(item["file"]).name} for item in result["imported"]],
+            "errors": [{**item, "file": Path(item["file"]).name} for item in result["errors"]],
+        }
+    
+    @api.get("/search", tags=["Information"])
+    def api_search(
+        q: str = Query(..., min_length=1, description="Words to search for"),
+        limit: int = Query(SEARCH_RESULT_LIMIT, ge=1, le=100, description="Maximum number of results"),
+        theme: str = Query(None, description="Only search this theme"),
+    ):
+        """Search every built-in and custom prediction by wording, best matches first."""
+        started = time.perf_counter()
+        results = search_corpus(q, limit, theme)
         return {
-            theme: list(categories.keys())
-            for theme, categories in all_themes.items()
+            "query": q,
+            "count": len(results),
+            "took_ms": round((time.perf_counter() - started) * 1000, 3),
+            "results": results,
         }
     
     @api.get("/categories", tags=["Information"])
@@ -2346,62 +7482,165 @@ def create_api():
     
     @api.get("/history", tags=["History"])
     def get_history(
-        count: int = Query(10, ge=1, le=100, description="Number of recent predictions"),
+        response: Response,
+        count: int = Query(10, ge=1, le=100, description="Number of predictions per page"),
         category: str = Query(None, description="Filter by category"),
         rated_only: bool = Query(False, description="Show only rated predictions"),
+        before_id: int = Query(None, description="Only predictions older than this ID"),
+        after_id: int = Query(None, description="Only predictions newer than this ID"),
+        cursor: str = Query(None, description="Opaque cursor from X-Next-Cursor or X-Prev-Cursor"),
+        q: str = Query(None, description="Search prediction text (results are ranked, not paged)"),
     ):
-        """Get prediction history."""
-        history = load_history()
+        """
+        Get prediction history, one page at a time.
         
-        if category:
-            history = [p for p in history if p.get("category", "").lower() == category.lower()]
+        Without paging parameters this returns the most recent predictions.
+        The X-Next-Cursor header (older page) and X-Prev-Cursor header
+        (newer page) can be passed back as `cursor`. With `q`, returns up to
+        `count` predictions matching the search terms, best first, each with
+        a relevance `score`; search results are not paged, so `q` cannot be
+        combined with `before_id`, `after_id` or `cursor`.
+        """
+        if q is not None:
+            if before_id is not None or after_id is not None or cursor:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Search results are ranked, not paged; q cannot be combined with before_id, after_id or cursor.",
+                )
+            return search_history(q, limit=count, category=category, rated_only=rated_only)
+        
+        if cursor:
+            try:
+                direction, cursor_id = decode_history_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if direction == "before":
+                before_id = cursor_id
+            else:
+                after_id = cursor_id
         
-        if rated_only:
-            history = [p for p in history if p.get("rating") is not None]
+        page = get_history_page(
+            limit=count,
+            before_id=before_id,
+            after_id=after_id,
+            category=category,
+            rated_only=rated_only,
+        )
         
-        return history[-count:]
+        if page["next_cursor"]:
+            response.headers["X-Next-Cursor"] = page["next_cursor"]
+        if page["prev_cursor"]:
+            response.headers["X-Prev-Cursor"] = page["prev_cursor"]
+        return page["items"]
+    
+    @api.get("/export", tags=["History"])
+    def api_export(
+        format: str = Query("json", description="Export format (csv, json, markdown)"),
+        category: str = Query(None, description="Filter by category"),
+        since: str = Query(None, description="Only predictions generated since this ISO date"),
+    ):
+        """Stream the prediction history as CSV, JSON or Markdown."""
+        if format not in EXPORT_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown export format '{format}'. Available: {', '.join(EXPORT_MEDIA_TYPES)}"
+            )
+        # Checked up front: once streaming has started the status is sent
+        try:
+            _parse_since(since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        extension = "md" if format == "markdown" else format
+        return StreamingResponse(
+            iter_export(format, category=category, since=since),
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={"Content-Disposition": f'attachment; filename="thefuture-history.{extension}"'},
+        )
     
     @api.get("/stats", tags=["History"])
-    def get_stats():
-        """Get prediction statistics."""
-        history = load_history()
+    def get_stats(
+        category: str = Query(None, description="Filter by category"),
+        since: str = Query(None, description="Only predictions since this date (ISO format)"),
+    ):
+        """Get prediction statistics (served from the materialized aggregates)."""
+        try:
+            stats = filtered_history_stats(category, since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        if not history:
+        if not stats["total"]:
             return {"total_predictions": 0, "categories": {}, "ratings": {}}
         
-        # Count by category
-        category_counts = {}
-        for pred in history:
-            cat = pred.get("category", "unknown")
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-        
-        # Rating stats
-        rated = [p for p in history if p.get("rating") is not None]
         rating_stats = {}
-        if rated:
+        if stats["rating_count"]:
             rating_stats = {
-                "count": len(rated),
-                "average": round(sum(p["rating"] for p in rated) / len(rated), 2),
+                "count": stats["rating_count"],
+                "average": round(stats["rating_sum"] / stats["rating_count"], 2),
+                "distribution": {str(r): stats["ratings"].get(str(r), 0) for r in range(1, 6)},
             }
         
-        return {
-            "total_predictions": len(history),
-            "categories": category_counts,
+        result = {
+            "total_predictions": stats["total"],
+            "categories": stats["categories"],
             "ratings": rating_stats,
+            "first_generated_at": stats["first_generated_at"],
+            "last_generated_at": stats["last_generated_at"],
+        }
+        if not category and not since:
+            result["approximate"] = sketch_summary()
+        return result
+    
+    @api.get("/stats/query", tags=["History"])
+    def get_stats_query(
+        group_by: str = Query("category", description="Comma-separated dimensions to group by"),
+        category: str = Query(None, description="Filter by category"),
+        theme: str = Query(None, description="Filter by theme"),
+        mode: str = Query(None, description="Filter by generation mode"),
+        time_of_day: str = Query(None, description="Filter by time of day"),
+        day_type: str = Query(None, description="Filter by day type"),
+        since: str = Query(None, description="Only predictions since this date (ISO format)"),
+    ):
+        """Get prediction counts and average ratings grouped by any combination of dimensions."""
+        dimensions = [dim.strip() for dim in group_by.split(",") if dim.strip()]
+        filters = {
+            "category": category,
+            "theme": theme,
+            "mode": mode,
+            "time_of_day": time_of_day,
+            "day_type": day_type,
         }
+        try:
+            groups = query_stats(dimensions, filters, since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"group_by": dimensions, "groups": groups}
+    
+    @api.get("/stats/timeseries", tags=["History"])
+    def get_stats_timeseries(
+        bucket: str = Query("day", description="Bucket size (hour, day, week)"),
+        from_: str = Query(None, alias="from", description="Start date (ISO format)"),
+        to: str = Query(None, description="End date (ISO format)"),
+    ):
+        """Get prediction and rating trends from the time-bucketed rollups."""
+        try:
+            series = get_timeseries(bucket, start=from_, end=to)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"bucket": bucket, "series": series}
     
     # Reminder endpoints (Iteration 10)
     @api.get("/reminders", response_model=list[ReminderResponse], tags=["Reminders"])
     def api_get_reminders(
         show_all: bool = Query(False, description="Include acknowledged reminders"),
+        from_: str = Query(None, alias="from", description="First due date (ISO format)"),
+        to: str = Query(None, description="Last due date (ISO format)"),
+        status: str = Query(None, description="pending, acknowledged or all (overrides show_all)"),
     ):
-        """Get all reminders."""
-        reminders = load_reminders()
-        
-        if not show_all:
-            reminders = [r for r in reminders if not r.get("acknowledged", False)]
-        
-        return reminders
+        """Get reminders in due-date order, optionally within a date range."""
+        try:
+            return query_reminders(from_, to, status or ("all" if show_all else "pending"))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     
     @api.post("/reminders", response_model=ReminderResponse, tags=["Reminders"])
     def api_create_reminder(request: ReminderRequest):
@@ -2413,28 +7652,65 @@ def create_api():
             "applies_to": "",  # Not used when remind_date is provided
         }
         
-        reminder = save_reminder(prediction, request.remind_date)
+        try:
+            reminder = save_reminder(prediction, request.remind_date, request.recurrence)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        LIVE_FEED.publish("reminder_created", reminder)
         return reminder
     
+    @api.post("/reminders/batch", response_model=list[ReminderResponse], tags=["Reminders"])
+    def api_create_reminders(request: ReminderBatchRequest):
+        """Create several reminders in a single write."""
+        try:
+            reminders = save_reminders([
+                (
+                    {"id": item.prediction_id, "prediction": item.prediction, "category": item.category},
+                    item.remind_date,
+                    item.recurrence,
+                )
+                for item in request.reminders
+            ])
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        for reminder in reminders:
+            LIVE_FEED.publish("reminder_created", reminder)
+        return reminders
+    
+    @api.post("/reminders/acknowledge", tags=["Reminders"])
+    def api_acknowledge_reminders(request: AcknowledgeRequest):
+        """Acknowledge reminders by ID, due date (until) and/or all overdue ones in a single write."""
+        try:
+            until = normalize_reminder_date(request.until)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if request.overdue:
+            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+            until = min(until, yesterday) if until else yesterday
+        try:
+            result = acknowledge_reminders(request.ids, until)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        for reminder in result["acknowledged"]:
+            LIVE_FEED.publish("reminder_acknowledged", reminder)
+        return {
+            "acknowledged": [r["reminder_id"] for r in result["acknowledged"]],
+            "already_acknowledged": result["already_acknowledged"],
+            "not_found": result["not_found"],
+        }
+    
     @api.post("/reminders/{reminder_id}/acknowledge", tags=["Reminders"])
     def api_acknowledge_reminder(reminder_id: int):
         """Acknowledge (dismiss) a reminder."""
-        reminders = load_reminders()
-        
-        for reminder in reminders:
-            if reminder.get("reminder_id") == reminder_id:
-                if reminder.get("acknowledged", False):
-                    raise HTTPException(status_code=400, detail="Reminder already acknowledged")
-                
-                reminder["acknowledged"] = True
-                reminder["acknowledged_at"] = datetime.now().isoformat()
-                
-                with open(REMINDERS_FILE, "w") as f:
-                    json.dump(reminders, f, indent=2)
-                
-                return {"success": True, "message": f"Reminder {reminder_id} acknowledged"}
+        result = acknowledge_reminders([reminder_id])
+        if result["not_found"]:
+            raise HTTPException(status_code=404, detail=f"Reminder {reminder_id} not found")
+        if result["already_acknowledged"]:
+            raise HTTPException(status_code=400, detail="Reminder already acknowledged")
         
-        raise HTTPException(status_code=404, detail=f"Reminder {reminder_id} not found")
+        LIVE_FEED.publish("reminder_acknowledged", result["acknowledged"][0])
+        return {"success": True, "message": f"Reminder {reminder_id} acknowledged"}
     
     # Feedback endpoint (Iteration 10)
     @api.post("/feedback", response_model=FeedbackResponse, tags=["Feedback"])
@@ -2443,19 +7719,59 @@ def create_api():
         if request.rating < 1 or request.rating > 5:
             raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
         
-        history = load_history()
+        result = rate_prediction(request.prediction_id, request.rating)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Prediction {request.prediction_id} not found")
         
-        for pred in history:
-            if pred.get("id") == request.prediction_id:
-                pred["rating"] = request.rating
-                pred["rated_at"] = datetime.now().isoformat()
-                
-                with open(HISTORY_FILE, "w") as f:
-                    json.dump(history, f, indent=2)
-                
-                return {"success": True, "message": f"Rated prediction {request.prediction_id} with {request.rating}/5 stars"}
+        pred, previous_rating = result
+        LIVE_FEED.publish("rating", {
+            "id": pred["id"],
+            "category": pred.get("category", "unknown"),
+            "rating": pred["rating"],
+            "previous_rating": previous_rating,
+            "rated_at": pred["rated_at"],
+        })
+        return {"success": True, "message": f"Rated prediction {request.prediction_id} with {request.rating}/5 stars"}
+    
+    # Live feed (Iteration 11)
+    @api.websocket("/ws")
+    async def live_feed(websocket: WebSocket):
+        """Push prediction, rating and reminder events to the browser."""
+        await websocket.accept()
+        queue = LIVE_FEED.subscribe()
         
-        raise HTTPException(status_code=404, detail=f"Prediction {request.prediction_id} not found")
+        async def forward_events():
+            while True:
+                event = await queue.get()
+                await websocket.send_text(dump_json_bytes(event).decode("utf-8"))
+        
+        async def wait_for_disconnect():
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+        
+        tasks = {
+            asyncio.create_task(forward_events()),
+            asyncio.create_task(wait_for_disconnect()),
+        }
+        try:
+            await websocket.send_json({"type": "hello", "data": {"version": "Iteration 10"}})
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            LIVE_FEED.unsubscribe(queue)
+    
+    @api.get("/metrics", response_class=PlainTextResponse, tags=["Health"])
+    def api_metrics():
+        """Expose request, storage and cache metrics in Prometheus text format."""
+        return PlainTextResponse(
+            METRICS.render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
     
     # Static files and web frontend
     static_dir = Path(__file__).parent / "static"
@@ -2470,7 +7786,7 @@ def create_api():
     return api
 
 
-def start_api(port: int = 8000):
+def start_api(port: int = 8000, **api_options):
     """
     Start the FastAPI server.
     
@@ -2480,6 +7796,7 @@ def start_api(port: int = 8000):
     
     Args:
         port: Port to run the server on (default: 8000).
+        **api_options: Keyword arguments passed to create_api().
     """
     try:
         import uvicorn
@@ -2488,7 +7805,7 @@ def start_api(port: int = 8000):
         print("Install with: pip install uvicorn")
         return
     
-    api = create_api()
+    api = create_api(**api_options)
     print(f"🔮 Starting The Future Predictor API on http://localhost:{port}")
     print(f"📱 Web Frontend: http://localhost:{port}/app")
     print(f"📚 API Docs: http://localhost:{port}/docs")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+Benchmarks for The Future Predictor.
+
+Run with: python bench.py
+"""
+
+import json
+import shutil
+import tempfile
+import timeit
+from pathlib import Path
+from unittest.mock import patch
+
+import app
+
+
+def _best_of(func, number: int, repeat: int = 5) -> float:
+    """Return the best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def _endpoint_payloads() -> dict:
+    """Build representative payloads for the hot prediction endpoints."""
+    single = app.predict_the_future(smart=True)
+    single["id"] = 1
+    batch = []
+    for i in range(100):
+        pred = app.predict_the_future(theme="zodiac")
+        pred["id"] = i + 1
+        batch.append(pred)
+    return {"/predict": single, "/predict/batch": batch}
+
+
+def _pydantic_serializers() -> dict:
+    """
+    Build the validate-and-serialize path FastAPI used for each endpoint.
+
+    Returns:
+        Mapping of endpoint path to a callable, or an empty dict if
+        FastAPI/pydantic are not installed.
+    """
+    try:
+        from pydantic import TypeAdapter
+        api = app.create_api()
+    except ImportError:
+        return {}
+
+    serializers = {}
+    for route in api.routes:
+        if getattr(route, "path", None) in ("/predict", "/predict/batch"):
+            adapter = TypeAdapter(route.response_model)
+
+            def serialize(payload, adapter=adapter):
+                validated = adapter.validate_python(payload)
+                data = adapter.dump_python(validated, mode="json")
+                return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+            serializers[route.path] = serialize
+    return serializers
+
+
+def bench_serialization(number: int = 2000) -> None:
+    """Compare pydantic response validation with the fast JSON path per endpoint."""
+    encoder = "orjson" if app.orjson is not None else "stdlib json"
+    print(f"Response serialization ({encoder} fast path)\n")
+
+    payloads = _endpoint_payloads()
+    serializers = _pydantic_serializers()
+    if not serializers:
+        print("  (FastAPI/pydantic not installed: timing the fast path only)\n")
+
+    for path, payload in payloads.items():
+        calls = number if path == "/predict" else max(number // 50, 10)
+        fast = _best_of(lambda: app.dump_json_bytes(payload), calls)
+        line = f"  {path:<16} fast: {fast:9.1f} us"
+        if path in serializers:
+            slow = _best_of(lambda: serializers[path](payload), calls)
+            line += f"   pydantic: {slow:9.1f} us   saved: {slow - fast:9.1f} us ({slow / fast:.1f}x)"
+        print(line)
+    print()
+
+
+def bench_history_filters(size: int = 5000, number: int = 20) -> None:
+    """Compare per-record predicate filtering with the columnar history view."""
+    backend = "NumPy" if app.np is not None else "pure Python"
+    print(f"History filtering over {size} records (columnar view: {backend})\n")
+
+    start = app.datetime(2025, 1, 1)
+    categories = list(app.PREDICTIONS)
+    history = [
+        {
+            "id": i + 1,
+            "prediction": f"Prediction {i}",
+            "category": categories[i % len(categories)],
+            "generated_at": (start + app.timedelta(minutes=7 * i)).isoformat(),
+            **({"rating": i % 5 + 1} if i % 3 == 0 else {}),
+        }
+        for i in range(size)
+    ]
+    since = (start + app.timedelta(minutes=7 * size // 2)).date().isoformat()
+
+    keep = app._history_predicate("fortune", since)
+    loop = _best_of(lambda: [p for p in history if keep(p)], number)
+    build = _best_of(lambda: app.HistoryColumns(history), max(number // 4, 1))
+    columns = app.HistoryColumns(history)
+    since_dt = app.datetime.fromisoformat(since)
+    vector = _best_of(lambda: columns.select(columns.mask(category="fortune", since=since_dt)), number)
+    summary = _best_of(lambda: columns.summarize(), number)
+    scan = _best_of(lambda: app.compute_history_stats(history), number)
+
+    print(f"  filter (predicate loop): {loop:10.1f} us")
+    print(f"  filter (cached columns): {vector:10.1f} us   ({loop / vector:.1f}x)")
+    print(f"  build columnar view:     {build:10.1f} us   (once per history write)")
+    print(f"  group-by (full scan):    {scan:10.1f} us")
+    print(f"  group-by (columns):      {summary:10.1f} us   ({scan / summary:.1f}x)")
+    print()
+
+
+def bench_corpus_search(number: int = 200) -> None:
+    """Compare a substring scan of every prediction with the corpus index."""
+    print("Corpus search (built-in predictions and themes)\n")
+
+    corpora = [app.PREDICTIONS, app.TIME_PREDICTIONS, app.DAY_PREDICTIONS, *app.THEMES.values()]
+    texts = [text for corpus in corpora for texts in corpus.values() for text in texts]
+    build = _best_of(lambda: app._CORPUS_INDEX.update(index=None) or app.get_corpus_index(), 5)
+    index = app.get_corpus_index()
+
+    scan = _best_of(lambda: [t for t in texts if "adventure" in t.lower() or "love" in t.lower()], number)
+    search = _best_of(lambda: index.search("adventure love"), number)
+
+    print(f"  documents:               {len(texts):10d}")
+    print(f"  build index:             {build:10.1f} us   (once per process)")
+    print(f"  substring scan:          {scan:10.1f} us   (unranked)")
+    print(f"  indexed BM25 search:     {search:10.1f} us   ({scan / search:.1f}x)")
+    print()
+
+
+def bench_ask_parser(number: int = 2000) -> None:
+    """Time plain-words request parsing and keyword automaton scaling."""
+    print("Plain-words request parsing (--ask, POST /ask)\n")
+
+    text = "Give me a smart fortune about love and my career for Scorpio this evening"
+    build = _best_of(lambda: app._ASK_AUTOMATON.update(automaton=None) or app.ask_automaton(), 5)
+    keywords = len(app.ask_automaton())
+    parse = _best_of(lambda: app.parse_request(text), number)
+
+    large = app.KeywordAutomaton()
+    for i in range(5000):
+        large.add(f"keyword{i}", i)
+    large.build()
+    scan = _best_of(lambda: large.find(text), number)
+
+    print(f"  compile automaton:       {build:10.1f} us   ({keywords} keywords, once per theme change)")
+    print(f"  parse request:           {parse:10.1f} us")
+    print(f"  scan (5000 keywords):    {scan:10.1f} us")
+    print()
+
+
+def bench_predict(number: int = 50) -> None:
+    """Time /predict's work: generating a prediction and saving it with its sidecars."""
+    print(f"/predict with a full history ({app.MAX_HISTORY} records)\n")
+
+    # Aggregate sidecar I/O done on every save, replaced by in-memory
+    # stand-ins for the history-only baseline
+    sidecar = {
+        "_read_history_sidecar": dict,
+        "load_history_stats": lambda *args: app._empty_history_stats(),
+        "load_rollups": lambda *args: {"version": 1, "buckets": {bucket: {} for bucket in app.ROLLUP_BUCKETS}},
+        "load_sketches": lambda *args: app._empty_sketches(),
+        "load_history_search_index": lambda *args, **kwargs: app.InvertedIndex(),
+        "_save_history_aggregates": lambda *args: None,
+    }
+    temp_dir = Path(tempfile.mkdtemp())
+    try:
+        with patch("app.HISTORY_DIR", temp_dir), patch("app.HISTORY_FILE", temp_dir / "history.json"):
+            for _ in range(app.MAX_HISTORY):
+                app.save_to_history(app.predict_the_future(smart=True))
+
+            generate = _best_of(lambda: app.predict_the_future(smart=True), number * 20)
+            save = _best_of(lambda: app.save_to_history(app.predict_the_future(smart=True)), number)
+            with patch.multiple("app", **sidecar):
+                history_only = _best_of(lambda: app.save_to_history(app.predict_the_future(smart=True)), number)
+            sizes = {path.name: path.stat().st_size for path in temp_dir.glob("*.json") if path.name != "history.json"}
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"  generate prediction:     {generate:10.1f} us")
+    print(f"  save (history only):     {history_only:10.1f} us")
+    print(f"  save (with aggregates):  {save:10.1f} us   (+{save - history_only:.1f} us, "
+          f"{len(sizes)} sidecar file(s), {sum(sizes.values()) / 1024:.1f} KB)")
+    print()
+
+
+def main():
+    """Run all benchmarks."""
+    bench_serialization()
+    bench_history_filters()
+    bench_corpus_search()
+    bench_ask_parser()
+    bench_predict()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 /**
  * The Future Predictor - Web Frontend JavaScript
- * Iteration 10
+ * Iteration 10 (live updates added in Iteration 11)
  */
 
 // API Base URL
@@ -8,6 +8,12 @@ const API_BASE = '';
 
 // State
 let currentPrediction = null;
+let statsState = null;
+let trendState = null;
+const TREND_DAYS = 14;
+let liveFeed = null;
+let liveFeedRetryDelay = 1000;
+let historyCursor = null;
 
 // DOM Elements
 const elements = {
@@ -21,6 +27,7 @@ const elements = {
     predictBtn: document.getElementById('predict-btn'),
     predictionResult: document.getElementById('prediction-result'),
     historyList: document.getElementById('history-list'),
+    loadOlderHistory: document.getElementById('load-older-history'),
     historyCategoryFilter: document.getElementById('history-category-filter'),
     ratedOnly: document.getElementById('rated-only'),
     refreshHistory: document.getElementById('refresh-history'),
@@ -50,8 +57,142 @@ document.addEventListener('DOMContentLoaded', () => {
     loadReminders();
     initEventListeners();
     setDefaultReminderDate();
+    connectLiveFeed();
 });
 
+// Live Feed
+// The server pushes incremental events over /ws; views are patched in place
+// instead of re-fetching whole lists. Without a connection we fall back to
+// fetching on demand.
+function isLive() {
+    return liveFeed !== null && liveFeed.readyState === WebSocket.OPEN;
+}
+
+function connectLiveFeed() {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const socket = new WebSocket(`${protocol}//${window.location.host}${API_BASE}/ws`);
+    let wasDisconnected = liveFeed !== null;
+
+    socket.addEventListener('open', () => {
+        liveFeedRetryDelay = 1000;
+        // Anything may have changed while we were disconnected
+        if (wasDisconnected) resyncAll();
+    });
+
+    socket.addEventListener('message', (e) => {
+        try {
+            handleLiveEvent(JSON.parse(e.data));
+        } catch (error) {
+            console.error('Bad live event:', error);
+        }
+    });
+
+    socket.addEventListener('close', () => {
+        setTimeout(connectLiveFeed, liveFeedRetryDelay);
+        liveFeedRetryDelay = Math.min(liveFeedRetryDelay * 2, 30000);
+    });
+
+    liveFeed = socket;
+}
+
+function handleLiveEvent(event) {
+    switch (event.type) {
+        case 'prediction':
+            applyPredictionEvent(event.data);
+            break;
+        case 'rating':
+            applyRatingEvent(event.data);
+            break;
+        case 'reminder_created':
+            applyReminderCreated(event.data);
+            break;
+        case 'reminder_acknowledged':
+            applyReminderAcknowledged(event.data);
+            break;
+        case 'reminder_due':
+            applyRemindersDue(event.data.reminders);
+            break;
+        case 'resync':
+            resyncAll();
+            break;
+    }
+}
+
+function resyncAll() {
+    loadHistory();
+    loadStats();
+    loadReminders();
+}
+
+function applyPredictionEvent(pred) {
+    const category = elements.historyCategoryFilter.value;
+    const matchesFilter = !elements.ratedOnly.checked && (!category || pred.category === category);
+    if (matchesFilter) {
+        const empty = elements.historyList.querySelector('.empty-state');
+        if (empty) empty.remove();
+        elements.historyList.insertAdjacentHTML('afterbegin', renderHistoryItem(pred));
+    }
+
+    if (statsState) {
+        const cat = pred.category || 'unknown';
+        statsState.total_predictions += 1;
+        statsState.categories[cat] = (statsState.categories[cat] || 0) + 1;
+        if (trendState) bumpTrend(pred.generated_at);
+        renderStats(statsState);
+    }
+}
+
+function applyRatingEvent(data) {
+    const item = elements.historyList.querySelector(`.history-item[data-id="${data.id}"]`);
+    if (item) {
+        const rateBtn = item.querySelector('.rate-btn, .rating');
+        if (rateBtn) rateBtn.outerHTML = `<span class="rating">★ ${data.rating}/5</span>`;
+    }
+
+    if (statsState) {
+        const ratings = statsState.ratings || {};
+        let count = ratings.count || 0;
+        let sum = (ratings.average || 0) * count;
+        if (data.previous_rating === null || data.previous_rating === undefined) {
+            count += 1;
+        } else {
+            sum -= data.previous_rating;
+        }
+        sum += data.rating;
+        statsState.ratings = { count, average: Math.round((sum / count) * 100) / 100 };
+        renderStats(statsState);
+    }
+}
+
+function applyReminderCreated(reminder) {
+    const empty = elements.remindersList.querySelector('.empty-state');
+    if (empty) empty.remove();
+    elements.remindersList.insertAdjacentHTML('beforeend', renderReminderItem(reminder));
+}
+
+function applyReminderAcknowledged(reminder) {
+    const item = elements.remindersList.querySelector(`.reminder-item[data-id="${reminder.reminder_id}"]`);
+    if (!item) return;
+    if (elements.showAllReminders.checked) {
+        item.outerHTML = renderReminderItem(reminder);
+    } else {
+        item.remove();
+        if (!elements.remindersList.querySelector('.reminder-item')) {
+            elements.remindersList.innerHTML = '<p class="empty-state">No reminders found</p>';
+        }
+    }
+}
+
+function applyRemindersDue(reminders) {
+    reminders.forEach(reminder => {
+        const item = elements.remindersList.querySelector(`.reminder-item[data-id="${reminder.reminder_id}"]`);
+        if (item) item.outerHTML = renderReminderItem(reminder);
+        if ('Notification' in window && Notification.permission === 'granted') {
+            new Notification('⏰ Prediction reminder', { body: reminder.prediction });
+        }
+    });
+}
+
 // Tab Navigation
 function initTabs() {
     elements.tabs.forEach(tab => {
@@ -70,10 +211,12 @@ function initTabs() {
                 }
             });
 
-            // Refresh data when switching tabs
+            // Refresh data when switching tabs (the live feed keeps
+            // history, stats and reminders current while connected)
+            if (tabId === 'themes') loadThemes();
+            if (isLive()) return;
             if (tabId === 'history') loadHistory();
             if (tabId === 'stats') loadStats();
-            if (tabId === 'themes') loadThemes();
             if (tabId === 'reminders') loadReminders();
         });
     });
@@ -88,6 +231,7 @@ function initEventListeners() {
     elements.refreshHistory.addEventListener('click', loadHistory);
     elements.historyCategoryFilter.addEventListener('change', loadHistory);
     elements.ratedOnly.addEventListener('change', loadHistory);
+    elements.loadOlderHistory.addEventListener('click', loadOlderHistory);
 
     // Themes
     elements.refreshThemes.addEventListener('click', loadThemes);
@@ -236,7 +380,7 @@ function displayPrediction(prediction) {
 }
 
 // Load History
-async function loadHistory() {
+function historyParams() {
     const category = elements.historyCategoryFilter.value;
     const ratedOnly = elements.ratedOnly.checked;
 
@@ -244,86 +388,167 @@ async function loadHistory() {
     params.append('count', '50');
     if (category) params.append('category', category);
     if (ratedOnly) params.append('rated_only', 'true');
+    return params;
+}
 
+function updateHistoryCursor(response) {
+    // X-Next-Cursor points at the next (older) page, if there is one
+    historyCursor = response.headers.get('X-Next-Cursor');
+    elements.loadOlderHistory.classList.toggle('hidden', !historyCursor);
+}
+
+async function loadHistory() {
     try {
-        const response = await fetch(`${API_BASE}/history?${params}`);
+        const response = await fetch(`${API_BASE}/history?${historyParams()}`);
         const history = await response.json();
+        updateHistoryCursor(response);
 
         if (history.length === 0) {
             elements.historyList.innerHTML = '<p class="empty-state">No predictions found</p>';
             return;
         }
 
-        elements.historyList.innerHTML = history.reverse().map(pred => `
-            <div class="history-item">
-                <div class="prediction-text">${pred.prediction}</div>
-                <div class="meta">
-                    <span>ID: ${pred.id || 'N/A'}</span>
-                    <span>Category: ${capitalize(pred.category || 'unknown')}</span>
-                    ${pred.rating ? `<span class="rating">★ ${pred.rating}/5</span>` : `<button class="rate-btn" data-id="${pred.id}">Rate</button>`}
-                    ${pred.generated_at ? `<span>${formatDate(pred.generated_at)}</span>` : ''}
-                </div>
-            </div>
-        `).join('');
+        elements.historyList.innerHTML = history.reverse().map(renderHistoryItem).join('');
     } catch (error) {
         console.error('Failed to load history:', error);
         elements.historyList.innerHTML = '<p class="empty-state">Failed to load history</p>';
     }
 }
 
+async function loadOlderHistory() {
+    if (!historyCursor) return;
+
+    const params = historyParams();
+    params.append('cursor', historyCursor);
+
+    try {
+        const response = await fetch(`${API_BASE}/history?${params}`);
+        const history = await response.json();
+        updateHistoryCursor(response);
+        elements.historyList.insertAdjacentHTML('beforeend', history.reverse().map(renderHistoryItem).join(''));
+    } catch (error) {
+        console.error('Failed to load older history:', error);
+    }
+}
+
+function renderHistoryItem(pred) {
+    return `
+        <div class="history-item" data-id="${pred.id}">
+            <div class="prediction-text">${pred.prediction}</div>
+            <div class="meta">
+                <span>ID: ${pred.id || 'N/A'}</span>
+                <span>Category: ${capitalize(pred.category || 'unknown')}</span>
+                ${pred.rating ? `<span class="rating">★ ${pred.rating}/5</span>` : `<button class="rate-btn" data-id="${pred.id}">Rate</button>`}
+                ${pred.generated_at ? `<span>${formatDate(pred.generated_at)}</span>` : ''}
+            </div>
+        </div>
+    `;
+}
+
 // Load Stats
 async function loadStats() {
     try {
-        const response = await fetch(`${API_BASE}/stats`);
-        const stats = await response.json();
+        const since = new Date(Date.now() - (TREND_DAYS - 1) * 86400000);
+        const [response, trendResponse] = await Promise.all([
+            fetch(`${API_BASE}/stats`),
+            fetch(`${API_BASE}/stats/timeseries?bucket=day&from=${dayKey(since)}`),
+        ]);
+        statsState = await response.json();
+        trendState = trendResponse.ok ? (await trendResponse.json()).series : null;
+        renderStats(statsState);
+    } catch (error) {
+        console.error('Failed to load stats:', error);
+        elements.statsContent.innerHTML = '<p class="empty-state">Failed to load stats</p>';
+    }
+}
 
-        if (stats.total_predictions === 0) {
-            elements.statsContent.innerHTML = '<p class="empty-state">No predictions yet. Start predicting!</p>';
-            return;
-        }
+// Local YYYY-MM-DD, matching the server's day buckets
+function dayKey(date) {
+    const pad = (n) => String(n).padStart(2, '0');
+    return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`;
+}
+
+function bumpTrend(generatedAt) {
+    const key = dayKey(generatedAt ? new Date(generatedAt) : new Date());
+    const bucket = trendState.find((b) => b.bucket === key);
+    if (bucket) {
+        bucket.predictions += 1;
+    } else {
+        trendState.push({ bucket: key, predictions: 1 });
+    }
+}
+
+function renderTrend(series) {
+    const counts = Object.fromEntries(series.map((b) => [b.bucket, b.predictions]));
+    const days = [];
+    for (let i = TREND_DAYS - 1; i >= 0; i--) {
+        const key = dayKey(new Date(Date.now() - i * 86400000));
+        days.push([key, counts[key] || 0]);
+    }
+    const maxCount = Math.max(1, ...days.map(([, count]) => count));
+    return `
+        <div class="stat-card trend-chart">
+            <h3>Predictions per Day (last ${TREND_DAYS} days)</h3>
+            <div class="trend-bars">
+                ${days.map(([key, count]) => `
+                    <div class="trend-bar" title="${key}: ${count}">
+                        <div class="trend-bar-fill" style="height: ${(count / maxCount) * 100}%"></div>
+                        <span class="trend-label">${key.slice(5)}</span>
+                    </div>
+                `).join('')}
+            </div>
+        </div>
+    `;
+}
+
+function renderStats(stats) {
+    if (stats.total_predictions === 0) {
+        elements.statsContent.innerHTML = '<p class="empty-state">No predictions yet. Start predicting!</p>';
+        return;
+    }
+
+    let html = `
+        <div class="stat-card">
+            <h3>Total Predictions</h3>
+            <div class="stat-value">${stats.total_predictions}</div>
+        </div>
+    `;
 
-        let html = `
+    if (stats.ratings && stats.ratings.count) {
+        html += `
             <div class="stat-card">
-                <h3>Total Predictions</h3>
-                <div class="stat-value">${stats.total_predictions}</div>
+                <h3>Rated Predictions</h3>
+                <div class="stat-value">${stats.ratings.count}</div>
+                <div class="stat-detail">Avg: ★ ${stats.ratings.average}/5</div>
             </div>
         `;
+    }
 
-        if (stats.ratings && stats.ratings.count) {
-            html += `
-                <div class="stat-card">
-                    <h3>Rated Predictions</h3>
-                    <div class="stat-value">${stats.ratings.count}</div>
-                    <div class="stat-detail">Avg: ★ ${stats.ratings.average}/5</div>
-                </div>
-            `;
-        }
-
-        if (stats.categories && Object.keys(stats.categories).length > 0) {
-            const maxCount = Math.max(...Object.values(stats.categories));
-            html += `
-                <div class="stat-card category-breakdown">
-                    <h3>Predictions by Category</h3>
-                    ${Object.entries(stats.categories)
-                        .sort((a, b) => b[1] - a[1])
-                        .map(([cat, count]) => `
-                            <div class="category-bar">
-                                <span class="label">${capitalize(cat)}</span>
-                                <div class="bar">
-                                    <div class="bar-fill" style="width: ${(count / maxCount) * 100}%"></div>
-                                </div>
-                                <span class="count">${count}</span>
+    if (stats.categories && Object.keys(stats.categories).length > 0) {
+        const maxCount = Math.max(...Object.values(stats.categories));
+        html += `
+            <div class="stat-card category-breakdown">
+                <h3>Predictions by Category</h3>
+                ${Object.entries(stats.categories)
+                    .sort((a, b) => b[1] - a[1])
+                    .map(([cat, count]) => `
+                        <div class="category-bar">
+                            <span class="label">${capitalize(cat)}</span>
+                            <div class="bar">
+                                <div class="bar-fill" style="width: ${(count / maxCount) * 100}%"></div>
                             </div>
-                        `).join('')}
-                </div>
-            `;
-        }
+                            <span class="count">${count}</span>
+                        </div>
+                    `).join('')}
+            </div>
+        `;
+    }
 
-        elements.statsContent.innerHTML = html;
-    } catch (error) {
-        console.error('Failed to load stats:', error);
-        elements.statsContent.innerHTML = '<p class="empty-state">Failed to load stats</p>';
+    if (trendState) {
+        html += renderTrend(trendState);
     }
+
+    elements.statsContent.innerHTML = html;
 }
 
 // Load Reminders
@@ -339,43 +564,44 @@ async function loadReminders() {
             return;
         }
 
-        const today = new Date().toISOString().split('T')[0];
-
-        elements.remindersList.innerHTML = reminders.map(reminder => {
-            let statusClass = '';
-            let statusText = '';
-            
-            if (reminder.acknowledged) {
-                statusClass = 'acknowledged';
-                statusText = '✅ Done';
-            } else if (reminder.remind_date < today) {
-                statusClass = 'overdue';
-                statusText = '⚠️ Overdue';
-            } else if (reminder.remind_date === today) {
-                statusClass = 'today';
-                statusText = '📅 Today';
-            } else {
-                statusText = `🗓️ ${reminder.remind_date}`;
-            }
-
-            return `
-                <div class="reminder-item ${statusClass}">
-                    <span class="status">${statusText}</span>
-                    <div class="prediction-text">🔮 ${reminder.prediction}</div>
-                    <div class="meta">
-                        Category: ${capitalize(reminder.category || 'unknown')} | 
-                        Reminder ID: ${reminder.reminder_id}
-                    </div>
-                    ${!reminder.acknowledged ? `<button class="acknowledge-btn" data-id="${reminder.reminder_id}">✓ Acknowledge</button>` : ''}
-                </div>
-            `;
-        }).join('');
+        elements.remindersList.innerHTML = reminders.map(renderReminderItem).join('');
     } catch (error) {
         console.error('Failed to load reminders:', error);
         elements.remindersList.innerHTML = '<p class="empty-state">Failed to load reminders</p>';
     }
 }
 
+function renderReminderItem(reminder) {
+    const today = new Date().toISOString().split('T')[0];
+    let statusClass = '';
+    let statusText = '';
+
+    if (reminder.acknowledged) {
+        statusClass = 'acknowledged';
+        statusText = '✅ Done';
+    } else if (reminder.remind_date < today) {
+        statusClass = 'overdue';
+        statusText = '⚠️ Overdue';
+    } else if (reminder.remind_date === today) {
+        statusClass = 'today';
+        statusText = '📅 Today';
+    } else {
+        statusText = `🗓️ ${reminder.remind_date}`;
+    }
+
+    return `
+        <div class="reminder-item ${statusClass}" data-id="${reminder.reminder_id}">
+            <span class="status">${statusText}</span>
+            <div class="prediction-text">🔮 ${reminder.prediction}</div>
+            <div class="meta">
+                ${reminder.recurrence ? '🔁 Recurring | ' : ''}Category: ${capitalize(reminder.category || 'unknown')} | 
+                Reminder ID: ${reminder.reminder_id}
+            </div>
+            ${!reminder.acknowledged ? `<button class="acknowledge-btn" data-id="${reminder.reminder_id}">✓ Acknowledge</button>` : ''}
+        </div>
+    `;
+}
+
 // Save Reminder
 async function saveReminder() {
     if (!currentPrediction) {
@@ -404,7 +630,7 @@ async function saveReminder() {
         if (response.ok) {
             alert('Reminder saved!');
             elements.reminderModal.classList.add('hidden');
-            loadReminders();
+            if (!isLive()) loadReminders();
         } else {
             const error = await response.json();
             alert(`Failed to save reminder: ${error.detail}`);
@@ -423,7 +649,7 @@ async function acknowledgeReminder(reminderId) {
         });
 
         if (response.ok) {
-            loadReminders();
+            if (!isLive()) loadReminders();
         } else {
             const error = await response.json();
             alert(`Failed to acknowledge: ${error.detail}`);
@@ -456,8 +682,10 @@ async function ratePrediction(predictionId) {
         });
 
         if (response.ok) {
-            loadHistory();
-            loadStats();
+            if (!isLive()) {
+                loadHistory();
+                loadStats();
+            }
         } else {
             const error = await response.json();
             alert(`Failed to rate: ${error.detail}`);
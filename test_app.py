@@ -1605,5 +1605,2557 @@ class TestIteration10Integration(unittest.TestCase):
             self.skipTest("FastAPI, Starlette, or httpx not installed")
 
 
+class TestFastJSONResponses(unittest.TestCase):
+    """Tests for the fast JSON serialization path."""
+
+    def test_dump_json_bytes_roundtrip(self):
+        """dump_json_bytes should produce compact JSON that parses back."""
+        from app import dump_json_bytes
+        result = predict_the_future(theme="spooky")
+        encoded = dump_json_bytes(result)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(json.loads(encoded), result)
+
+    def test_dump_json_bytes_stdlib_fallback(self):
+        """Without orjson, output should match compact stdlib JSON."""
+        from app import dump_json_bytes
+        content = [{"prediction": "Embrace imperfection—it leads to discovery.", "id": 1}]
+        with patch("app.orjson", None):
+            encoded = dump_json_bytes(content)
+        self.assertEqual(
+            encoded,
+            json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        )
+
+    def test_predict_keeps_response_schema(self):
+        """/predict should still declare its response model for OpenAPI."""
+        try:
+            api = create_api()
+        except ImportError:
+            self.skipTest("FastAPI not installed")
+        routes = {route.path: route for route in api.routes}
+        self.assertEqual(routes["/predict"].response_model.__name__, "PredictionResponse")
+        self.assertIn("/predict/batch", routes)
+
+    def test_saved_prediction_keys_match_schema(self):
+        """Saved predictions should not leak undeclared history fields like "ts"."""
+        try:
+            from fastapi.testclient import TestClient
+            api = create_api()
+            client = TestClient(api)
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        schema = set(api.openapi()["components"]["schemas"]["PredictionResponse"]["properties"])
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with patch("app.HISTORY_FILE", Path(temp_dir) / "history.json"), \
+                 patch("app.HISTORY_DIR", Path(temp_dir)):
+                single = client.get("/predict").json()
+                batch = client.get("/predict/batch?count=2").json()
+                asked = client.post("/ask", json={"text": "a fortune about love"}).json()["prediction"]
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        for body in [single, *batch, asked]:
+            self.assertIn("id", body)
+            self.assertLessEqual(set(body), schema)
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the built-in Prometheus metrics."""
+
+    def setUp(self):
+        """Set up a temporary directory and a fresh registry."""
+        from app import Metrics
+        self.temp_dir = tempfile.mkdtemp()
+        self.metrics = Metrics(buckets=(0.1, 1.0))
+        self.metrics.describe("requests_total", "counter", "Requests.")
+        self.metrics.describe("latency_seconds", "histogram", "Latency.")
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_counter_rendering(self):
+        """Counters should render with HELP, TYPE and labels."""
+        self.metrics.inc("requests_total", {"route": "/predict", "status": "200"})
+        self.metrics.inc("requests_total", {"route": "/predict", "status": "200"})
+        output = self.metrics.render()
+        self.assertIn("# TYPE requests_total counter", output)
+        self.assertIn('requests_total{route="/predict",status="200"} 2', output)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets should be cumulative with +Inf, sum and count."""
+        for value in (0.05, 0.5, 5.0):
+            self.metrics.observe("latency_seconds", value, {"route": "/stats"})
+        output = self.metrics.render()
+        self.assertIn('latency_seconds_bucket{route="/stats",le="0.1"} 1', output)
+        self.assertIn('latency_seconds_bucket{route="/stats",le="1.0"} 2', output)
+        self.assertIn('latency_seconds_bucket{route="/stats",le="+Inf"} 3', output)
+        self.assertIn('latency_seconds_count{route="/stats"} 3', output)
+
+    def test_cache_hit_ratio(self):
+        """Cache lookups should produce a hit ratio gauge."""
+        self.metrics.record_cache("themes", True)
+        self.metrics.record_cache("themes", True)
+        self.metrics.record_cache("themes", False)
+        self.metrics.record_cache("themes", True)
+        self.assertIn('thefuture_cache_hit_ratio{cache="themes"} 0.75', self.metrics.render())
+
+    def test_label_values_are_escaped(self):
+        """Quotes and newlines in label values should be escaped."""
+        self.metrics.inc("requests_total", {"route": 'a"b\nc'})
+        self.assertIn('route="a\\"b\\nc"', self.metrics.render())
+
+    def test_storage_operations_are_timed(self):
+        """Storage reads and writes should be recorded in the global registry."""
+        from app import METRICS
+        temp_file = Path(self.temp_dir) / "history.json"
+        METRICS.reset()
+        with patch("app.HISTORY_FILE", temp_file), \
+             patch("app.HISTORY_DIR", Path(self.temp_dir)):
+            save_to_history({"prediction": "Test", "category": "fortune"})
+            load_history()
+        output = METRICS.render()
+        self.assertIn('thefuture_storage_operation_duration_seconds_count{operation="save_to_history"} 1', output)
+        self.assertIn('thefuture_storage_operation_duration_seconds_count{operation="load_history"}', output)
+
+    def test_api_has_metrics_endpoint(self):
+        """API should expose /metrics."""
+        try:
+            api = create_api()
+        except ImportError:
+            self.skipTest("FastAPI not installed")
+        self.assertIn("/metrics", [route.path for route in api.routes])
+
+
+class TestRequestProfiling(unittest.TestCase):
+    """Tests for the per-request profiler."""
+
+    def test_profile_requested(self):
+        """Header or query parameter should request profiling."""
+        from app import profile_requested
+        self.assertTrue(profile_requested({"x-profile": "1"}, {}))
+        self.assertTrue(profile_requested({}, {"profile": "true"}))
+        self.assertFalse(profile_requested({}, {}))
+        self.assertFalse(profile_requested({"x-profile": "no"}, {}))
+
+    def test_endpoint_unprofiled_by_default(self):
+        """Wrapped endpoints should run normally outside profiled requests."""
+        from app import profile_endpoint, _PROFILE_REQUEST
+        wrapped = profile_endpoint(lambda category=None: category)
+        self.assertIsNone(_PROFILE_REQUEST.get())
+        self.assertEqual(wrapped(category="fortune"), "fortune")
+
+    def test_profiled_endpoint_collects_stats(self):
+        """A profiled request should report the endpoint in its top functions."""
+        from app import profile_endpoint, summarize_profile, _PROFILE_REQUEST
+
+        def predict_endpoint():
+            return [predict_the_future() for _ in range(20)]
+
+        wrapped = profile_endpoint(predict_endpoint)
+        collected = []
+        token = _PROFILE_REQUEST.set(collected)
+        try:
+            wrapped()
+        finally:
+            _PROFILE_REQUEST.reset(token)
+
+        self.assertEqual(len(collected), 1)
+        rows = summarize_profile(collected, top_n=5)
+        self.assertLessEqual(len(rows), 5)
+        self.assertTrue(any("predict_endpoint" in row["function"] for row in rows))
+        cumtimes = [row["cumtime"] for row in rows]
+        self.assertEqual(cumtimes, sorted(cumtimes, reverse=True))
+
+    def test_profile_preserves_signature(self):
+        """Wrapping should keep the signature FastAPI inspects."""
+        import inspect
+        from app import profile_endpoint
+
+        def endpoint(count: int = 3, theme: str = None):
+            return count
+
+        wrapped = profile_endpoint(endpoint)
+        self.assertEqual(inspect.signature(wrapped), inspect.signature(endpoint))
+
+
+class TestLiveFeed(unittest.TestCase):
+    """Tests for the WebSocket live feed broadcaster."""
+
+    def test_publish_from_worker_thread(self):
+        """Events published from another thread should reach subscribers."""
+        import asyncio
+        import threading
+        from app import LiveFeed
+
+        feed = LiveFeed()
+
+        async def scenario():
+            queue = feed.subscribe()
+            worker = threading.Thread(target=feed.publish, args=("prediction", {"id": 7}))
+            worker.start()
+            event = await asyncio.wait_for(queue.get(), timeout=2)
+            worker.join()
+            feed.unsubscribe(queue)
+            return event
+
+        event = asyncio.run(scenario())
+        self.assertEqual(event, {"type": "prediction", "data": {"id": 7}})
+        self.assertEqual(feed.subscriber_count, 0)
+
+    def test_slow_subscriber_gets_resync(self):
+        """A full queue should be replaced with a single resync event."""
+        import asyncio
+        from app import LiveFeed
+
+        feed = LiveFeed(max_queue=2)
+
+        async def scenario():
+            queue = feed.subscribe()
+            for i in range(3):
+                feed.publish("rating", {"id": i})
+            await asyncio.sleep(0)
+            events = []
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            return events
+
+        self.assertEqual(asyncio.run(scenario()), [{"type": "resync"}])
+
+    def test_publish_without_subscribers(self):
+        """Publishing with nobody connected should be a no-op."""
+        from app import LiveFeed
+        LiveFeed().publish("prediction", {"id": 1})
+
+    def test_api_has_websocket_endpoint(self):
+        """API should expose the /ws live feed."""
+        try:
+            api = create_api()
+        except ImportError:
+            self.skipTest("FastAPI not installed")
+        self.assertIn("/ws", [route.path for route in api.routes])
+
+
+class TestHistoryPagination(unittest.TestCase):
+    """Tests for cursor-based history pagination."""
+
+    def setUp(self):
+        """Build an in-memory history with IDs 1-30."""
+        categories = ["fortune", "career", "health"]
+        self.history = [
+            {"id": i, "prediction": f"Test {i}", "category": categories[i % 3],
+             "rating": 5 if i % 5 == 0 else None}
+            for i in range(1, 31)
+        ]
+
+    def test_default_page_is_most_recent(self):
+        """Without a cursor the newest predictions are returned, oldest first."""
+        from app import get_history_page
+        page = get_history_page(limit=5, history=self.history)
+        self.assertEqual([p["id"] for p in page["items"]], [26, 27, 28, 29, 30])
+        self.assertIsNotNone(page["next_cursor"])
+        self.assertIsNone(page["prev_cursor"])
+
+    def test_walk_back_with_cursors(self):
+        """Following next_cursor should visit every record exactly once."""
+        from app import get_history_page, decode_history_cursor
+        seen = []
+        page = get_history_page(limit=7, history=self.history)
+        while True:
+            seen = [p["id"] for p in page["items"]] + seen
+            if not page["next_cursor"]:
+                break
+            direction, before_id = decode_history_cursor(page["next_cursor"])
+            self.assertEqual(direction, "before")
+            page = get_history_page(limit=7, before_id=before_id, history=self.history)
+        self.assertEqual(seen, list(range(1, 31)))
+
+    def test_after_id(self):
+        """after_id should return the next newer predictions."""
+        from app import get_history_page
+        page = get_history_page(limit=3, after_id=10, history=self.history)
+        self.assertEqual([p["id"] for p in page["items"]], [11, 12, 13])
+        self.assertIsNotNone(page["prev_cursor"])
+        self.assertIsNotNone(page["next_cursor"])
+
+    def test_after_id_and_before_id(self):
+        """With both bounds only the predictions between them are returned."""
+        from app import get_history_page
+        page = get_history_page(limit=10, after_id=10, before_id=14, history=self.history)
+        self.assertEqual([p["id"] for p in page["items"]], [11, 12, 13])
+        page = get_history_page(limit=2, after_id=10, before_id=14, history=self.history)
+        self.assertEqual([p["id"] for p in page["items"]], [11, 12])
+        self.assertEqual(get_history_page(after_id=10, before_id=11, history=self.history)["items"], [])
+
+    def test_filters_apply_within_page(self):
+        """Category and rated filters should still fill the page."""
+        from app import get_history_page
+        page = get_history_page(limit=2, category="Career", history=self.history)
+        self.assertEqual([p["id"] for p in page["items"]], [25, 28])
+        rated = get_history_page(limit=10, rated_only=True, history=self.history)
+        self.assertEqual([p["id"] for p in rated["items"]], [5, 10, 15, 20, 25, 30])
+        self.assertIsNone(rated["next_cursor"])
+
+    def test_cursor_roundtrip_and_validation(self):
+        """Cursors should roundtrip and malformed ones should be rejected."""
+        from app import encode_history_cursor, decode_history_cursor
+        self.assertEqual(decode_history_cursor(encode_history_cursor("after", 42)), ("after", 42))
+        with self.assertRaises(ValueError):
+            decode_history_cursor("not-a-cursor")
+
+
+class TestStreamingExport(unittest.TestCase):
+    """Tests for the streaming history exporter."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _patched(self):
+        return patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))
+
+    def test_iter_history_small_chunks(self):
+        """The incremental parser should handle elements split across reads."""
+        from app import _iter_json_array
+        records = [{"id": i, "prediction": f"Préd ✨ {i}", "category": "fortune"} for i in range(1, 6)]
+        with open(self.temp_file, "w") as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        with open(self.temp_file, "rb") as f:
+            parsed = [record for _, record in _iter_json_array(f, chunk_size=3)]
+        self.assertEqual(parsed, records)
+
+    def test_json_export_matches_full_dump(self):
+        """Streamed JSON should be identical to dumping the whole list."""
+        from app import iter_export
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            for i in range(3):
+                save_to_history({"prediction": f"Test {i}", "category": "career"})
+            output = "".join(iter_export("json"))
+            self.assertEqual(output, json.dumps(load_history(), indent=2) + "\n")
+            self.assertEqual(json.loads("".join(iter_export("json", category="health"))), [])
+
+    def test_csv_export_header_only_when_empty(self):
+        """A filtered-out CSV export should still have its header."""
+        from app import iter_export
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            save_to_history({"prediction": "Test", "category": "career"})
+            output = "".join(iter_export("csv", category="fortune"))
+        self.assertEqual(output.strip(), "id,category,prediction,applies_to,confidence,generated_at,rating")
+
+    def test_markdown_export_newest_first(self):
+        """Markdown should list newest first with the total up front."""
+        from app import iter_export
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            for i in range(3):
+                save_to_history({"prediction": f"Prediction number {i}", "category": "career"})
+            output = "".join(iter_export("markdown"))
+        self.assertIn("Total predictions: 3", output)
+        self.assertLess(output.index("Prediction number 2"), output.index("Prediction number 0"))
+
+    def test_export_to_file(self):
+        """export_history should stream to an output file."""
+        out_file = Path(self.temp_dir) / "export.csv"
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir, patch("sys.stdout", new_callable=StringIO):
+            save_to_history({"prediction": "Test prediction", "category": "fortune"})
+            export_history("csv", output=str(out_file))
+        self.assertIn("Test prediction", out_file.read_text())
+
+    def test_unknown_format(self):
+        """Unknown formats should be rejected."""
+        from app import iter_export
+        with self.assertRaises(ValueError):
+            list(iter_export("xml"))
+
+    def test_api_has_export_endpoint(self):
+        """API should expose GET /export."""
+        try:
+            api = create_api()
+        except ImportError:
+            self.skipTest("FastAPI not installed")
+        self.assertIn("/export", [route.path for route in api.routes])
+
+    def test_api_export_rejects_invalid_since(self):
+        """An invalid since should be a 400 rather than an unfiltered export."""
+        try:
+            from fastapi.testclient import TestClient
+            client = TestClient(create_api())
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        temp_dir = tempfile.mkdtemp()
+        try:
+            with patch("app.HISTORY_FILE", Path(temp_dir) / "history.json"), \
+                 patch("app.HISTORY_DIR", Path(temp_dir)):
+                save_to_history({"prediction": "Test prediction", "category": "fortune"})
+                response = client.get("/export?since=bogus&format=json")
+                self.assertEqual(client.get("/export?since=2020-01-01&format=json").status_code, 200)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn("Test prediction", response.text)
+
+
+class TestHistoryStatsAggregates(unittest.TestCase):
+    """Tests for the materialized history statistics."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _patched(self):
+        return patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))
+
+    def _strip(self, stats):
+        return {k: v for k, v in stats.items() if k != "source"}
+
+    def test_incremental_matches_full_scan(self):
+        """Aggregates updated on write should equal a full recomputation."""
+        from app import load_history_stats, compute_history_stats
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir, patch("sys.stdout", new_callable=StringIO):
+            for i in range(6):
+                save_to_history({"prediction": f"Test {i}", "category": ["fortune", "career"][i % 2],
+                                 "generated_at": datetime(2025, 1, i + 1).isoformat()})
+            add_feedback(2, 4)
+            add_feedback(3, 5)
+            add_feedback(2, 1)  # re-rating replaces the old rating
+            stats = load_history_stats()
+            self.assertEqual(self._strip(stats), self._strip(compute_history_stats(load_history())))
+        self.assertEqual(stats["total"], 6)
+        self.assertEqual(stats["rating_count"], 2)
+        self.assertEqual(stats["ratings"], {"1": 1, "5": 1})
+        self.assertEqual(stats["first_generated_at"], "2025-01-01T00:00:00")
+
+    def test_eviction_updates_aggregates(self):
+        """Predictions dropped by the retention limit should leave the aggregates."""
+        from app import load_history_stats
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir, patch("app.MAX_HISTORY", 3):
+            for i in range(5):
+                save_to_history({"prediction": f"Test {i}", "category": f"cat{i}",
+                                 "generated_at": datetime(2025, 1, i + 1).isoformat()})
+            stats = load_history_stats()
+        self.assertEqual(stats["total"], 3)
+        self.assertEqual(set(stats["categories"]), {"cat2", "cat3", "cat4"})
+        self.assertEqual(stats["first_generated_at"], "2025-01-03T00:00:00")
+        self.assertEqual(stats["last_generated_at"], "2025-01-05T00:00:00")
+
+    def test_rebuilds_after_external_edit(self):
+        """Editing history outside the app should trigger a rebuild."""
+        from app import load_history_stats
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            save_to_history({"prediction": "Test", "category": "fortune"})
+            with open(self.temp_file, "w") as f:
+                json.dump([{"prediction": "A", "category": "health", "rating": 3},
+                           {"prediction": "B", "category": "health"}], f)
+            stats = load_history_stats()
+        self.assertEqual(stats["categories"], {"health": 2})
+        self.assertEqual(stats["rating_count"], 1)
+
+    def test_show_stats_does_not_scan_history(self):
+        """show_stats should be served from the aggregates."""
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir, \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            save_to_history({"prediction": "Test", "category": "fortune", "rating": 4})
+            with patch("app.load_history", side_effect=AssertionError("full scan")):
+                show_stats()
+                prefs = get_preferred_categories()
+        self.assertIn("Total predictions: 1", mock_stdout.getvalue())
+        self.assertIn("Average rating: 4.0/5", mock_stdout.getvalue())
+        self.assertEqual(prefs, {"fortune": 0.75})
+
+    def test_aggregates_share_one_sidecar_write(self):
+        """A save writes history plus a single sidecar holding every aggregate."""
+        import app
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            save_to_history({"prediction": "Test", "category": "fortune"})
+            with patch("app._write_json_atomic", wraps=app._write_json_atomic) as mock_write:
+                save_to_history({"prediction": "Another test", "category": "career"})
+            self.assertEqual(mock_write.call_count, 1)
+            self.assertEqual(sorted(p.name for p in Path(self.temp_dir).iterdir()),
+                             ["aggregates.json", "history.json"])
+            self.assertEqual(app.load_history_stats()["total"], 2)
+            self.assertEqual([r["id"] for r in app.search_history("another")], [2])
+
+    def test_legacy_sidecar_files_are_migrated(self):
+        """Aggregates written as separate files by older versions are carried over."""
+        from app import load_rollups, rollup_keys
+        when = datetime(2025, 1, 1, 12).isoformat()
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            save_to_history({"prediction": "Test", "category": "fortune", "generated_at": when})
+            sidecar = Path(self.temp_dir) / "aggregates.json"
+            sections = json.loads(sidecar.read_text())["sections"]
+            sidecar.unlink()
+            day = rollup_keys(datetime(2025, 1, 1))["day"]
+            sections["rollups"]["buckets"]["day"][day]["predictions"] = 40  # includes evicted predictions
+            for name, data in sections.items():
+                (Path(self.temp_dir) / f"{name}.json").write_text(json.dumps(data))
+            save_to_history({"prediction": "Another test", "category": "career", "generated_at": when})
+            self.assertEqual(load_rollups()["buckets"]["day"][day]["predictions"], 41)
+        self.assertEqual(sorted(p.name for p in Path(self.temp_dir).iterdir()),
+                         ["aggregates.json", "history.json"])
+
+
+class TestTimeseriesRollups(unittest.TestCase):
+    """Tests for the time-bucketed analytics rollups."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _patched(self):
+        return patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))
+
+    def test_rollup_keys(self):
+        """Keys should use hour, day and ISO week formats."""
+        from app import rollup_keys, rollup_bucket_start
+        keys = rollup_keys(datetime(2025, 1, 1, 13, 45))
+        self.assertEqual(keys, {"hour": "2025-01-01T13", "day": "2025-01-01", "week": "2025-W01"})
+        self.assertEqual(rollup_bucket_start("week", "2025-W01"), datetime(2024, 12, 30))
+        self.assertEqual(rollup_bucket_start("hour", "2025-01-01T13"), datetime(2025, 1, 1, 13))
+
+    def test_writes_update_buckets(self):
+        """Saving and rating predictions should update every bucket size."""
+        from app import get_timeseries
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir, patch("sys.stdout", new_callable=StringIO):
+            now = datetime.now().replace(microsecond=0)
+            save_to_history({"prediction": "A", "category": "fortune", "theme": "zodiac",
+                             "mode": "theme", "generated_at": now.isoformat()})
+            save_to_history({"prediction": "B", "category": "career", "mode": "default",
+                             "generated_at": now.isoformat()})
+            add_feedback(1, 4)
+            add_feedback(1, 2)  # re-rating replaces the old rating
+            add_feedback(2, 5)
+            days = get_timeseries("day")
+            hours = get_timeseries("hour")
+            weeks = get_timeseries("week")
+        self.assertEqual(len(days), 1)
+        self.assertEqual(days[0]["predictions"], 2)
+        self.assertEqual(days[0]["ratings"], 2)
+        self.assertEqual(days[0]["average_rating"], 3.5)
+        self.assertEqual(days[0]["categories"], {"fortune": 1, "career": 1})
+        self.assertEqual(days[0]["themes"], {"zodiac": 1})
+        self.assertEqual(days[0]["modes"], {"theme": 1, "default": 1})
+        self.assertEqual(hours[0]["predictions"], 2)
+        self.assertEqual(weeks[0]["predictions"], 2)
+
+    def test_backfills_from_history(self):
+        """A missing rollups file should be rebuilt from existing history."""
+        from app import get_timeseries
+        with open(self.temp_file, "w") as f:
+            json.dump([{"id": 1, "prediction": "A", "category": "fortune", "rating": 3,
+                        "generated_at": "2025-01-01T10:00:00"},
+                       {"id": 2, "prediction": "B", "category": "health",
+                        "generated_at": "2025-01-02T10:00:00"}], f)
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            save_to_history({"prediction": "C", "category": "health",
+                             "generated_at": "2025-01-02T11:00:00"})
+            days = get_timeseries("day")
+        self.assertEqual([d["bucket"] for d in days], ["2025-01-01", "2025-01-02"])
+        self.assertEqual([d["predictions"] for d in days], [1, 2])
+        self.assertEqual(days[0]["average_rating"], 3.0)
+
+    def test_range_filter_and_validation(self):
+        """from/to should select buckets and bad buckets should be rejected."""
+        from app import get_timeseries
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            for day in (1, 5, 9):
+                save_to_history({"prediction": "Test", "category": "fortune",
+                                 "generated_at": datetime(2025, 1, day, 12).isoformat()})
+            days = get_timeseries("day", start="2025-01-02", end="2025-01-09T00:00")
+            with self.assertRaises(ValueError):
+                get_timeseries("month")
+        self.assertEqual([d["bucket"] for d in days], ["2025-01-05", "2025-01-09"])
+
+    def test_prediction_records_mode(self):
+        """Predictions should record which generation path produced them."""
+        self.assertEqual(predict_the_future(theme="zodiac")["mode"], "theme")
+        self.assertEqual(predict_the_future()["mode"], "default")
+
+    def test_api_has_timeseries_endpoint(self):
+        """API should have /stats/timeseries endpoint."""
+        from app import create_api
+        try:
+            api = create_api()
+            routes = [route.path for route in api.routes]
+            self.assertIn("/stats/timeseries", routes)
+        except ImportError:
+            self.skipTest("FastAPI not installed")
+
+
+class TestHistoryColumns(unittest.TestCase):
+    """Tests for the columnar history view."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+        self.history = [
+            {"id": i + 1, "prediction": f"Test {i}", "category": ["fortune", "Career", "health"][i % 3],
+             "generated_at": datetime(2025, 1, i + 1, 12).isoformat(),
+             **({"rating": i % 5 + 1} if i % 2 else {})}
+            for i in range(12)
+        ]
+        self.history.append({"id": 13, "prediction": "Undated", "category": "fortune", "rating": 2})
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _backends(self):
+        """Run a check with NumPy (if installed) and with the pure-Python fallback."""
+        import app
+        backends = [None] + ([app.np] if app.np is not None else [])
+        for backend in backends:
+            with self.subTest(numpy=backend is not None), patch("app.np", backend):
+                yield
+
+    def test_filter_matches_predicate(self):
+        """Vectorized filters should select the same records as the predicate."""
+        from app import _history_predicate
+        for _ in self._backends():
+            for category, since in [("fortune", None), ("career", None), (None, "2025-01-06"),
+                                    ("health", "2025-01-04"), ("missing", None)]:
+                keep = _history_predicate(category, since)
+                expected = [p for p in self.history if keep(p)]
+                self.assertEqual(filter_history(self.history, category=category, since=since), expected)
+
+    def test_summarize_matches_full_scan(self):
+        """Group-by summaries should match the aggregates' full scan."""
+        from app import HistoryColumns, compute_history_stats
+        expected = compute_history_stats(self.history)
+        del expected["cube"]
+        for _ in self._backends():
+            stats = HistoryColumns(self.history).summarize()
+            self.assertEqual(stats, expected)
+
+    def test_filtered_stats(self):
+        """show_stats should honour category and date filters."""
+        with open(self.temp_file, "w") as f:
+            json.dump(self.history, f)
+        for _ in self._backends():
+            with patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir)), \
+                 patch("app._HISTORY_COLUMNS", {"signature": None, "columns": None}), \
+                 patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                show_stats(category="career", since="2025-01-05")
+            output = mock_stdout.getvalue()
+            self.assertIn("Total predictions: 3", output)
+            self.assertIn("Career: 3 (100.0%)", output)
+            self.assertIn("First: 2025-01-05 12:00", output)
+
+    def test_invalid_since_is_an_error(self):
+        """A bad since raises for callers, warns on the CLI and is a 400 from /stats."""
+        from app import filtered_history_stats, main
+        with open(self.temp_file, "w") as f:
+            json.dump(self.history, f)
+        with patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir)):
+            with self.assertRaises(ValueError):
+                filtered_history_stats(since="bogus")
+            with self.assertRaises(ValueError):
+                filter_history(self.history, since="bogus")
+            with patch("sys.argv", ["app.py", "--stats", "--since", "bogus"]), \
+                 patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+                main()
+            self.assertIn("Warning: Invalid date format 'bogus'", mock_stdout.getvalue())
+            self.assertIn("Total predictions: 13", mock_stdout.getvalue())
+            try:
+                from fastapi.testclient import TestClient
+                client = TestClient(create_api())
+            except (ImportError, RuntimeError):
+                self.skipTest("FastAPI, Starlette, or httpx not installed")
+            response = client.get("/stats?since=bogus")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid date format", response.json()["detail"])
+
+    def test_view_cached_until_history_changes(self):
+        """The file-backed view should be reused until history is written."""
+        from app import history_columns, METRICS
+        METRICS.reset()
+        with patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir)), \
+             patch("app._HISTORY_COLUMNS", {"signature": None, "columns": None}):
+            save_to_history({"prediction": "A", "category": "fortune"})
+            first = history_columns()
+            self.assertIs(history_columns(), first)
+            self.assertIs(history_columns(first.records), first)
+            save_to_history({"prediction": "B", "category": "career"})
+            second = history_columns()
+        self.assertIsNot(second, first)
+        self.assertEqual(len(second), 2)
+        hits = METRICS.get("thefuture_cache_requests_total", {"cache": "history_columns", "result": "hit"})
+        self.assertEqual(hits, 2)
+
+
+class TestStatsQuery(unittest.TestCase):
+    """Tests for multi-dimensional stats queries."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+        self.patches = [patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+        records = [
+            ("fortune", "zodiac", "theme", "morning", "weekday", "2025-01-01"),
+            ("fortune", "zodiac", "theme", "evening", "weekend", "2025-01-04"),
+            ("career", None, "smart", "morning", "weekday", "2025-01-06"),
+            ("career", None, "default", None, None, "2025-01-07"),
+            ("fortune", None, "smart", "morning", "weekday", "2025-01-08"),
+        ]
+        for category, theme, mode, time_of_day, day_type, date in records:
+            pred = {"prediction": "Test", "category": category, "mode": mode,
+                    "generated_at": f"{date}T09:00:00"}
+            for key, value in (("theme", theme), ("time_of_day", time_of_day), ("day_type", day_type)):
+                if value:
+                    pred[key] = value
+            save_to_history(pred)
+        with patch("sys.stdout", new_callable=StringIO):
+            add_feedback(1, 5)
+            add_feedback(2, 3)
+            add_feedback(3, 4)
+            add_feedback(1, 1)  # re-rating replaces the old rating
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_group_by_multiple_dimensions(self):
+        """Groups should combine counts and ratings across cube cells."""
+        from app import query_stats
+        rows = query_stats(["category", "time_of_day"])
+        by_key = {(r["category"], r["time_of_day"]): r for r in rows}
+        self.assertEqual(by_key[("fortune", "morning")]["count"], 2)
+        self.assertEqual(by_key[("fortune", "morning")]["average_rating"], 1.0)
+        self.assertEqual(by_key[("career", None)]["count"], 1)
+        self.assertIsNone(by_key[("career", None)]["average_rating"])
+        self.assertEqual(rows[0]["count"], 2)
+
+    def test_filters_and_total(self):
+        """Filters should restrict the cells and an empty group-by gives a total."""
+        from app import query_stats
+        rows = query_stats(["mode"], {"category": "FORTUNE", "theme": "none"})
+        self.assertEqual(rows, [{"mode": "smart", "count": 1, "rated": 0, "average_rating": None}])
+        total = query_stats([])
+        self.assertEqual(total, [{"count": 5, "rated": 3, "average_rating": 2.67}])
+
+    def test_matches_full_scan(self):
+        """Incrementally maintained cells should equal a rebuild, including after eviction."""
+        from app import load_history_stats, compute_history_stats
+        with patch("app.MAX_HISTORY", 4):
+            save_to_history({"prediction": "Test", "category": "health", "mode": "default"})
+        stats = load_history_stats()
+        self.assertEqual(stats["cube"], compute_history_stats(load_history())["cube"])
+        self.assertEqual(sum(cell[0] for cell in stats["cube"].values()), 4)
+
+    def test_since_scans_matching_records(self):
+        """A since filter should be answered from the matching records."""
+        from app import query_stats
+        with patch("app.load_history_stats", side_effect=AssertionError("cube used")):
+            rows = query_stats(["category"], since="2025-01-05")
+        self.assertEqual({r["category"]: r["count"] for r in rows}, {"career": 2, "fortune": 1})
+
+    def test_unknown_dimension(self):
+        """Unknown dimensions should be rejected and reported by the CLI."""
+        from app import query_stats, show_stats_query
+        with self.assertRaises(ValueError):
+            query_stats(["colour"])
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            show_stats_query(["category"], {"colour": "red"})
+        self.assertIn("Unknown dimension 'colour'", mock_stdout.getvalue())
+
+    def test_invalid_since_is_rejected(self):
+        """A bad since should be an error, and a 400 from /stats/query."""
+        from app import query_stats
+        with self.assertRaises(ValueError):
+            query_stats(["category"], since="bogus")
+        try:
+            from fastapi.testclient import TestClient
+            client = TestClient(create_api())
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        response = client.get("/stats/query?group_by=category&since=bogus")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid date format", response.json()["detail"])
+
+    def test_cli_group_by(self):
+        """--stats --group-by should print one row per group."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--stats", "--group-by", "category,mode", "--where", "mode=smart"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        output = mock_stdout.getvalue()
+        self.assertIn("Predictions by category, mode", output)
+        self.assertIn("fortune / smart", output)
+        self.assertIn("career / smart", output)
+        self.assertNotIn("default", output)
+
+    def test_cli_rejects_malformed_where(self):
+        """--where without DIM=VALUE should be an argument error, not ignored."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--stats", "--group-by", "category", "--where", "career"]), \
+             patch("sys.stderr", new_callable=StringIO) as mock_stderr, \
+             self.assertRaises(SystemExit):
+            main()
+        self.assertIn("'career' is not of the form DIM=VALUE", mock_stderr.getvalue())
+
+    def test_api_has_query_endpoint(self):
+        """API should have /stats/query endpoint."""
+        from app import create_api
+        try:
+            api = create_api()
+            routes = [route.path for route in api.routes]
+            self.assertIn("/stats/query", routes)
+        except ImportError:
+            self.skipTest("FastAPI not installed")
+
+
+class TestSketches(unittest.TestCase):
+    """Tests for the streaming distinct-count and quantile sketches."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _patched(self):
+        return patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))
+
+    def test_hyperloglog_error_bound(self):
+        """Distinct estimates should stay within a few standard errors."""
+        from app import HyperLogLog
+        for precision, n in ((12, 50), (10, 20000)):
+            hll = HyperLogLog(precision)
+            for i in range(n):
+                hll.add(f"prediction {i}")
+                hll.add(f"prediction {i}")  # duplicates do not count
+            self.assertLess(abs(hll.count() - n) / n, 3 * hll.relative_error)
+            restored = HyperLogLog.from_dict(hll.to_dict())
+            self.assertEqual(restored.count(), hll.count())
+        with self.assertRaises(ValueError):
+            HyperLogLog(20)
+
+    def test_quantile_sketch_relative_accuracy(self):
+        """Quantiles should be within the configured relative accuracy."""
+        from app import QuantileSketch
+        sketch = QuantileSketch(0.02)
+        values = list(range(1, 1001))
+        for value in values:
+            sketch.add(value)
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact) / exact, 0.02)
+        for value in range(501, 1001):
+            sketch.add(value, -1)
+        self.assertEqual(sketch.count, 500)
+        self.assertLessEqual(sketch.quantile(1.0), 500 * 1.02)
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+
+    def test_maintained_on_write(self):
+        """Saves and ratings should update the sketches, surviving eviction."""
+        from app import sketch_summary
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir, patch("app.MAX_HISTORY", 3), patch("sys.stdout", new_callable=StringIO):
+            for i in range(6):
+                save_to_history({"prediction": f"Text {i % 4}", "category": "fortune",
+                                 "theme": "zodiac" if i < 2 else None, "confidence": f"{80 + i}%"})
+            add_feedback(6, 2)
+            add_feedback(6, 4)  # re-rating replaces the old rating
+            summary = sketch_summary()
+        self.assertEqual(summary["distinct_predictions"], 4)
+        self.assertEqual(summary["distinct_by_category"], {"fortune": 4})
+        self.assertEqual(summary["distinct_by_theme"], {"zodiac": 2})
+        self.assertAlmostEqual(summary["rating_percentiles"]["p50"], 4, delta=0.04)
+        self.assertAlmostEqual(summary["confidence_percentiles"]["p99"], 84, delta=0.84)
+
+    def test_rebuilt_when_precision_changes(self):
+        """Changing the configured error bounds should rebuild from history."""
+        from app import load_sketches
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir:
+            save_to_history({"prediction": "A", "category": "fortune"})
+            save_to_history({"prediction": "B", "category": "fortune"})
+            with patch("app.SKETCH_PRECISION", 8):
+                sketches = load_sketches()
+        self.assertEqual(sketches["distinct"]["all"].precision, 8)
+        self.assertEqual(sketches["distinct"]["all"].count(), 2)
+
+    def test_show_stats_reports_sketches(self):
+        """show_stats should include the approximate all-time figures."""
+        patch_file, patch_dir = self._patched()
+        with patch_file, patch_dir, patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            save_to_history({"prediction": "A", "category": "fortune", "confidence": "90%"})
+            show_stats()
+        self.assertIn("Distinct predictions served: ~1", mock_stdout.getvalue())
+        self.assertRegex(mock_stdout.getvalue(), r"Confidence p50/p90/p99: (89|90|91)% / ")
+
+
+class TestRecordTimestamps(unittest.TestCase):
+    """Tests for stored epoch timestamps and binary-search date filters."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_stamped_on_write_and_backfilled(self):
+        """New records get a ts and older records are backfilled on the next write."""
+        with open(self.temp_file, "w") as f:
+            json.dump([{"id": 1, "prediction": "Old", "category": "fortune",
+                        "generated_at": "2025-01-01T12:00:00"},
+                       {"id": 2, "prediction": "Undated", "category": "fortune"}], f)
+        with patch("app.HISTORY_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir)):
+            save_to_history({"prediction": "New", "category": "career",
+                             "generated_at": "2025-01-02T12:00:00"})
+            history = load_history()
+        self.assertEqual(history[0]["ts"], int(datetime(2025, 1, 1, 12).timestamp()))
+        self.assertNotIn("ts", history[1])
+        self.assertEqual(history[2]["ts"], int(datetime(2025, 1, 2, 12).timestamp()))
+
+    def test_since_uses_binary_search(self):
+        """Sorted timestamps should be searched, unsorted ones compared."""
+        from app import HistoryColumns
+        base = datetime(2025, 1, 1)
+        history = [{"id": i, "category": "fortune", "ts": int((base + timedelta(days=i)).timestamp()),
+                    "generated_at": "not parsed"} for i in range(10)]
+        since = base + timedelta(days=6)
+        import app
+        for backend in [None] + ([app.np] if app.np is not None else []):
+            with self.subTest(numpy=backend is not None), patch("app.np", backend):
+                columns = HistoryColumns(history)
+                self.assertTrue(columns.time_sorted)
+                self.assertEqual(columns.since_index(since), 6)
+                self.assertEqual([p["id"] for p in columns.select(columns.mask(since=since))], [6, 7, 8, 9])
+                shuffled = HistoryColumns(history[5:] + history[:5])
+                self.assertIsNone(shuffled.since_index(since))
+                self.assertEqual([p["id"] for p in shuffled.select(shuffled.mask(since=since))], [6, 7, 8, 9])
+
+    def test_predicate_prefers_stored_timestamp(self):
+        """Streaming filters should read ts instead of parsing generated_at."""
+        from app import _history_predicate
+        keep = _history_predicate(since="2025-01-01")
+        self.assertTrue(keep({"ts": int(datetime(2025, 6, 1).timestamp()), "generated_at": "garbage"}))
+        self.assertFalse(keep({"ts": int(datetime(2024, 6, 1).timestamp())}))
+        self.assertTrue(keep({"generated_at": "2025-02-01T00:00:00"}))
+        self.assertFalse(keep({"prediction": "Undated"}))
+
+    def test_parse_applies_to(self):
+        """The fast applies_to parser should agree with strptime."""
+        from app import parse_applies_to, get_future_date
+        for days in (0, 1, 40, 400):
+            text = get_future_date(days)
+            self.assertEqual(parse_applies_to(text), datetime.strptime(text, "%A, %B %d, %Y"))
+        for bad in ("", "Someday", "Monday, Smarch 01, 2025", None):
+            with self.assertRaises(ValueError):
+                parse_applies_to(bad)
+
+
+class TestReminderIndex(unittest.TestCase):
+    """Tests for the date-ordered reminder index."""
+
+    def setUp(self):
+        """Set up a temporary reminders file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "reminders.json"
+        dates = ["2025-03-01", "2025-01-15", "2025-02-01", "2025-01-15", "2025-04-01"]
+        self.reminders = [
+            {"reminder_id": i + 1, "prediction": f"Reminder {i + 1}", "category": "test",
+             "remind_date": date, "acknowledged": i == 2}
+            for i, date in enumerate(dates)
+        ]
+        with open(self.temp_file, "w") as f:
+            json.dump(self.reminders, f)
+        self.patches = [patch("app.REMINDERS_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _ids(self, reminders):
+        return [r["reminder_id"] for r in reminders]
+
+    def test_range_queries(self):
+        """Ranges should be inclusive, date-ordered and filtered by status."""
+        from app import query_reminders
+        self.assertEqual(self._ids(query_reminders()), [2, 4, 1, 5])
+        self.assertEqual(self._ids(query_reminders("2025-01-15", "2025-03-01")), [2, 4, 1])
+        self.assertEqual(self._ids(query_reminders(start="2025-02-01", status="all")), [3, 1, 5])
+        self.assertEqual(self._ids(query_reminders(end="2025-02-28", status="acknowledged")), [3])
+        self.assertEqual(self._ids(query_reminders("2025-03-01T10:00:00", "2025-03-31")), [1])
+
+    def test_next_due_and_due(self):
+        """The heap should give the earliest pending reminder."""
+        from app import get_reminder_index
+        index = get_reminder_index()
+        self.assertEqual(index.next_due()["reminder_id"], 2)
+        self.assertEqual(self._ids(index.due("2025-02-15")), [2, 4])
+        self.assertEqual(self._ids(get_pending_reminders()), [2, 4, 1, 5])
+
+    def test_index_cached_until_file_changes(self):
+        """The index should only be rebuilt after the reminders file is written."""
+        from app import get_reminder_index
+        first = get_reminder_index()
+        self.assertIs(get_reminder_index(), first)
+        with patch("sys.stdout", new_callable=StringIO):
+            acknowledge_reminder(2)
+        second = get_reminder_index()
+        self.assertIsNot(second, first)
+        self.assertEqual(second.next_due()["reminder_id"], 4)
+
+    def test_invalid_query(self):
+        """Bad dates and statuses should be rejected."""
+        from app import query_reminders, display_reminders
+        with self.assertRaises(ValueError):
+            query_reminders(start="soon")
+        with self.assertRaises(ValueError):
+            query_reminders(status="snoozed")
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            display_reminders(start="soon")
+        self.assertIn("Invalid date 'soon'", mock_stdout.getvalue())
+
+    def test_cli_from_to(self):
+        """--list-reminders --from/--to should only show reminders in the window."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--list-reminders", "--from", "2025-02-01", "--to", "2025-03-31"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        output = mock_stdout.getvalue()
+        self.assertIn("Reminder #1", output)
+        self.assertNotIn("Reminder #2", output)
+        self.assertNotIn("Reminder #3", output)
+        self.assertIn("Total: 1 reminder(s)", output)
+
+
+class TestReminderDispatcher(unittest.TestCase):
+    """Tests for the background reminder dispatcher and its sinks."""
+
+    class RecordingSink:
+        name = "recording"
+
+        def __init__(self):
+            self.batches = []
+
+        async def send(self, reminders):
+            self.batches.append([r["reminder_id"] for r in reminders])
+
+    class FailingSink:
+        name = "failing"
+
+        async def send(self, reminders):
+            raise IOError("unreachable")
+
+    def setUp(self):
+        """Set up a temporary reminders file with due, future and done reminders."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "reminders.json"
+        today = datetime.now().strftime("%Y-%m-%d")
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        reminders = [
+            {"reminder_id": 1, "prediction": "Overdue", "category": "test", "remind_date": "2020-01-01",
+             "acknowledged": False},
+            {"reminder_id": 2, "prediction": "Today", "category": "test", "remind_date": today,
+             "acknowledged": False},
+            {"reminder_id": 3, "prediction": "Tomorrow", "category": "test", "remind_date": tomorrow,
+             "acknowledged": False},
+            {"reminder_id": 4, "prediction": "Done", "category": "test", "remind_date": "2020-01-01",
+             "acknowledged": True},
+            {"reminder_id": 5, "prediction": "Also overdue", "category": "test", "remind_date": "2021-01-01",
+             "acknowledged": False},
+        ]
+        with open(self.temp_file, "w") as f:
+            json.dump(reminders, f)
+        self.patches = [patch("app.REMINDERS_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_dispatches_due_reminders_once_in_batches(self):
+        """Due reminders should be batched, and not re-sent after a restart."""
+        import asyncio
+        from app import ReminderDispatcher
+        sink = self.RecordingSink()
+        dispatcher = ReminderDispatcher([sink], batch_size=2)
+        self.assertEqual(asyncio.run(dispatcher.dispatch_due()), 3)
+        self.assertEqual(sink.batches, [[1, 5], [2]])
+        self.assertEqual(asyncio.run(dispatcher.dispatch_due()), 0)
+        restarted = ReminderDispatcher([sink])
+        self.assertEqual(asyncio.run(restarted.dispatch_due()), 0)
+
+    def test_failing_sink_does_not_block_others(self):
+        """A sink error should be reported while other sinks still deliver."""
+        import asyncio
+        from app import ReminderDispatcher, METRICS
+        METRICS.reset()
+        sink = self.RecordingSink()
+        dispatcher = ReminderDispatcher([self.FailingSink(), sink])
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            asyncio.run(dispatcher.dispatch_due())
+        self.assertEqual(sink.batches, [[1, 5, 2]])
+        self.assertIn("Could not deliver reminders to failing sink", mock_stdout.getvalue())
+        self.assertEqual(METRICS.get("thefuture_reminder_dispatch_errors_total", {"sink": "failing"}), 1)
+
+    def test_failed_delivery_is_retried_for_that_sink(self):
+        """Reminders a sink failed to take are re-sent to it (only), with backoff."""
+        import asyncio
+        from app import ReminderDispatcher
+
+        class FlakySink(self.RecordingSink):
+            name = "flaky"
+            fail = True
+
+            async def send(self, reminders):
+                if self.fail:
+                    raise IOError("unreachable")
+                await super().send(reminders)
+
+        flaky, good = FlakySink(), self.RecordingSink()
+        dispatcher = ReminderDispatcher([flaky, good], max_sleep=60, retry_delay=5)
+        with patch("sys.stdout", new_callable=StringIO):
+            self.assertEqual(asyncio.run(dispatcher.dispatch_due()), 3)
+            self.assertLessEqual(dispatcher.seconds_until_next(), 5)
+            asyncio.run(dispatcher.dispatch_due())
+            self.assertGreater(dispatcher.seconds_until_next(), 5)  # backed off
+
+        flaky.fail = False
+        restarted = ReminderDispatcher([flaky, good], max_sleep=60)
+        asyncio.run(restarted.dispatch_due())
+        self.assertEqual(flaky.batches, [[1, 5, 2]])
+        self.assertEqual(good.batches, [[1, 5, 2]])
+        self.assertEqual(asyncio.run(restarted.dispatch_due()), 0)
+
+    def test_api_runs_dispatcher_for_its_lifespan(self):
+        """create_api(reminder_sinks=...) starts the dispatcher on startup and stops it on shutdown."""
+        import time
+        try:
+            from fastapi.testclient import TestClient
+            api = create_api(reminder_sinks=["log", self.RecordingSink()])
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        sink = api.state.reminder_dispatcher.sinks[1]
+        with patch("sys.stdout", new_callable=StringIO), TestClient(api) as client:
+            for _ in range(200):
+                if sink.batches:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(client.get("/").status_code, 200)
+        self.assertEqual(sink.batches, [[1, 5, 2]])
+        self.assertIsNone(api.state.reminder_dispatcher._task)
+
+    def test_recurring_reminder_dispatched_each_occurrence(self):
+        """An unacknowledged daily reminder is delivered again on each new day."""
+        import asyncio
+        from app import ReminderDispatcher
+        with open(self.temp_file, "w") as f:
+            json.dump([], f)
+        save_reminder({"id": 1, "prediction": "Stretch", "category": "health"}, "2030-03-01", "daily")
+
+        class FakeDatetime(datetime):
+            current = datetime(2030, 3, 1, 9, 0)
+
+            @classmethod
+            def now(cls, tz=None):
+                return cls.current
+
+        sink = self.RecordingSink()
+        with patch("app.datetime", FakeDatetime):
+            dispatcher = ReminderDispatcher([sink], max_sleep=10 ** 6)
+            self.assertEqual(asyncio.run(dispatcher.dispatch_due()), 1)
+            self.assertEqual(dispatcher.seconds_until_next(), 15 * 3600)  # next midnight
+            self.assertEqual(asyncio.run(dispatcher.dispatch_due()), 0)
+            FakeDatetime.current = datetime(2030, 3, 2, 9, 0)
+            self.assertEqual(asyncio.run(dispatcher.dispatch_due()), 1)
+            FakeDatetime.current = datetime(2030, 3, 4, 9, 0)
+            restarted = ReminderDispatcher([sink], max_sleep=10 ** 6)
+            self.assertEqual(asyncio.run(restarted.dispatch_due()), 2)
+        self.assertEqual(sink.batches, [[1], [1], [1, 1]])
+
+    def test_wakes_when_reminder_created(self):
+        """run() should dispatch a new due reminder without waiting for its timer."""
+        import asyncio
+        from app import ReminderDispatcher, LiveFeed
+        sink = self.RecordingSink()
+        feed = LiveFeed()
+
+        async def scenario():
+            dispatcher = ReminderDispatcher([sink], max_sleep=60, feed=feed)
+            dispatcher.start()
+            await asyncio.sleep(0.05)
+            reminder = save_reminder({"id": 9, "prediction": "New", "category": "test"},
+                                     datetime.now().strftime("%Y-%m-%d"))
+            feed.publish("reminder_created", reminder)
+            for _ in range(100):
+                if len(sink.batches) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            await dispatcher.stop()
+            return feed.subscriber_count
+
+        self.assertEqual(asyncio.run(scenario()), 0)
+        self.assertEqual(sink.batches, [[1, 5, 2], [6]])
+
+    def test_sleeps_until_next_due(self):
+        """The wait should end at midnight before tomorrow's reminder."""
+        from app import ReminderDispatcher
+        dispatcher = ReminderDispatcher([], max_sleep=10 ** 6)
+        self.assertLessEqual(dispatcher.seconds_until_next(), 86400)
+        self.assertEqual(ReminderDispatcher([], max_sleep=30).seconds_until_next(), 30)
+
+    def test_file_and_webhook_sinks(self):
+        """File and webhook sinks should deliver the reminder payload."""
+        import asyncio
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        from app import parse_sink, LogSink, LiveFeedSink
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                received.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            spool = Path(self.temp_dir) / "spool" / "due.jsonl"
+            batch = [{"reminder_id": 1, "prediction": "Test"}]
+            asyncio.run(parse_sink(f"file:{spool}").send(batch))
+            asyncio.run(parse_sink(f"webhook:http://127.0.0.1:{server.server_port}/hook").send(batch))
+        finally:
+            server.shutdown()
+            server.server_close()
+        line = json.loads(spool.read_text().splitlines()[0])
+        self.assertEqual(line["reminder_id"], 1)
+        self.assertIn("dispatched_at", line)
+        self.assertEqual(received, [{"event": "reminder_due", "reminders": batch}])
+        self.assertIsInstance(parse_sink("log"), LogSink)
+        self.assertIsInstance(parse_sink("live"), LiveFeedSink)
+        for bad in ("email", "file:", "webhook:ftp://example.com"):
+            with self.assertRaises(ValueError):
+                parse_sink(bad)
+
+
+class TestBulkReminders(unittest.TestCase):
+    """Tests for bulk reminder creation and acknowledgement."""
+
+    def setUp(self):
+        """Set up a temporary reminders file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "reminders.json"
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        reminders = [
+            {"reminder_id": i + 1, "prediction": f"Reminder {i + 1}", "category": "test",
+             "remind_date": date, "acknowledged": i == 3}
+            for i, date in enumerate(["2020-01-01", "2020-06-01", tomorrow, "2020-01-01"])
+        ]
+        with open(self.temp_file, "w") as f:
+            json.dump(reminders, f)
+        self.patches = [patch("app.REMINDERS_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _acknowledged_ids(self):
+        return [r["reminder_id"] for r in load_reminders() if r.get("acknowledged")]
+
+    def test_acknowledge_by_ids_and_date_in_one_write(self):
+        """IDs and a date filter should be applied in one read-modify-write."""
+        import app
+        from app import acknowledge_reminders
+        with patch("app.load_reminders", wraps=app.load_reminders) as mock_load:
+            result = acknowledge_reminders([3, 4, 99], until="2020-03-01")
+        self.assertEqual(mock_load.call_count, 1)
+        self.assertEqual(sorted(r["reminder_id"] for r in result["acknowledged"]), [1, 3])
+        self.assertEqual(result["already_acknowledged"], [4])
+        self.assertEqual(result["not_found"], [99])
+        self.assertEqual(sorted(self._acknowledged_ids()), [1, 3, 4])
+        with self.assertRaises(ValueError):
+            acknowledge_reminders(until="someday")
+
+    def test_save_reminders_batch(self):
+        """Batch creation should assign sequential IDs in a single write."""
+        from app import save_reminders
+        created = save_reminders([
+            ({"id": 7, "prediction": "A", "category": "fortune"}, "2030-01-01"),
+            ({"id": 8, "prediction": "B", "category": "career",
+              "applies_to": "Tuesday, January 01, 2030"}, None),
+        ])
+        self.assertEqual([r["reminder_id"] for r in created], [5, 6])
+        self.assertEqual([r["remind_date"] for r in created], ["2030-01-01", "2030-01-01"])
+        self.assertEqual(len(load_reminders()), 6)
+
+    def test_concurrent_writers_do_not_lose_updates(self):
+        """Concurrent saves should all land with unique IDs."""
+        import threading
+        threads = [
+            threading.Thread(target=save_reminder, args=({"prediction": f"T{i}", "category": "test"}, "2030-01-01"))
+            for i in range(10)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        ids = [r["reminder_id"] for r in load_reminders()]
+        self.assertEqual(sorted(ids), list(range(1, 15)))
+
+    def test_cli_bulk_acknowledge(self):
+        """--acknowledge should take a list and --acknowledge-overdue a date cut-off."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--acknowledge", "1,2"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("Acknowledged 2 reminder(s)", mock_stdout.getvalue())
+        self.assertEqual(sorted(self._acknowledged_ids()), [1, 2, 4])
+
+        with patch("sys.argv", ["app.py", "--acknowledge", "1,x"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("Invalid reminder IDs", mock_stdout.getvalue())
+
+        with patch("sys.argv", ["app.py", "--acknowledge-overdue"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("No pending reminders to acknowledge", mock_stdout.getvalue())
+        self.assertNotIn(3, self._acknowledged_ids())
+
+    def test_api_has_bulk_endpoints(self):
+        """API should have the bulk reminder endpoints."""
+        from app import create_api
+        try:
+            api = create_api()
+            routes = [route.path for route in api.routes]
+            self.assertIn("/reminders/batch", routes)
+            self.assertIn("/reminders/acknowledge", routes)
+        except ImportError:
+            self.skipTest("FastAPI not installed")
+
+    def test_api_acknowledge_rejects_invalid_until(self):
+        """An invalid until date should be a 400, also with overdue=true."""
+        try:
+            from fastapi.testclient import TestClient
+            client = TestClient(create_api())
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        before = self._acknowledged_ids()
+        for body in ({"until": "garbage"}, {"until": "garbage", "overdue": True}):
+            with self.subTest(body=body):
+                response = client.post("/reminders/acknowledge", json=body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("Invalid date", response.json()["detail"])
+        self.assertEqual(self._acknowledged_ids(), before)
+
+
+class TestRecurringReminders(unittest.TestCase):
+    """Tests for recurring reminders and lazy occurrence generation."""
+
+    def setUp(self):
+        """Set up a temporary reminders file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "reminders.json"
+        self.patches = [
+            patch("app.REMINDERS_FILE", self.temp_file),
+            patch("app.HISTORY_FILE", Path(self.temp_dir) / "history.json"),
+            patch("app.HISTORY_DIR", Path(self.temp_dir)),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _rule(self, spec, start):
+        from app import parse_recurrence
+        rule = parse_recurrence(spec)
+        rule["start"] = start
+        return rule
+
+    def _take(self, rule, n, start=None):
+        from app import iter_occurrences
+        from itertools import islice
+        return list(islice(iter_occurrences(rule, start), n))
+
+    def test_parse_recurrence(self):
+        """Presets and RRULE subsets should parse; unsupported rules should not."""
+        from app import parse_recurrence, describe_recurrence
+        self.assertEqual(parse_recurrence("weekdays")["byday"], [0, 1, 2, 3, 4])
+        rule = parse_recurrence("RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=WE,MO;COUNT=10;UNTIL=20251231")
+        self.assertEqual(rule, {"freq": "weekly", "interval": 2, "byday": [0, 2], "count": 10,
+                                "until": "2025-12-31"})
+        self.assertEqual(describe_recurrence(rule), "every 2 weeks on Mon, Wed, 10 times until 2025-12-31")
+        for bad in ("hourly", "FREQ=YEARLY", "FREQ=DAILY;BYDAY=MO", "INTERVAL=2", "FREQ=DAILY;INTERVAL=0",
+                    "FREQ=WEEKLY;BYDAY=XX", "FREQ=DAILY;BYSETPOS=1"):
+            with self.assertRaises(ValueError):
+                parse_recurrence(bad)
+
+    def test_occurrence_patterns(self):
+        """Daily, weekly and monthly rules should produce the expected dates."""
+        self.assertEqual(self._take(self._rule("FREQ=DAILY;INTERVAL=2", "2025-01-01"), 3),
+                         ["2025-01-01", "2025-01-03", "2025-01-05"])
+        # Wednesday start: the Monday of the first week is skipped
+        self.assertEqual(self._take(self._rule("FREQ=WEEKLY;BYDAY=MO,WE", "2025-01-01"), 4),
+                         ["2025-01-01", "2025-01-06", "2025-01-08", "2025-01-13"])
+        self.assertEqual(self._take(self._rule("monthly", "2024-01-31"), 3),
+                         ["2024-01-31", "2024-02-29", "2024-03-31"])
+        self.assertEqual(self._take(self._rule("FREQ=DAILY;COUNT=3", "2025-01-01"), 10),
+                         ["2025-01-01", "2025-01-02", "2025-01-03"])
+        self.assertEqual(self._take(self._rule("FREQ=WEEKLY;UNTIL=20250115", "2025-01-01"), 10),
+                         ["2025-01-01", "2025-01-08", "2025-01-15"])
+
+    def test_skipping_ahead_matches_full_iteration(self):
+        """Starting mid-series should match filtering a full iteration, COUNT included."""
+        base = datetime(2025, 1, 1)
+        for spec in ("FREQ=DAILY;INTERVAL=3;COUNT=40", "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;COUNT=25",
+                     "weekdays", "FREQ=MONTHLY;INTERVAL=2;COUNT=8"):
+            rule = self._rule(spec, "2025-01-01")
+            full = self._take(rule, 400)
+            for offset in (0, 1, 5, 17, 60, 200, 500):
+                start = (base + timedelta(days=offset)).strftime("%Y-%m-%d")
+                with self.subTest(spec=spec, start=start):
+                    expected = [d for d in full if d >= start][:5]
+                    self.assertEqual(self._take(rule, 5, start), expected)
+
+    def test_distant_occurrences_are_cheap(self):
+        """Finding an occurrence a century away should not walk the series."""
+        from app import next_occurrence
+        rule = self._rule("daily", "2000-01-01")
+        with patch("app.timedelta", wraps=timedelta) as mock_timedelta:
+            self.assertEqual(next_occurrence(rule, "2099-12-31"), "2100-01-01")
+        self.assertLess(mock_timedelta.call_count, 10)
+
+    def test_acknowledge_advances_series(self):
+        """Acknowledging moves a recurring reminder on, and ends it after the last occurrence."""
+        from app import acknowledge_reminders
+        reminder = save_reminder({"id": 1, "prediction": "Stretch", "category": "health"},
+                                 "2025-01-01", "FREQ=DAILY;COUNT=2")
+        self.assertEqual(reminder["remind_date"], "2025-01-01")
+        acknowledge_reminders([reminder["reminder_id"]])
+        stored = load_reminders()[0]
+        self.assertFalse(stored["acknowledged"])
+        self.assertEqual(stored["remind_date"], "2025-01-02")
+        self.assertEqual(stored["acknowledged_through"], "2025-01-01")
+        acknowledge_reminders([reminder["reminder_id"]])
+        self.assertTrue(load_reminders()[0]["acknowledged"])
+
+    def test_range_queries_expand_lazily(self):
+        """Bounded range queries list each occurrence; due checks only the current one."""
+        from app import query_reminders, get_reminder_index
+        save_reminder({"prediction": "Weekly", "category": "test"}, "2025-01-06", "weekly")
+        save_reminder({"prediction": "Once", "category": "test"}, "2025-01-10")
+        window = query_reminders("2025-01-07", "2025-01-31")
+        self.assertEqual([(r["reminder_id"], r["remind_date"]) for r in window],
+                         [(2, "2025-01-10"), (1, "2025-01-13"), (1, "2025-01-20"), (1, "2025-01-27")])
+        self.assertEqual(len(get_reminder_index().due("2025-02-01")), 2)
+        self.assertEqual(len(load_reminders()), 2)
+
+    def test_invalid_recurrence_saves_nothing(self):
+        """A bad or empty recurrence should raise before anything is written."""
+        with self.assertRaises(ValueError):
+            save_reminder({"prediction": "Bad", "category": "test"}, "2025-01-01", "fortnightly")
+        with self.assertRaises(ValueError):
+            save_reminder({"prediction": "Empty", "category": "test"}, "2025-02-01", "FREQ=DAILY;UNTIL=20250101")
+        self.assertEqual(load_reminders(), [])
+
+    def test_cli_repeat(self):
+        """--remind with --repeat should create a recurring reminder."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--remind", "2030-01-07", "--repeat", "weekdays"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("Repeats every week on Mon, Tue, Wed, Thu, Fri", mock_stdout.getvalue())
+        self.assertEqual(load_reminders()[0]["recurrence"]["byday"], [0, 1, 2, 3, 4])
+
+
+class TestReminderArchive(unittest.TestCase):
+    """Tests for archiving old acknowledged reminders."""
+
+    def setUp(self):
+        """Set up a temporary reminders file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "reminders.json"
+        self.archive_file = Path(self.temp_dir) / "reminders.archive.jsonl.gz"
+        self.patches = [patch("app.REMINDERS_FILE", self.temp_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, reminders):
+        with open(self.temp_file, "w") as f:
+            json.dump(reminders, f)
+
+    def _reminder(self, reminder_id, remind_date, acknowledged_days_ago=None):
+        reminder = {"reminder_id": reminder_id, "prediction": f"Prediction {reminder_id}", "category": "test",
+                    "remind_date": remind_date, "acknowledged": acknowledged_days_ago is not None}
+        if acknowledged_days_ago is not None:
+            reminder["acknowledged_at"] = (datetime.now() - timedelta(days=acknowledged_days_ago)).isoformat()
+        return reminder
+
+    def test_write_moves_expired_reminders_to_archive(self):
+        """The next write should archive reminders acknowledged past the retention period."""
+        import gzip
+        self._write([self._reminder(1, "2025-01-01", 90), self._reminder(2, "2025-02-01", 5),
+                     self._reminder(3, "2030-01-01")])
+        created = save_reminder({"prediction": "New", "category": "test"}, "2030-02-01")
+        self.assertEqual(created["reminder_id"], 4)
+        self.assertEqual([r["reminder_id"] for r in load_reminders()], [2, 3, 4])
+        with gzip.open(self.archive_file, "rt") as f:
+            archived = [json.loads(line) for line in f]
+        self.assertEqual([r["reminder_id"] for r in archived], [1])
+        self.assertIn("archived_at", archived[0])
+
+    def test_newest_reminder_is_kept_so_ids_are_not_reused(self):
+        """Archiving the highest ID would let the next reminder reuse it."""
+        from app import acknowledge_reminders
+        self._write([self._reminder(1, "2025-01-01", 90), self._reminder(2, "2025-02-01", 90)])
+        acknowledge_reminders([9])
+        self.assertEqual([r["reminder_id"] for r in load_reminders()], [2])
+        created = save_reminder({"prediction": "New", "category": "test"}, "2030-02-01")
+        self.assertEqual(created["reminder_id"], 3)
+        self.assertEqual([r["reminder_id"] for r in load_reminders()], [3])
+
+    def test_segments_append(self):
+        """Each compaction appends a gzip segment that reads back as one stream."""
+        from app import load_archived_reminders
+        self._write([self._reminder(1, "2025-01-01", 90), self._reminder(2, "2025-01-02")])
+        save_reminder({"prediction": "A", "category": "test"}, "2030-01-01")
+        first_size = self.archive_file.stat().st_size
+        reminders = load_reminders()
+        reminders[0].update(acknowledged=True, acknowledged_at="2020-01-01T00:00:00")
+        self._write(reminders)
+        save_reminder({"prediction": "B", "category": "test"}, "2030-01-02")
+        self.assertGreater(self.archive_file.stat().st_size, first_size)
+        self.assertEqual(sorted(r["reminder_id"] for r in load_archived_reminders()), [1, 2])
+
+    def test_archive_read_only_on_demand(self):
+        """Pending queries skip the archive; --all merges it in date order."""
+        from app import query_reminders
+        self._write([self._reminder(1, "2025-03-01", 90), self._reminder(2, "2025-01-01", 90),
+                     self._reminder(3, "2025-02-01", 1)])
+        save_reminder({"prediction": "Live", "category": "test"}, "2025-04-01")
+        with patch("app.load_archived_reminders") as mock_load:
+            self.assertEqual([r["reminder_id"] for r in query_reminders()], [4])
+        mock_load.assert_not_called()
+        self.assertEqual([r["reminder_id"] for r in query_reminders(status="all")], [2, 3, 1, 4])
+        self.assertEqual([r["reminder_id"] for r in query_reminders("2025-02-15", status="acknowledged")], [1])
+
+    def test_list_all_includes_archive(self):
+        """--list-reminders --all should show archived reminders even if the hot file is empty."""
+        from app import display_reminders
+        self._write([self._reminder(1, "2025-01-01", 90), self._reminder(2, "2025-01-02", 90)])
+        save_reminder({"prediction": "Live", "category": "test"}, "2030-01-01")
+        self.temp_file.unlink()
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            display_reminders(show_all=True)
+        self.assertIn("Prediction 1", mock_stdout.getvalue())
+        self.assertIn("Prediction 2", mock_stdout.getvalue())
+        self.assertIn("Total: 2 reminder(s)", mock_stdout.getvalue())
+
+    def test_acknowledging_archived_reminder(self):
+        """An archived ID is reported as already acknowledged, not missing."""
+        from app import acknowledge_reminders
+        self._write([self._reminder(1, "2025-01-01", 90), self._reminder(2, "2030-01-01")])
+        result = acknowledge_reminders([1, 9])
+        self.assertEqual(result["already_acknowledged"], [1])
+        self.assertEqual(result["not_found"], [9])
+
+    def test_clear_removes_archive(self):
+        """Clearing acknowledged reminders also deletes the archive."""
+        from app import clear_reminders, load_archived_reminders
+        self._write([self._reminder(1, "2025-01-01", 90), self._reminder(2, "2030-01-01")])
+        save_reminder({"prediction": "Live", "category": "test"}, "2030-01-02")
+        with patch("builtins.input", return_value="yes"), patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            self.assertTrue(clear_reminders())
+        self.assertIn("delete 1 acknowledged", mock_stdout.getvalue())
+        self.assertFalse(self.archive_file.exists())
+        self.assertEqual(load_archived_reminders(), [])
+
+    def test_retention_disabled(self):
+        """REMINDER_ARCHIVE_DAYS = None keeps everything in the reminders file."""
+        self._write([self._reminder(1, "2025-01-01", 900), self._reminder(2, "2030-01-01")])
+        with patch("app.REMINDER_ARCHIVE_DAYS", None):
+            save_reminder({"prediction": "Live", "category": "test"}, "2030-01-02")
+        self.assertEqual(len(load_reminders()), 3)
+        self.assertFalse(self.archive_file.exists())
+
+
+class TestThemeStore(unittest.TestCase):
+    """Tests for the manifest-based custom theme store."""
+
+    def setUp(self):
+        """Set up a temporary theme store."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manifest_file = Path(self.temp_dir) / "themes.json"
+        self.store_dir = Path(self.temp_dir) / "themes"
+        self.patches = [patch("app.CUSTOM_THEMES_FILE", self.manifest_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _manifest(self):
+        with open(self.manifest_file) as f:
+            return json.load(f)
+
+    def test_save_writes_manifest_and_theme_files(self):
+        """Each theme gets its own file; the manifest holds names, counts and hashes."""
+        save_custom_themes({"alpha": {"a": ["A1", "A2"], "b": ["B1"]}, "beta": {"c": ["C1"]}})
+        manifest = self._manifest()
+        self.assertEqual(manifest["version"], 2)
+        entry = manifest["themes"]["alpha"]
+        self.assertEqual(entry["categories"], {"a": 2, "b": 1})
+        self.assertEqual(entry["predictions"], 3)
+        self.assertEqual(entry["file"], f"alpha.{entry['hash']}.jsonl")
+        self.assertEqual(sorted(p.name for p in self.store_dir.glob("*.jsonl")),
+                         sorted(e["file"] for e in manifest["themes"].values()))
+
+    def test_legacy_file_is_migrated(self):
+        """A single-file themes.json should be converted on first read."""
+        from app import get_theme
+        with open(self.manifest_file, "w") as f:
+            json.dump({"old": {"cat": ["Old prediction"]}}, f)
+        self.assertEqual(get_theme("old"), {"cat": ["Old prediction"]})
+        self.assertEqual(self._manifest()["themes"]["old"]["predictions"], 1)
+        self.assertEqual(load_custom_themes(), {"old": {"cat": ["Old prediction"]}})
+
+    def test_names_and_listing_read_only_the_manifest(self):
+        """Validation, /themes categories and --list-themes should not load predictions."""
+        from app import theme_names, get_theme_categories, list_themes
+        save_custom_themes({"alpha": {"a": ["A1", "A2"]}})
+        with patch("app._read_theme_file") as mock_read, patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            self.assertIn("alpha", theme_names())
+            self.assertEqual(get_theme_categories()["alpha"], ["a"])
+            list_themes()
+        mock_read.assert_not_called()
+        self.assertIn("alpha: a (2 predictions)", mock_stdout.getvalue())
+
+    def test_theme_cache_is_lru(self):
+        """Loaded themes are cached and evicted least recently used first."""
+        import app
+        from app import load_custom_theme
+        save_custom_themes({"alpha": {"a": ["A1"]}, "beta": {"b": ["B1"]}})
+        with patch("app.THEME_CACHE_SIZE", 1), patch("app._read_theme_file", wraps=app._read_theme_file) as mock_read:
+            load_custom_theme("alpha")
+            load_custom_theme("alpha")
+            self.assertEqual(mock_read.call_count, 1)
+            load_custom_theme("beta")
+            load_custom_theme("alpha")
+            self.assertEqual(mock_read.call_count, 3)
+        self.assertIsNone(load_custom_theme("missing"))
+
+    def test_update_and_delete_replace_files(self):
+        """Updating a theme publishes a new file and removes the old one."""
+        from app import get_theme
+        with patch("sys.stdout", new_callable=StringIO):
+            add_custom_theme("alpha", {"a": ["First"]})
+            old_file = self._manifest()["themes"]["alpha"]["file"]
+            self.assertEqual(get_theme("alpha"), {"a": ["First"]})
+            add_custom_theme("alpha", {"a": ["Second"]})
+            self.assertEqual(get_theme("alpha"), {"a": ["Second"]})
+            self.assertFalse((self.store_dir / old_file).exists())
+            delete_custom_theme("alpha")
+        self.assertIsNone(get_theme("alpha"))
+        self.assertEqual(list(self.store_dir.glob("*.jsonl")), [])
+
+    def test_concurrent_commit_keeps_staged_files(self):
+        """Another writer's cleanup must not delete a file not yet in the manifest."""
+        from app import get_theme, _write_theme_file, update_theme_manifest
+        entry = _write_theme_file("alpha", [("a", "Alpha prediction")])
+        with patch("sys.stdout", new_callable=StringIO):
+            add_custom_theme("beta", {"b": ["Beta prediction"]})
+        update_theme_manifest({"alpha": entry})
+        self.assertEqual(get_theme("alpha"), {"a": ["Alpha prediction"]})
+        self.assertEqual(get_theme("beta"), {"b": ["Beta prediction"]})
+        self.assertNotIn("staged", self._manifest()["themes"]["alpha"])
+        self.assertEqual(list(self.store_dir.glob("*.tmp")), [])
+
+    def test_themed_prediction_from_store(self):
+        """Predictions should be drawn from the lazily loaded theme."""
+        save_custom_themes({"alpha": {"a": ["Only one"]}})
+        self.assertEqual(get_themed_prediction("alpha"), ("Only one", "a"))
+        self.assertIn("Unknown theme", get_themed_prediction("nope")[0])
+
+
+class TestStreamingThemeImport(unittest.TestCase):
+    """Tests for streaming JSON and JSONL theme import."""
+
+    def setUp(self):
+        """Set up a temporary theme store."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manifest_file = Path(self.temp_dir) / "themes.json"
+        self.store_dir = Path(self.temp_dir) / "themes"
+        self.patches = [patch("app.CUSTOM_THEMES_FILE", self.manifest_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _file(self, name, content):
+        path = Path(self.temp_dir) / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def _import(self, path):
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            result = import_theme_from_file(path)
+        return result, mock_stdout.getvalue()
+
+    def test_json_parsing_across_chunk_boundaries(self):
+        """Tiny read chunks should yield the same pairs as json.load."""
+        from io import BytesIO
+        from app import _iter_theme_json
+        data = {"description": {"nested": [1, 2]}, "categories": {
+            "ünïcode": ["Prédiction \\ \"quoted\"", "🔮 crystal"], "plain": ["x" * 50, "y"]}, "name": "late"}
+        raw = json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8")
+        for chunk_size in (1, 3, 7, 64):
+            fields = {}
+            pairs = list(_iter_theme_json(BytesIO(raw), fields, chunk_size))
+            self.assertEqual(pairs, [(c, p) for c, preds in data["categories"].items() for p in preds])
+            self.assertEqual(fields, {"description": {"nested": [1, 2]}, "name": "late"})
+
+    def test_json_import_into_store(self):
+        """A JSON theme should land in the store and manifest."""
+        from app import get_theme, load_theme_manifest
+        path = self._file("t.json", json.dumps({"name": "Big", "categories": {"a": ["A1", "A2"], "b": ["B1"]}}))
+        result, output = self._import(path)
+        self.assertTrue(result)
+        self.assertIn("Total predictions: 3", output)
+        self.assertEqual(get_theme("big"), {"a": ["A1", "A2"], "b": ["B1"]})
+        self.assertEqual(load_theme_manifest()["big"]["categories"], {"a": 2, "b": 1})
+
+    def test_jsonl_import(self):
+        """JSONL files take their name from a name line or the file name."""
+        from app import get_theme
+        path = self._file("pack.jsonl", '{"name": "lines"}\n{"category": "a", "prediction": "A1"}\n\n["b", "B1"]\n')
+        self.assertTrue(self._import(path)[0])
+        self.assertEqual(get_theme("lines"), {"a": ["A1"], "b": ["B1"]})
+        path = self._file("from_stem.ndjson", '{"category": "a", "prediction": "A1"}\n')
+        self.assertTrue(self._import(path)[0])
+        self.assertEqual(get_theme("from_stem"), {"a": ["A1"]})
+
+    def test_validation_errors_leave_store_untouched(self):
+        """Invalid files should fail with a message and leave no partial files."""
+        cases = {
+            "bad_pred.json": ('{"name": "x", "categories": {"a": ["ok", 5]}}', "non-empty strings"),
+            "not_list.json": ('{"name": "x", "categories": {"a": "one"}}', "must be a list"),
+            "empty_cat.json": ('{"name": "x", "categories": {"a": []}}', "at least one prediction"),
+            "no_name.json": ('{"categories": {"a": ["ok"]}}', "'name' field is required"),
+            "builtin.json": ('{"name": "zodiac", "categories": {"a": ["ok"]}}', "built-in theme"),
+            "no_cats.json": ('{"name": "x"}', "'categories' field is required"),
+            "syntax.json": ('{"name": "x", "categories": {"a": ["ok" "no comma"]}}', "Error:"),
+            "trailing.json": ('{"name": "x", "categories": {"a": ["ok"]}} extra', "unexpected data"),
+            "bad.jsonl": ('{"category": "a", "prediction": "ok"}\n{"category": "", "prediction": "x"}\n',
+                          "Line 2"),
+            "broken.jsonl": ('{"category": "a", "prediction": ', "Invalid JSON on line 1"),
+        }
+        for file_name, (content, message) in cases.items():
+            with self.subTest(file_name=file_name):
+                result, output = self._import(self._file(file_name, content))
+                self.assertFalse(result)
+                self.assertIn(message, output)
+        self.assertFalse(self.manifest_file.exists())
+        self.assertEqual(list(self.store_dir.iterdir()), [])
+
+    def test_large_import_uses_bounded_memory(self):
+        """Peak memory should stay far below the size of the theme file."""
+        import tracemalloc
+        from app import stream_theme_file
+        path = Path(self.temp_dir) / "large.json"
+        with open(path, "w") as f:
+            f.write('{"name": "large", "categories": {"a": [')
+            f.write(",".join(json.dumps(f"Prediction number {i} about the future") for i in range(40000)))
+            f.write("]}}")
+        tracemalloc.start()
+        try:
+            name, entry = stream_theme_file(str(path))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual((name, entry["predictions"]), ("large", 40000))
+        self.assertLess(peak, path.stat().st_size // 4)
+
+
+class TestBulkThemeImport(unittest.TestCase):
+    """Tests for parallel bulk theme import."""
+
+    def setUp(self):
+        """Set up a temporary theme store and theme pack."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manifest_file = Path(self.temp_dir) / "themes.json"
+        self.store_dir = Path(self.temp_dir) / "themes"
+        self.pack_dir = Path(self.temp_dir) / "pack"
+        self.pack_dir.mkdir()
+        self.patches = [patch("app.CUSTOM_THEMES_FILE", self.manifest_file), patch("app.HISTORY_DIR", Path(self.temp_dir))]
+        for p in self.patches:
+            p.start()
+        files = {
+            "a.json": json.dumps({"name": "alpha", "categories": {"x": ["A1", "A2"]}}),
+            "b.jsonl": '{"category": "y", "prediction": "B1"}\n',
+            "c.json": json.dumps({"name": "gamma", "categories": {"z": ["C1"]}}),
+            "d_bad.json": json.dumps({"name": "delta", "categories": {"z": [""]}}),
+            "e_dup.json": json.dumps({"name": "alpha", "categories": {"x": ["Other"]}}),
+            "notes.txt": "not a theme",
+        }
+        for name, content in files.items():
+            (self.pack_dir / name).write_text(content)
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _check_result(self, result):
+        from app import load_theme_manifest, get_theme
+        self.assertEqual([(Path(i["file"]).name, i["name"], i["predictions"]) for i in result["imported"]],
+                         [("a.json", "alpha", 2), ("b.jsonl", "b", 1), ("c.json", "gamma", 1)])
+        self.assertEqual([Path(e["file"]).name for e in result["errors"]], ["d_bad.json", "e_dup.json"])
+        self.assertIn("non-empty strings", result["errors"][0]["error"])
+        self.assertIn("Duplicate theme 'alpha' (also in a.json)", result["errors"][1]["error"])
+        self.assertEqual(sorted(load_theme_manifest()), ["alpha", "b", "gamma"])
+        self.assertEqual(get_theme("alpha"), {"x": ["A1", "A2"]})
+        # Only the committed theme files remain in the store
+        self.assertEqual(sorted(p.name for p in self.store_dir.iterdir()),
+                         sorted(e["file"] for e in load_theme_manifest().values()))
+
+    def test_parallel_import_commits_once(self):
+        """Files are processed in a pool and committed with one manifest write."""
+        import app
+        from app import import_themes, find_theme_files
+        with patch("app.update_theme_manifest", wraps=app.update_theme_manifest) as mock_update:
+            result = import_themes(find_theme_files(str(self.pack_dir)), workers=2)
+        self.assertEqual(mock_update.call_count, 1)
+        self._check_result(result)
+
+    def test_serial_fallback(self):
+        """Without a usable process pool the import runs in-process."""
+        from app import import_themes, find_theme_files
+        with patch("app.ProcessPoolExecutor", side_effect=OSError("no semaphores")):
+            result = import_themes(find_theme_files(str(self.pack_dir)), workers=4)
+        self._check_result(result)
+
+    def test_nothing_committed_when_all_fail(self):
+        """A pack with only invalid files leaves the store untouched."""
+        from app import import_themes
+        result = import_themes([self.pack_dir / "d_bad.json", self.pack_dir / "missing.json"], workers=1)
+        self.assertEqual(result["imported"], [])
+        self.assertIn("Error reading file", result["errors"][1]["error"])
+        self.assertFalse(self.manifest_file.exists())
+
+    def test_failed_commit_discards_staged_files(self):
+        """If the manifest write fails, no staged theme files are left in the store."""
+        from app import import_themes, find_theme_files
+        with patch("app.update_theme_manifest", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                import_themes(find_theme_files(str(self.pack_dir)), workers=1)
+        self.assertEqual(list(self.store_dir.iterdir()), [])
+
+    def test_api_import_is_confined_to_import_root(self):
+        """POST /themes/import only reads directories under the import root."""
+        try:
+            from fastapi.testclient import TestClient
+            client = TestClient(create_api())
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        with patch("app.THEME_IMPORT_ROOT", str(self.pack_dir)):
+            for directory in [self.temp_dir, "..", str(self.pack_dir / ".." / "themes")]:
+                with self.subTest(directory=directory):
+                    response = client.post("/themes/import", json={"directory": directory})
+                    self.assertEqual(response.status_code, 403)
+            self.assertFalse(self.manifest_file.exists())
+            self.assertEqual(client.post("/themes/import", json={"directory": "missing"}).status_code, 400)
+            response = client.post("/themes/import", json={"directory": "."})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["name"] for item in response.json()["imported"]], ["alpha", "b", "gamma"])
+        # By default packs are read from an imports directory next to the history
+        (Path(self.temp_dir) / "imports").mkdir()
+        shutil.copytree(self.pack_dir, Path(self.temp_dir) / "imports" / "pack")
+        response = client.post("/themes/import", json={"directory": "pack"})
+        self.assertEqual(len(response.json()["imported"]), 3)
+
+    def test_cli_import_themes(self):
+        """--import-themes should report each file."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--import-themes", str(self.pack_dir)]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        output = mock_stdout.getvalue()
+        self.assertIn("Importing 5 theme file(s)", output)
+        self.assertIn("✅ b.jsonl: 'b' (1 predictions)", output)
+        self.assertIn("❌ d_bad.json:", output)
+        self.assertIn("Imported 3 theme(s), 2 error(s).", output)
+        with patch("sys.argv", ["app.py", "--import-themes", str(self.pack_dir / "a.json")]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("is not a directory", mock_stdout.getvalue())
+
+
+class TestThemeRepository(unittest.TestCase):
+    """Tests for the theme repository server and caching client."""
+
+    def setUp(self):
+        """Start a repository over one theme store and point the client at another."""
+        import threading
+        from app import ThemeRepositoryServer, ThemeRepositoryHandler
+        self.temp_dir = tempfile.mkdtemp()
+        self.server_dir = Path(self.temp_dir) / "server"
+        self.client_dir = Path(self.temp_dir) / "client"
+        self.server_dir.mkdir()
+        self._publish({"tarot": {"cards": ["The Tower", "The Star"]}, "runes": {"stones": ["Fehu"]}})
+        
+        self.server = ThemeRepositoryServer(("127.0.0.1", 0), self.server_dir / "themes.json")
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.patches = [
+            patch.object(ThemeRepositoryHandler, "log_message", lambda *args: None),
+            patch("app.CUSTOM_THEMES_FILE", self.client_dir / "themes.json"),
+            patch("app.HISTORY_DIR", self.client_dir),
+        ]
+        for p in self.patches:
+            p.start()
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        """Stop the server and clean up."""
+        self.server.shutdown()
+        self.server.server_close()
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _publish(self, themes):
+        with patch("app.CUSTOM_THEMES_FILE", self.server_dir / "themes.json"), patch("app.HISTORY_DIR", self.server_dir):
+            save_custom_themes(themes)
+
+    def test_index_is_revalidated(self):
+        """A second fetch is answered with 304; an unreachable repository falls back to the cache."""
+        from app import fetch_theme_index
+        themes, status = fetch_theme_index(self.url)
+        self.assertEqual(status, "updated")
+        self.assertEqual(themes["tarot"]["categories"], ["cards"])
+        self.assertEqual(fetch_theme_index(self.url)[1], "not modified")
+        self._publish({"tarot": {"cards": ["The Moon"]}})
+        themes, status = fetch_theme_index(self.url)
+        self.assertEqual((sorted(themes), status), (["tarot"], "updated"))
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertEqual(fetch_theme_index(self.url)[1], "offline")
+
+    def test_conditional_and_gzip_responses(self):
+        """Theme files carry their hash as ETag and honour If-None-Match and gzip."""
+        import gzip
+        import urllib.error
+        import urllib.request
+        from app import _theme_store_dir
+        manifest = json.loads((self.server_dir / "themes.json").read_text())["themes"]
+        request = urllib.request.Request(f"{self.url}/themes/tarot.jsonl", headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(request) as response:
+            self.assertEqual(response.headers["ETag"], f'"{manifest["tarot"]["hash"]}"')
+            body = gzip.decompress(response.read())
+        self.assertEqual(body, (self.server_dir / "themes" / manifest["tarot"]["file"]).read_bytes())
+        request = urllib.request.Request(f"{self.url}/themes/tarot.jsonl",
+                                         headers={"If-None-Match": f'"{manifest["tarot"]["hash"]}"'})
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(request)
+        self.assertEqual(ctx.exception.code, 304)
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            urllib.request.urlopen(f"{self.url}/themes/missing.jsonl")
+        self.assertEqual(ctx.exception.code, 404)
+
+    def test_install_downloads_only_changed_themes(self):
+        """Installed themes are skipped, cached files reused and changed ones downloaded."""
+        import app
+        from app import install_themes, get_theme
+        with patch("app._repository_get", wraps=app._repository_get) as mock_get:
+            result = install_themes(["tarot", "runes", "nope"], self.url)
+            self.assertEqual(result["installed"], ["tarot", "runes"])
+            self.assertEqual(result["downloaded"], ["tarot", "runes"])
+            self.assertIn("nope", result["errors"])
+            self.assertEqual(get_theme("tarot"), {"cards": ["The Tower", "The Star"]})
+            
+            mock_get.reset_mock()
+            self.assertEqual(install_themes(["tarot", "runes"], self.url)["up_to_date"], ["tarot", "runes"])
+            self.assertEqual([c.args[0].rsplit("/", 1)[1] for c in mock_get.call_args_list], ["index.json"])
+            
+            self._publish({"tarot": {"cards": ["The Moon"]}, "runes": {"stones": ["Fehu"]}})
+            mock_get.reset_mock()
+            result = install_themes(["tarot", "runes"], self.url)
+            self.assertEqual((result["downloaded"], result["up_to_date"]), (["tarot"], ["runes"]))
+            self.assertEqual(get_theme("tarot"), {"cards": ["The Moon"]})
+            
+            with patch("sys.stdout", new_callable=StringIO):
+                delete_custom_theme("runes")
+            result = install_themes(["runes"], self.url)
+            self.assertEqual((result["installed"], result["downloaded"]), (["runes"], []))
+
+    def test_tampered_download_is_rejected(self):
+        """A payload that does not match the index hash is not installed."""
+        import app
+        from app import install_themes, load_theme_manifest
+        real_get = app._repository_get
+        
+        def tampered(url, etag=None):
+            status, body, tag = real_get(url, etag)
+            return (status, body + b'["cards", "Injected"]\n', tag) if url.endswith(".jsonl") else (status, body, tag)
+        
+        with patch("app._repository_get", side_effect=tampered):
+            result = install_themes(["tarot"], self.url)
+        self.assertIn("does not match", result["errors"]["tarot"])
+        self.assertNotIn("tarot", load_theme_manifest())
+
+    def test_index_hashes_and_cached_files_are_verified(self):
+        """Malformed index hashes are refused; a corrupted cache file is fetched again."""
+        from app import install_themes, fetch_theme_index, get_theme, _theme_cache_dir
+        themes, status = fetch_theme_index(self.url)
+        hostile = {"tarot": {**themes["tarot"], "hash": "../../x"}}
+        with patch("app.fetch_theme_index", return_value=(hostile, status)):
+            result = install_themes(["tarot"], self.url)
+        self.assertIn("Invalid hash", result["errors"]["tarot"])
+
+        cached = _theme_cache_dir() / f"{themes['tarot']['hash']}.jsonl"
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        cached.write_bytes(b'["cards", "Stale"]\n')
+        result = install_themes(["tarot"], self.url)
+        self.assertEqual(result["downloaded"], ["tarot"])
+        self.assertEqual(get_theme("tarot"), {"cards": ["The Tower", "The Star"]})
+
+    def test_browse_marks_installed_and_outdated(self):
+        """--browse-themes lists the catalog with install status and filters by search."""
+        from app import browse_themes, install_themes
+        install_themes(["tarot", "runes"], self.url)
+        self._publish({"tarot": {"cards": ["The Moon"]}, "runes": {"stones": ["Fehu"]}, "dice": {"rolls": ["Six"]}})
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            self.assertTrue(browse_themes(url=self.url))
+        output = mock_stdout.getvalue()
+        self.assertIn("3 theme(s)", output)
+        self.assertIn("⬆ tarot: cards (1 predictions)", output)
+        self.assertIn("✓ runes: stones", output)
+        self.assertIn("   dice: rolls", output)
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            browse_themes("stone", self.url)
+        self.assertIn("runes", mock_stdout.getvalue())
+        self.assertNotIn("tarot", mock_stdout.getvalue())
+
+
+class TestThemeRegistry(unittest.TestCase):
+    """Tests for the interned theme registry."""
+
+    def setUp(self):
+        """Set up a temporary theme store."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch("app.CUSTOM_THEMES_FILE", Path(self.temp_dir) / "themes.json"),
+            patch("app.HISTORY_DIR", Path(self.temp_dir)),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_strings_are_shared(self):
+        """Identical predictions across themes are stored once."""
+        from app import ThemeRegistry
+        registry = ThemeRegistry()
+        # Build equal but distinct string objects, as json parsing would
+        registry.add("a", {"x": ["".join(["Same", " text"]), "Only a"]})
+        registry.add("b", {"y": ["".join(["Same", " text"])] * 3})
+        stats = registry.stats()
+        self.assertEqual((stats["references"], stats["unique_strings"]), (5, 2))
+        self.assertIs(registry.materialize("a")["x"][0], registry.materialize("b")["y"][2])
+        self.assertEqual(registry.categories("b"), ["y"])
+        self.assertEqual(registry.choice("b", "y"), "Same text")
+        self.assertIsNone(registry.choice("b", "missing"))
+
+    def test_remove_frees_and_reuses_slots(self):
+        """Strings are freed when no theme uses them and their slots reused."""
+        from app import ThemeRegistry
+        registry = ThemeRegistry()
+        registry.add("a", {"x": ["Shared", "Only a"]})
+        registry.add("b", {"y": ["Shared"]})
+        registry.remove("a")
+        self.assertEqual(registry.stats()["unique_strings"], 1)
+        self.assertEqual(registry.materialize("b"), {"y": ["Shared"]})
+        registry.add("c", {"z": ["New"]})
+        self.assertEqual(len(registry.strings), 2)
+        registry.add("b", {"y": ["Replaced"]})
+        self.assertEqual(sorted(t for t in registry.strings if t), ["New", "Replaced"])
+        self.assertIsNone(registry.materialize("a"))
+
+    def test_duplicate_heavy_library_saves_memory(self):
+        """Interning should beat separate lists when predictions repeat."""
+        from app import ThemeRegistry
+        registry = ThemeRegistry()
+        for t in range(10):
+            registry.add(str(t), {"cat": [f"A fairly typical prediction about tomorrow, number {i}" for i in range(200)]})
+        stats = registry.stats()
+        self.assertEqual(stats["unique_strings"], 200)
+        self.assertLess(stats["interned_bytes"] * 3, stats["list_bytes"])
+
+    def test_custom_themes_are_evicted_from_registry(self):
+        """Themes dropped from the LRU are removed from the process registry."""
+        from app import THEME_REGISTRY, _custom_theme_key
+        save_custom_themes({"alpha": {"a": ["Alpha only"]}, "beta": {"b": ["Beta only"]}})
+        with patch("app.THEME_CACHE_SIZE", 1):
+            self.assertEqual(get_themed_prediction("alpha"), ("Alpha only", "a"))
+            alpha_key = _custom_theme_key("alpha")
+            self.assertIn(alpha_key, THEME_REGISTRY)
+            self.assertEqual(get_themed_prediction("beta", "b"), ("Beta only", "b"))
+            self.assertNotIn(alpha_key, THEME_REGISTRY)
+        self.assertIn("not available", get_themed_prediction("beta", "zzz")[0])
+
+    def test_eviction_waits_for_a_draw(self):
+        """A theme cannot be evicted between resolving its key and drawing from it."""
+        import threading
+        from app import THEME_REGISTRY, _theme_key, _custom_theme_key
+        save_custom_themes({"alpha": {"a": ["Alpha only"]}, "beta": {"b": ["Beta only"]}})
+        evictor = threading.Thread(target=_custom_theme_key, args=("beta",))
+        resolved = []
+
+        def resolve_then_evict(name):
+            resolved.append(_theme_key(name))
+            evictor.start()
+            evictor.join(0.2)
+            return resolved[0]
+
+        with patch("app.THEME_CACHE_SIZE", 1):
+            with patch("app._theme_key", side_effect=resolve_then_evict):
+                self.assertEqual(get_themed_prediction("alpha"), ("Alpha only", "a"))
+            evictor.join()
+        # The eviction went through once the draw released the lock
+        self.assertNotIn(resolved[0], THEME_REGISTRY)
+
+    def test_load_custom_theme_returns_cached_dict(self):
+        """An LRU hit returns the same dictionary without rebuilding it."""
+        from app import THEME_REGISTRY, load_custom_theme
+        save_custom_themes({"alpha": {"a": ["Alpha only"]}})
+        first = load_custom_theme("alpha")
+        self.assertEqual(first, {"a": ["Alpha only"]})
+        with patch.object(THEME_REGISTRY, "materialize") as materialize:
+            self.assertIs(load_custom_theme("alpha"), first)
+        materialize.assert_not_called()
+
+    def test_builtin_predictions_come_from_registry(self):
+        """Built-in themes are served from the registry with the same strings."""
+        from app import THEMES
+        for _ in range(20):
+            prediction, category = get_themed_prediction("zodiac")
+            self.assertIn(prediction, THEMES["zodiac"][category])
+
+    def test_list_themes_verbose(self):
+        """--list-themes --verbose should report memory use for the whole library."""
+        from app import main, THEMES
+        shared = THEMES["zodiac"][next(iter(THEMES["zodiac"]))][0]
+        save_custom_themes({"copycat": {"a": [shared, shared, "Unique"]}})
+        with patch("sys.argv", ["app.py", "--list-themes", "--verbose"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        output = mock_stdout.getvalue()
+        self.assertIn("🧠 Memory:", output)
+        total = sum(len(p) for theme in THEMES.values() for p in theme.values()) + 3
+        self.assertRegex(output, rf"{total} predictions in \d+ categories, \d+ unique \(\d+ duplicates shared\)")
+        self.assertIn("Interned:", output)
+
+
+class TestCorpusSearch(unittest.TestCase):
+    """Tests for full-text search over prediction corpora and themes."""
+
+    def setUp(self):
+        """Set up a temporary theme store."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch("app.CUSTOM_THEMES_FILE", Path(self.temp_dir) / "themes.json"),
+            patch("app.HISTORY_DIR", Path(self.temp_dir)),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_tokenize(self):
+        """Terms are lowercased, stopwords dropped and plurals folded."""
+        from app import tokenize
+        self.assertEqual(tokenize("The Oceans of your dreams, and the ocean's CALM!"),
+                         ["ocean", "dream", "ocean", "calm"])
+        self.assertEqual(tokenize("Success is glass"), ["success", "glass"])
+
+    def test_inverted_index_ranking_and_removal(self):
+        """Documents matching more and rarer terms rank first; removal updates postings."""
+        from app import InvertedIndex
+        index = InvertedIndex()
+        index.add(1, "A calm ocean at dawn")
+        index.add(2, "The ocean brings change")
+        index.add(3, "Dawn brings a new day")
+        self.assertEqual([doc for doc, _ in index.search("ocean dawn")][0], 1)
+        self.assertEqual(index.search("ocean dawn", limit=1)[0][0], 1)
+        self.assertEqual({doc for doc, _ in index.search("ocean")}, {1, 2})
+        index.remove(1, "A calm ocean at dawn")
+        self.assertEqual({doc for doc, _ in index.search("ocean dawn")}, {2, 3})
+        self.assertNotIn("calm", index.postings)
+        self.assertEqual(index.search("calm"), [])
+        self.assertEqual(index.search("the"), [])
+
+    def test_search_builtin_corpora(self):
+        """Category, time, day and theme predictions are all searchable."""
+        from app import search_corpus, THEMES
+        results = search_corpus("adventure", limit=50)
+        sources = {r["source"] for r in results}
+        self.assertTrue({"day", "theme"} <= sources)
+        self.assertTrue(all("adventure" in r["text"].lower() for r in results))
+        self.assertEqual([r["score"] for r in results], sorted((r["score"] for r in results), reverse=True))
+        within = search_corpus("adventure", limit=50, theme="zodiac")
+        self.assertTrue(within)
+        for result in within:
+            self.assertEqual(result["theme"], "zodiac")
+            self.assertIn(result["text"], THEMES["zodiac"][result["category"]])
+
+    def test_custom_themes_are_indexed_incrementally(self):
+        """Only added or changed themes are read; deleted ones drop out."""
+        import app
+        from app import search_corpus
+        save_custom_themes({"sea": {"tides": ["Moonlit tides pull you seaward."]},
+                            "sky": {"clouds": ["Drifting clouds carry wishes."]}})
+        with patch("app._read_theme_file", wraps=app._read_theme_file) as mock_read:
+            self.assertEqual(search_corpus("tides")[0]["theme"], "sea")
+            self.assertEqual(mock_read.call_count, 2)
+            search_corpus("clouds")
+            self.assertEqual(mock_read.call_count, 2)
+            
+            with patch("sys.stdout", new_callable=StringIO):
+                add_custom_theme("sky", {"clouds": ["Thunderclouds gather with news."]})
+            self.assertEqual(search_corpus("thunderclouds")[0]["theme"], "sky")
+            self.assertEqual(mock_read.call_count, 3)
+            self.assertEqual(search_corpus("wishes"), [])
+            
+            with patch("sys.stdout", new_callable=StringIO):
+                delete_custom_theme("sea")
+            self.assertEqual(search_corpus("tides"), [])
+
+    def test_cli_search_corpus(self):
+        """--search-corpus prints ranked results with their origin."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--search-corpus", "adventures", "--limit", "2"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        output = mock_stdout.getvalue()
+        self.assertRegex(output, r"2 result\(s\) for 'adventures' \([\d.]+ ms\)")
+        self.assertIn(" 1. [", output)
+        with patch("sys.argv", ["app.py", "--search-corpus", "the"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("too common", mock_stdout.getvalue())
+
+
+class TestHistorySearch(unittest.TestCase):
+    """Tests for full-text search over prediction history."""
+
+    def setUp(self):
+        """Set up a temporary history file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / "history.json"
+        self.patches = [
+            patch("app.HISTORY_FILE", self.temp_file),
+            patch("app.HISTORY_DIR", Path(self.temp_dir)),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _save(self, text, category="fortune", day=1):
+        save_to_history({"prediction": text, "category": category,
+                         "generated_at": datetime(2025, 1, day).isoformat()})
+
+    def test_index_serialization_round_trip(self):
+        """Integer doc IDs should survive the JSON sidecar."""
+        from app import InvertedIndex
+        index = InvertedIndex()
+        index.add(7, "Your career will flourish")
+        restored = InvertedIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+        self.assertIn(7, restored)
+        self.assertEqual(restored.search("career"), index.search("career"))
+
+    def test_search_ranks_and_filters(self):
+        """Matches are ranked and can be narrowed by category, date and rating."""
+        from app import search_history
+        self._save("A career change brings a promotion", "career", 1)
+        self._save("Your love life blooms", "love", 2)
+        self._save("Expect a career surprise", "career", 3)
+        self._save("A surprise promotion at your career fair", "fortune", 4)
+        add_feedback(3, 5)
+
+        results = search_history("career promotion")
+        self.assertEqual([r["id"] for r in results][:2], [1, 4])
+        self.assertEqual({r["id"] for r in results}, {1, 3, 4})
+        self.assertGreater(results[0]["score"], results[-1]["score"])
+        self.assertEqual([r["id"] for r in search_history("career", category="fortune")], [4])
+        self.assertEqual({r["id"] for r in search_history("career", since="2025-01-03")}, {3, 4})
+        self.assertEqual([r["id"] for r in search_history("career", rated_only=True)], [3])
+        self.assertEqual(len(search_history("career", limit=1)), 1)
+        self.assertEqual(search_history("weather"), [])
+
+    def test_saves_update_index_without_full_scan(self):
+        """Each save updates the sidecar index incrementally."""
+        from app import load_history_search_index, search_history
+        self._save("The stars favour travel")
+        with patch("app._build_history_search_index", side_effect=AssertionError("full scan")):
+            self._save("Travel plans take shape")
+            self._save("A quiet evening at home")
+            self.assertEqual({r["id"] for r in search_history("travel")}, {1, 2})
+            add_feedback(2, 4)  # rewrites history; the index stays valid
+            self.assertEqual({r["id"] for r in search_history("travel")}, {1, 2})
+        self.assertEqual(len(load_history_search_index()), 3)
+
+    def test_eviction_removes_documents(self):
+        """Predictions dropped by the retention limit leave the index."""
+        from app import load_history_search_index, search_history
+        with patch("app.MAX_HISTORY", 2):
+            self._save("Ancient wisdom returns")
+            self._save("New friendship ahead")
+            self._save("Wisdom grows with friendship")
+            self.assertEqual([r["id"] for r in search_history("wisdom")], [3])
+            index = load_history_search_index()
+        self.assertEqual(set(index.lengths), {2, 3})
+        self.assertNotIn("ancient", index.postings)
+
+    def test_rebuilds_after_external_edit(self):
+        """Editing history outside the app should trigger a rebuild."""
+        from app import search_history
+        self._save("Fortune favours the bold")
+        with open(self.temp_file, "w") as f:
+            json.dump([{"id": 5, "prediction": "Gardens bloom", "category": "health"}], f)
+        self.assertEqual(search_history("fortune"), [])
+        self.assertEqual([r["id"] for r in search_history("garden")], [5])
+
+    def test_cli_history_search(self):
+        """--history --search prints ranked matches."""
+        from app import main
+        self._save("A career change is near", "career")
+        self._save("Your love life blooms", "love")
+        with patch("sys.argv", ["app.py", "--history", "--search", "career"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        output = mock_stdout.getvalue()
+        self.assertIn("1 prediction(s) matching 'career'", output)
+        self.assertIn("A career change is near", output)
+        self.assertNotIn("love life", output)
+
+        with patch("sys.argv", ["app.py", "--history", "--search", "weather"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("No predictions in history match 'weather'", mock_stdout.getvalue())
+
+    def test_cli_search_requires_history(self):
+        """--search on its own is an error, not silently ignored."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--search", "career"]), \
+             patch("app.predict_the_future") as mock_predict, \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertIn("Error: --search only works with --history", mock_stdout.getvalue())
+        mock_predict.assert_not_called()
+
+    def test_api_search_rejects_paging(self):
+        """GET /history?q= cannot be combined with paging parameters."""
+        try:
+            from fastapi.testclient import TestClient
+            client = TestClient(create_api())
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        self._save("A career change is near", "career")
+        self.assertEqual(len(client.get("/history", params={"q": "career"}).json()), 1)
+        for params in [{"before_id": 5}, {"after_id": 0}, {"cursor": "anything"}]:
+            with self.subTest(params=params):
+                response = client.get("/history", params={"q": "career", **params})
+                self.assertEqual(response.status_code, 400)
+
+
+class TestAskRequests(unittest.TestCase):
+    """Tests for plain-words prediction requests."""
+
+    def setUp(self):
+        """Set up a temporary theme store and history."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.patches = [
+            patch("app.CUSTOM_THEMES_FILE", Path(self.temp_dir) / "themes.json"),
+            patch("app.HISTORY_FILE", Path(self.temp_dir) / "history.json"),
+            patch("app.HISTORY_DIR", Path(self.temp_dir)),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up temporary files."""
+        for p in self.patches:
+            p.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_automaton_overlapping_keywords(self):
+        """Suffix matches are found through failure links; longest whole words win."""
+        from app import KeywordAutomaton
+        automaton = KeywordAutomaton()
+        for keyword in ["he", "she", "his", "hers", "star", "star sign"]:
+            automaton.add(keyword, keyword)
+        automaton.build()
+        self.assertEqual(
+            sorted((start, value) for start, _, value in automaton.iter_matches("ushers")),
+            [(1, "she"), (2, "he"), (2, "hers")],
+        )
+        self.assertEqual([value for _, _, value in automaton.find("my star sign, his star")],
+                         ["star sign", "his", "star"])
+        self.assertEqual(automaton.find("ushers"), [])  # not whole words
+        self.assertEqual(len(automaton), 6)
+
+    def test_parse_request(self):
+        """Requests map to a category, theme and mode."""
+        from app import parse_request
+        cases = {
+            "Give me a fortune about love": ("relationship", None, "default"),
+            "Tell me my fortune": ("fortune", None, "default"),
+            "What does my horoscope say for Aries?": ("aries", "zodiac", "theme"),
+            "Something for a Scorpio": ("scorpio", "zodiac", "theme"),
+            "A spooky weather forecast": ("weather", "spooky", "theme"),
+            "A spooky career prediction": (None, "spooky", "theme"),
+            "Smart advice about my JOB": ("career", None, "smart"),
+            "How is my health looking today?": ("health", None, "time_aware"),
+            "Surprise me": (None, None, "default"),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                parsed = parse_request(text)
+                self.assertEqual((parsed["category"], parsed["theme"], parsed["mode"]), expected)
+        self.assertEqual(parse_request("Give me a fortune about love")["keywords"], ["fortune", "love"])
+
+    def test_custom_themes_are_keywords(self):
+        """Custom theme names and categories are recognised once saved."""
+        from app import parse_request
+        self.assertIsNone(parse_request("a pirate treasure tale")["theme"])
+        with patch("sys.stdout", new_callable=StringIO):
+            save_custom_themes({"pirate": {"treasure": ["Gold awaits you."]}})
+        self.assertEqual(parse_request("a pirate tale")["theme"], "pirate")
+        parsed = parse_request("any news about treasure?")
+        self.assertEqual((parsed["category"], parsed["theme"]), ("treasure", "pirate"))
+
+    def test_automaton_is_compiled_once(self):
+        """Parsing reuses the compiled automaton and categories until themes change."""
+        from app import main, parse_request
+        parse_request("love")
+        with patch("app.KeywordAutomaton", side_effect=AssertionError("recompiled")), \
+             patch("app.get_theme_categories", side_effect=AssertionError("categories rebuilt")):
+            parse_request("career")
+            parse_request("a spooky career prediction")
+            with patch("sys.argv", ["app.py", "--ask", "my horoscope for Leo", "--no-save"]), \
+                 patch("sys.stdout", new_callable=StringIO):
+                main()
+
+    def test_cli_ask(self):
+        """--ask fills in the prediction options and explains them."""
+        from app import main
+        with patch("sys.argv", ["app.py", "--ask", "my horoscope for Leo", "--no-save"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        output = mock_stdout.getvalue()
+        self.assertIn("Theme: Zodiac", output)
+        self.assertIn("Category: Leo", output)
+        self.assertIn("Understood: Zodiac theme, Leo category", output)
+
+        with patch("sys.argv", ["app.py", "--ask", "a fortune about love", "--json", "--no-save"]), \
+             patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            main()
+        self.assertEqual(json.loads(mock_stdout.getvalue())["category"], "relationship")
+
+    def test_api_ask(self):
+        """POST /ask returns the interpretation and a prediction."""
+        try:
+            from fastapi.testclient import TestClient
+            client = TestClient(create_api())
+        except (ImportError, RuntimeError):
+            self.skipTest("FastAPI, Starlette, or httpx not installed")
+        response = client.post("/ask", json={"text": "A spooky weather forecast", "save": False})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["request"]["theme"], "spooky")
+        self.assertEqual(data["prediction"]["category"], "weather")
+        self.assertEqual(client.post("/ask", json={"text": "  "}).status_code, 400)
+
+
 if __name__ == "__main__":
     unittest.main()